@@ -0,0 +1,128 @@
+import pandas as pd
+
+from db import MONTOS_PAGOS
+
+# Cálculos del Dashboard, sin Streamlit: reciben un frame y devuelven los
+# KPIs y el frame listo para el gráfico. Todo vectorizado (sin apply/iterrows).
+# Los montos entran y salen en centavos (int): dinero() y en_dolares()
+# convierten sólo para mostrar.
+
+SERIE_PAGADO = "Pagado (Σ)"
+SERIE_NEG = "Saldo negativo (último, <0)"
+SERIE_POS = "Saldo positivo (último, >0)"
+
+# columna de agg -> categoría del gráfico (en este orden)
+SERIES = {
+    "pagado_sum": SERIE_PAGADO,
+    "saldo_ultimo_neg": SERIE_NEG,
+    "saldo_ultimo_pos": SERIE_POS,
+}
+
+# Columnas de pagos que usa dashboard_desde_pagos (lo único que se carga)
+COLS_DASHBOARD = ["casa", "fecha_pago", "monto_pagado", "saldo_pagar"]
+
+
+def _agg(pagado_by_casa: pd.DataFrame, last_rows: pd.DataFrame) -> pd.DataFrame:
+    """
+    pagado_by_casa: casa, pagado_sum
+    last_rows:      casa, fecha_pago, saldo (último por casa)
+    """
+    last_rows = last_rows.assign(
+        saldo_ultimo_neg=last_rows["saldo"].clip(upper=0.0),
+        saldo_ultimo_pos=last_rows["saldo"].clip(lower=0.0),
+    )
+    agg = pd.merge(
+        pagado_by_casa,
+        last_rows[["casa", "fecha_pago", "saldo_ultimo_neg", "saldo_ultimo_pos"]],
+        on="casa",
+        how="left"
+    )
+    agg["saldo_ultimo_neg"] = agg["saldo_ultimo_neg"].fillna(0).astype("int64")
+    agg["saldo_ultimo_pos"] = agg["saldo_ultimo_pos"].fillna(0).astype("int64")
+    return agg
+
+
+def dinero(centavos) -> str:
+    """
+    Centavos -> "$1,234.56" con aritmética entera (sin redondeo de float).
+    """
+    c = int(centavos)
+    signo = "-" if c < 0 else ""
+    c = abs(c)
+    return f"${signo}{c // 100:,}.{c % 100:02d}"
+
+
+def en_dolares(df: pd.DataFrame, montos=MONTOS_PAGOS) -> pd.DataFrame:
+    """
+    Copia para mostrar en tablas: montos de centavos a dólares.
+    """
+    cols = [c for c in montos if c in df.columns]
+    if not cols:
+        return df
+    return df.assign(**{c: df[c] / 100 for c in cols})
+
+
+def chart_df(agg: pd.DataFrame) -> pd.DataFrame:
+    """
+    Formato largo para Altair: una fila por casa y serie.
+    """
+    if agg.empty:
+        return pd.DataFrame(columns=["casa", "categoria", "valor"])
+    largo = agg.melt(id_vars="casa", value_vars=list(SERIES), var_name="serie", value_name="valor")
+    largo["categoria"] = largo["serie"].map(SERIES)
+    largo["valor"] = largo["valor"] / 100
+    # casa por casa, series en el orden de SERIES (melt es estable)
+    largo = largo.sort_values("casa", kind="stable", ignore_index=True)
+    return largo[["casa", "categoria", "valor"]]
+
+
+def _resultado(agg: pd.DataFrame, total_pagado, registros: int, last_date) -> dict:
+    return {
+        "total_pagado": int(total_pagado),
+        "total_saldo_neg": int(agg["saldo_ultimo_neg"].sum()),
+        "total_saldo_pos": int(agg["saldo_ultimo_pos"].sum()),
+        "registros": int(registros),
+        "last_date": last_date,
+        "last_period": last_date.to_period("M").strftime("%Y-%m") if pd.notna(last_date) else None,
+        "agg": agg,
+        "chart_df": chart_df(agg),
+    }
+
+
+def dashboard_desde_pagos(df: pd.DataFrame) -> dict:
+    """
+    KPIs del Dashboard sobre filas de pagos (frame de cargar_df_pagos*).
+    Devuelve total_pagado, total_saldo_neg, total_saldo_pos, registros,
+    last_date, last_period, agg (por casa) y chart_df.
+    """
+    # Pagado Σ por casa
+    pagado_by_casa = df.groupby("casa", as_index=False, observed=True)["monto_pagado"].sum()
+    pagado_by_casa.rename(columns={"monto_pagado": "pagado_sum"}, inplace=True)
+
+    # Último saldo por casa: idxmax toma la primera fila con la fecha máxima
+    # de cada casa, sin necesidad de ordenar todo el frame
+    con_fecha = df.dropna(subset=["fecha_pago"])
+    idx = con_fecha.groupby("casa", observed=True)["fecha_pago"].idxmax()
+    last_rows = con_fecha.loc[idx, ["casa", "fecha_pago", "saldo_pagar"]].rename(
+        columns={"saldo_pagar": "saldo"}
+    )
+
+    agg = _agg(pagado_by_casa, last_rows)
+    return _resultado(agg, df["monto_pagado"].sum(), len(df), df["fecha_pago"].max())
+
+
+def dashboard_desde_resumen(res: pd.DataFrame) -> dict:
+    """
+    Mismos KPIs que dashboard_desde_pagos, sobre resumen_casa_mes.
+    """
+    pagado_by_casa = res.groupby("casa", as_index=False)["total_pagado"].sum()
+    pagado_by_casa.rename(columns={"total_pagado": "pagado_sum"}, inplace=True)
+
+    # Último mes de cada casa -> su saldo_ultimo
+    last_rows = res.sort_values(["casa", "mes"]).groupby("casa", as_index=False).last()
+    last_rows = last_rows[["casa", "fecha_ultimo_pago", "saldo_ultimo"]].rename(
+        columns={"fecha_ultimo_pago": "fecha_pago", "saldo_ultimo": "saldo"}
+    )
+
+    agg = _agg(pagado_by_casa, last_rows)
+    return _resultado(agg, res["total_pagado"].sum(), res["registros"].sum(), res["fecha_ultimo_pago"].max())
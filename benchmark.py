@@ -0,0 +1,188 @@
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+
+import db
+import rendimiento
+from agregados import COLS_DASHBOARD, dashboard_desde_pagos, dashboard_desde_resumen
+from generar_datos import generar_pagos, generar_propietarios
+from importar_datos import importar_desde_csv
+from resumen import cargar_resumen
+
+# Mide import → carga → filtro → agregación → upsert de propietarios a varias
+# escalas, sobre BDs temporales (no toca condominio.db). Los resultados van a
+# JSON para comparar entre commits.
+
+# condominios x casas x años
+ESCALAS = "1x10x1,2x100x3,5x200x5"
+SALIDA_DIR = "bench_results"
+
+
+def parse_escalas(texto: str) -> list:
+    escalas = []
+    for parte in texto.split(","):
+        c, h, y = (int(x) for x in parte.strip().lower().split("x"))
+        escalas.append((c, h, y))
+    return escalas
+
+
+def medir(fn, repeticiones: int, preparar=None) -> dict:
+    """
+    Corre fn `repeticiones` veces y devuelve mediana/mín/máx en segundos.
+    `preparar` se llama antes de cada corrida, fuera del tiempo medido.
+    """
+    tiempos = []
+    for _ in range(repeticiones):
+        if preparar:
+            preparar()
+        t0 = time.perf_counter()
+        fn()
+        tiempos.append(time.perf_counter() - t0)
+    return {
+        "mediana_s": round(statistics.median(tiempos), 6),
+        "min_s": round(min(tiempos), 6),
+        "max_s": round(max(tiempos), 6),
+    }
+
+
+def _commit_actual() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def bench_escala(condominios: int, casas: int, anios: int, repeticiones: int, upserts: int, semilla: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "pagos.csv")
+        pagos = generar_pagos(condominios, casas, anios, semilla=semilla)
+        pagos.to_csv(csv_path, index=False)
+        props = generar_propietarios(condominios, casas, semilla=semilla)
+
+        db.usar_db(os.path.join(tmp, "bench.db"))
+        try:
+            tiempos = {}
+
+            # Importación: completa y luego incremental sin cambios
+            tiempos["importar_completo"] = medir(
+                lambda: importar_desde_csv(completo=True, progreso=None, csv_path=csv_path), repeticiones
+            )
+            tiempos["importar_incremental_sin_cambios"] = medir(
+                lambda: importar_desde_csv(progreso=None, csv_path=csv_path), repeticiones
+            )
+
+            # Carga: en frío (caché vacía) y en caliente
+            tiempos["cargar_df_pagos_frio"] = medir(
+                db.cargar_df_pagos, repeticiones, preparar=db.invalidar_cache_pagos
+            )
+            tiempos["cargar_df_pagos_caliente"] = medir(db.cargar_df_pagos, repeticiones)
+
+            # Frío sin snapshot (SQL + normalización) y columnas del Dashboard
+            def _sql_completo():
+                with db.conexion() as conn:
+                    return db._leer_df_pagos(conn)
+            tiempos["cargar_df_pagos_sql_frio"] = medir(_sql_completo, repeticiones)
+            tiempos["cargar_cols_dashboard_frio"] = medir(
+                lambda: db.cargar_df_pagos(COLS_DASHBOARD), repeticiones, preparar=db.invalidar_cache_pagos
+            )
+
+            # Filtros del sidebar (siempre en frío: es lo que paga un filtro nuevo)
+            casa = pagos["casa"].iloc[0]
+            propietario = pagos["propietario"].iloc[0].split(" - ")[0]
+            fechas = pd.to_datetime(pagos["fecha_pago"], errors="coerce").dropna()
+            desde = fechas.min().date()
+            hasta = (fechas.min() + (fechas.max() - fechas.min()) / 2).date()
+            filtros = {
+                "casa": {"casa": casa},
+                "propietario": {"propietario": propietario},
+                "fechas": {"desde": desde, "hasta": hasta},
+                "casa_fechas": {"casa": casa, "desde": desde, "hasta": hasta},
+            }
+            for nombre, kw in filtros.items():
+                tiempos[f"filtro_{nombre}"] = medir(
+                    lambda kw=kw: db.cargar_df_pagos_filtrado(**kw), repeticiones,
+                    preparar=db.invalidar_cache_pagos
+                )
+
+            # Agregación del Dashboard: sobre pagos y sobre el resumen
+            df = db.cargar_df_pagos()
+            tiempos["dashboard_desde_pagos"] = medir(lambda: dashboard_desde_pagos(df), repeticiones)
+            tiempos["cargar_resumen_frio"] = medir(
+                cargar_resumen, repeticiones, preparar=db.invalidar_cache_pagos
+            )
+            res = cargar_resumen()
+            tiempos["dashboard_desde_resumen"] = medir(lambda: dashboard_desde_resumen(res), repeticiones)
+
+            # Propietarios: `upserts` escrituras sueltas (una transacción c/u)
+            filas = props.head(upserts).to_dict("records")
+            tiempos[f"upsert_propietario_x{len(filas)}"] = medir(
+                lambda: [db.upsert_propietario(f) for f in filas], repeticiones
+            )
+
+            return {
+                "condominios": condominios,
+                "casas": casas,
+                "anios": anios,
+                "filas_pagos": len(pagos),
+                "tamano_db_bytes": os.path.getsize(db.DB_PATH),
+                "tiempos": tiempos,
+            }
+        finally:
+            # Cierra las conexiones antes de borrar el directorio temporal
+            db.usar_db(db.DB_PATH)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark del pipeline de pagos a varias escalas.")
+    parser.add_argument("--escalas", default=ESCALAS, help="lista CxHxY (condominios x casas x años)")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--upserts", type=int, default=100, help="upsert_propietario por corrida")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", default=None, help="archivo JSON (default: bench_results/<commit>_<fecha>.json)")
+    args = parser.parse_args()
+
+    # Se mide el código, no la instrumentación (traza SQL y log)
+    rendimiento.activar(False)
+
+    original = db.DB_PATH
+    resultados = []
+    for c, h, y in parse_escalas(args.escalas):
+        print(f"⏱️  Escala {c}x{h}x{y} …", flush=True)
+        r = bench_escala(c, h, y, args.repeticiones, args.upserts, args.semilla)
+        resultados.append(r)
+        for nombre, t in r["tiempos"].items():
+            print(f"   {nombre:<36} {t['mediana_s'] * 1000:10.1f} ms")
+    db.usar_db(original)
+
+    commit = _commit_actual()
+    ahora = datetime.now()
+    informe = {
+        "commit": commit,
+        "fecha": ahora.isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "sqlite": sqlite3.sqlite_version,
+        "plataforma": platform.platform(),
+        "repeticiones": args.repeticiones,
+        "resultados": resultados,
+    }
+
+    salida = args.salida
+    if salida is None:
+        os.makedirs(SALIDA_DIR, exist_ok=True)
+        salida = os.path.join(SALIDA_DIR, f"{commit or 'sin_commit'}_{ahora:%Y%m%d_%H%M%S}.json")
+    with open(salida, "w", encoding="utf-8") as f:
+        json.dump(informe, f, ensure_ascii=False, indent=2)
+    print(f"✅ Resultados en {salida}")
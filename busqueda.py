@@ -0,0 +1,74 @@
+import re
+import sqlite3
+
+import pandas as pd
+
+# Búsqueda de texto con FTS5 (las tablas y triggers los crea migraciones.py):
+# - propietarios_fts: nombre, cédula, teléfonos, email y casa de cada ficha
+# - pagos_nombres_fts: los nombres distintos de pagos.propietario; el filtro
+#   del sidebar busca ahí y después va a pagos por idx_pagos_propietario
+# El tokenizador pliega mayúsculas y tildes (Pérez = perez) y cada palabra
+# escrita se busca como prefijo ("per" encuentra "Pérez").
+
+TOKENIZADOR = "unicode61 remove_diacritics 2"
+LIMITE_PROPIETARIOS = 20
+
+_PALABRA = re.compile(r"\w+", re.UNICODE)
+
+
+def consulta_fts(texto: str):
+    """
+    Texto libre -> expresión MATCH: cada palabra entre comillas (sin
+    operadores FTS) y como prefijo, todas requeridas. None si no hay palabras.
+    """
+    palabras = _PALABRA.findall(texto or "")
+    if not palabras:
+        return None
+    return " ".join(f'"{p}"*' for p in palabras)
+
+
+# Condición sobre pagos (un parámetro: la expresión de consulta_fts)
+FILTRO_PROPIETARIO_PAGOS = """propietario IN (
+    SELECT n.nombre FROM pagos_nombres_fts f
+    JOIN pagos_nombres n ON n.id = f.rowid
+    WHERE pagos_nombres_fts MATCH ?
+)"""
+
+
+def nombres_pagos(conn: sqlite3.Connection, texto: str) -> list:
+    """
+    Nombres de pagos.propietario que coinciden con el texto.
+    """
+    consulta = consulta_fts(texto)
+    if consulta is None:
+        return []
+    try:
+        filas = conn.execute("""
+            SELECT n.nombre FROM pagos_nombres_fts f
+            JOIN pagos_nombres n ON n.id = f.rowid
+            WHERE pagos_nombres_fts MATCH ?
+        """, (consulta,)).fetchall()
+    except sqlite3.OperationalError:
+        return []
+    return [f[0] for f in filas]
+
+
+def buscar_propietarios(conn: sqlite3.Connection, texto: str, limite: int = LIMITE_PROPIETARIOS) -> pd.DataFrame:
+    """
+    Fichas de propietarios por nombre, cédula, teléfono, email o casa,
+    las más relevantes primero (bm25).
+    """
+    consulta = consulta_fts(texto)
+    if consulta is None:
+        return pd.DataFrame()
+    try:
+        return pd.read_sql_query("""
+            SELECT p.casa, p.nombre, p.cedula, p.celular, p.email
+            FROM propietarios_fts f
+            JOIN propietarios p ON p.id = f.rowid
+            WHERE propietarios_fts MATCH ?
+            ORDER BY f.rank
+            LIMIT ?
+        """, conn, params=[consulta, limite])
+    except Exception:
+        return pd.DataFrame()
@@ -0,0 +1,322 @@
+import argparse
+import sqlite3
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from db import cacheado, conexion
+
+# Cartera vencida por casa. cartera_mov guarda, por casa y mes del periodo,
+# cargo (monto_a_pagar), abono (monto_pagado) y sus sumas acumuladas
+# (SUM() OVER por casa): el saldo corrido de los libros. importar_datos.py
+# la mantiene en la misma transacción recalculando cada casa tocada sólo
+# desde el primer mes que cambió; lo anterior no se vuelve a sumar.
+# La antigüedad se calcula al leer (depende de la fecha de corte): los
+# abonos cubren primero los cargos más viejos (FIFO), así que sólo quedan
+# pendientes los meses cuyo cargo acumulado supera el total abonado.
+# Montos en centavos, como pagos. Las tablas las crea migraciones.py.
+
+# Mes (YYYY-MM) de cada fila de pagos. periodo "YYYY-MM" va tal cual.
+# periodo "1".."12" (CSV plano anual) no trae año: se toma el de fecha_pago,
+# corrido al año que deja el mes del periodo más cerca del pago (diciembre
+# pagado en enero es del año anterior; enero adelantado en diciembre, del
+# siguiente). Sin fecha_pago, el año del último pago de la casa.
+# Un periodo fuera de rango (mes 13, texto) cae al mes de fecha_pago.
+# importar_datos.py ya guarda los periodos de sólo mes como YYYY-MM con este
+# mismo criterio; la rama numérica queda para la migración 16.
+_ANIO_PERIODO = """
+    CASE
+        WHEN p.fecha_pago GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]*' THEN
+            CAST(substr(p.fecha_pago, 1, 4) AS INTEGER) + CASE
+                WHEN CAST(p.periodo AS INTEGER) - CAST(substr(p.fecha_pago, 6, 2) AS INTEGER) > 6 THEN -1
+                WHEN CAST(substr(p.fecha_pago, 6, 2) AS INTEGER) - CAST(p.periodo AS INTEGER) > 6 THEN 1
+                ELSE 0
+            END
+        ELSE (SELECT CAST(substr(MAX(x.fecha_pago), 1, 4) AS INTEGER) FROM pagos x WHERE x.casa = p.casa)
+    END
+"""
+
+MES_PERIODO = f"""
+    CASE
+        WHEN p.periodo GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]'
+             AND substr(p.periodo, 6, 2) BETWEEN '01' AND '12' THEN p.periodo
+        WHEN (p.periodo GLOB '[0-9]' OR p.periodo GLOB '[0-9][0-9]')
+             AND CAST(p.periodo AS INTEGER) BETWEEN 1 AND 12
+             AND ({_ANIO_PERIODO}) IS NOT NULL
+            THEN printf('%04d-%02d', {_ANIO_PERIODO}, CAST(p.periodo AS INTEGER))
+        ELSE substr(p.fecha_pago, 1, 7)
+    END
+"""
+
+# Tramos de antigüedad (días desde el vencimiento: fin del mes del periodo)
+TRAMOS = ["por_vencer", "d1_30", "d31_60", "d61_90", "d90_mas"]
+TRAMOS_TITULO = {
+    "por_vencer": "Por vencer",
+    "d1_30": "1-30",
+    "d31_60": "31-60",
+    "d61_90": "61-90",
+    "d90_mas": "90+",
+}
+VENCIDOS = TRAMOS[1:]
+
+
+def _ahora() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+# ------------------ Mantenimiento (dentro de la importación) ------------------
+def crear_pendientes(conn: sqlite3.Connection):
+    """
+    Tabla temporal: por casa, el primer mes a recalcular en esta transacción.
+    """
+    conn.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS _cartera_pendiente (
+            casa TEXT PRIMARY KEY,
+            desde TEXT NOT NULL
+        )
+    """)
+
+
+def marcar_desde_stage(conn: sqlite3.Connection, stage: str = "_stage_pagos"):
+    """
+    Marca las casas del bloque en `stage` cuyas filas son nuevas o cambiaron
+    (hash distinto), con el mes más antiguo afectado: el mes nuevo de la
+    fila y, si ya existía, también el que tenía (cambió de fecha_pago).
+    Va antes del upsert.
+    """
+    conn.execute(f"""
+        INSERT INTO _cartera_pendiente (casa, desde)
+        SELECT casa, MIN(mes)
+        FROM (
+            SELECT p.casa, {MES_PERIODO} AS mes
+            FROM {stage} p
+            LEFT JOIN pagos a ON a.periodo = p.periodo AND a.casa = p.casa
+            WHERE a.fila_hash IS NOT p.fila_hash
+            UNION ALL
+            SELECT p.casa, {MES_PERIODO} AS mes
+            FROM {stage} s
+            JOIN pagos p ON p.periodo = s.periodo AND p.casa = s.casa
+            WHERE p.fila_hash IS NOT s.fila_hash
+        )
+        GROUP BY casa
+        HAVING MIN(mes) IS NOT NULL
+        ON CONFLICT(casa) DO UPDATE SET desde = MIN(desde, excluded.desde)
+    """)
+
+
+def _insertar_movimientos(conn: sqlite3.Connection, filtro_pagos: str, base: str):
+    # Cargos/abonos por (casa, mes) y sus acumulados sobre la base de cada casa
+    conn.execute(f"""
+        INSERT INTO cartera_mov (casa, mes, cargo, abono, cargo_acum, abono_acum)
+        SELECT
+            g.casa, g.mes, g.cargo, g.abono,
+            b.cargo0 + SUM(g.cargo) OVER w,
+            b.abono0 + SUM(g.abono) OVER w
+        FROM (
+            SELECT p.casa, {MES_PERIODO} AS mes,
+                   SUM(COALESCE(p.monto_a_pagar, 0)) AS cargo,
+                   SUM(COALESCE(p.monto_pagado, 0)) AS abono
+            FROM pagos p
+            {filtro_pagos}
+            GROUP BY p.casa, mes
+        ) g
+        JOIN ({base}) b ON b.casa = g.casa
+        WHERE g.mes IS NOT NULL
+        WINDOW w AS (PARTITION BY g.casa ORDER BY g.mes)
+    """)
+
+
+def actualizar_cartera(conn: sqlite3.Connection, completo: bool = False):
+    """
+    Recalcula la cartera: todo (completo=True) o, por cada casa marcada,
+    desde su primer mes pendiente. Debe correr en la misma transacción que
+    la escritura en pagos.
+    """
+    crear_pendientes(conn)
+    if completo:
+        conn.execute("DELETE FROM cartera_mov")
+        conn.execute("DELETE FROM cartera_casa")
+        _insertar_movimientos(
+            conn, "",
+            "SELECT DISTINCT casa, 0 AS cargo0, 0 AS abono0 FROM pagos"
+        )
+        casas = "SELECT DISTINCT casa FROM cartera_mov"
+    else:
+        conn.execute("""
+            DELETE FROM cartera_mov
+            WHERE (casa, mes) IN (
+                SELECT m.casa, m.mes FROM _cartera_pendiente k
+                JOIN cartera_mov m ON m.casa = k.casa AND m.mes >= k.desde
+            )
+        """)
+        # Tras el DELETE, la última fila que queda de cada casa es la base
+        _insertar_movimientos(
+            conn,
+            f"JOIN _cartera_pendiente k ON k.casa = p.casa WHERE {MES_PERIODO} >= k.desde",
+            """
+            SELECT k.casa,
+                   COALESCE((SELECT m.cargo_acum FROM cartera_mov m WHERE m.casa = k.casa
+                             ORDER BY m.mes DESC LIMIT 1), 0) AS cargo0,
+                   COALESCE((SELECT m.abono_acum FROM cartera_mov m WHERE m.casa = k.casa
+                             ORDER BY m.mes DESC LIMIT 1), 0) AS abono0
+            FROM _cartera_pendiente k
+            """
+        )
+        casas = "SELECT casa FROM _cartera_pendiente"
+
+    # Totales por casa = acumulados del último mes
+    conn.execute(f"""
+        INSERT OR REPLACE INTO cartera_casa (casa, cargos, abonos, saldo, mes_desde, mes_hasta, actualizado_en)
+        SELECT u.casa, u.cargo_acum, u.abono_acum, u.abono_acum - u.cargo_acum, d.mes_desde, u.mes, ?
+        FROM (
+            -- con un único MAX(), SQLite toma las columnas "sueltas" de esa fila
+            SELECT casa, MAX(mes) AS mes, cargo_acum, abono_acum
+            FROM cartera_mov WHERE casa IN ({casas}) GROUP BY casa
+        ) u
+        JOIN (
+            SELECT casa, MIN(mes) AS mes_desde FROM cartera_mov WHERE casa IN ({casas}) GROUP BY casa
+        ) d ON d.casa = u.casa
+    """, (_ahora(),))
+    conn.execute("DELETE FROM _cartera_pendiente")
+
+
+# ------------------ Antigüedad ------------------
+def _tramo(dias: np.ndarray) -> np.ndarray:
+    return np.select(
+        [dias <= 0, dias <= 30, dias <= 60, dias <= 90],
+        TRAMOS[:4],
+        default=TRAMOS[4],
+    )
+
+
+def _pendientes(mov: pd.DataFrame, corte: pd.Timestamp) -> pd.DataFrame:
+    """
+    Parte impaga de cada cargo (FIFO) y su tramo. Vectorizado sobre los
+    acumulados: pendiente = cargo_acum - max(abonos, cargo_acum - cargo),
+    acotado a [0, cargo].
+    """
+    cubierto = np.maximum(mov["abonos"].to_numpy(), (mov["cargo_acum"] - mov["cargo"]).to_numpy())
+    pendiente = np.clip(mov["cargo_acum"].to_numpy() - cubierto, 0, mov["cargo"].to_numpy())
+    vence = pd.to_datetime(mov["mes"] + "-01") + pd.offsets.MonthEnd(0)
+    dias = (corte - vence).dt.days.to_numpy()
+    return pd.DataFrame({
+        "casa": mov["casa"].to_numpy(),
+        "tramo": _tramo(dias),
+        "pendiente": pendiente.astype("int64"),
+    })
+
+
+def _leer_cartera(conn: sqlite3.Connection, corte: pd.Timestamp, condominio: str = None) -> pd.DataFrame:
+    filtro = "WHERE COALESCE(u.condominio, '') = ?" if condominio is not None else ""
+    params = [condominio] if condominio is not None else []
+    try:
+        casas = pd.read_sql_query(f"""
+            SELECT c.casa, COALESCE(u.condominio, '') AS condominio, pr.nombre AS propietario,
+                   c.cargos, c.abonos, c.saldo, c.mes_hasta
+            FROM cartera_casa c
+            LEFT JOIN unidades u ON u.codigo = c.casa
+            LEFT JOIN propietarios pr ON pr.casa = c.casa
+            {filtro}
+            ORDER BY c.casa
+        """, conn, params=params)
+        # Sólo la cola impaga de cada casa (rango en idx_cartera_mov_acum)
+        mov = pd.read_sql_query(f"""
+            SELECT m.casa, m.mes, m.cargo, m.cargo_acum, c.abonos
+            FROM cartera_casa c
+            JOIN cartera_mov m ON m.casa = c.casa AND m.cargo_acum > c.abonos
+            LEFT JOIN unidades u ON u.codigo = c.casa
+            {filtro}
+        """, conn, params=params)
+    except Exception:
+        return pd.DataFrame(columns=["casa", "condominio", "propietario", "saldo"] + TRAMOS + ["vencido"])
+
+    tabla = pd.DataFrame(0, index=casas["casa"], columns=TRAMOS, dtype="int64")
+    if not mov.empty:
+        pend = _pendientes(mov, corte)
+        por_tramo = pend.pivot_table(index="casa", columns="tramo", values="pendiente", aggfunc="sum", fill_value=0)
+        tabla.update(por_tramo)
+        tabla = tabla.astype("int64")
+    casas = casas.merge(tabla, left_on="casa", right_index=True, how="left")
+    casas["vencido"] = casas[VENCIDOS].sum(axis=1).astype("int64")
+    return casas
+
+
+# ------------------ API ------------------
+def _corte(fecha_corte) -> pd.Timestamp:
+    return pd.Timestamp(fecha_corte or date.today()).normalize()
+
+
+def cargar_cartera(fecha_corte=None, condominio: str = None) -> pd.DataFrame:
+    """
+    Una fila por casa: saldo corrido (abonos - cargos; negativo = deuda),
+    pendiente por tramo de antigüedad a la fecha de corte y total vencido.
+    Montos en centavos. Cacheado por (corte, condominio, generación).
+    """
+    corte = _corte(fecha_corte)
+    with conexion() as conn:
+        return cacheado(
+            conn,
+            ("cartera", corte.strftime("%Y-%m-%d"), condominio),
+            lambda c: _leer_cartera(c, corte, condominio)
+        )
+
+
+def cartera_por_condominio(fecha_corte=None) -> pd.DataFrame:
+    """
+    Reporte de cobranza: totales por condominio (casas con deuda, vencido
+    por tramo y saldo neto).
+    """
+    df = cargar_cartera(fecha_corte)
+    if df.empty:
+        return pd.DataFrame(columns=["condominio", "casas", "casas_en_mora", "saldo"] + TRAMOS + ["vencido"])
+    rep = df.groupby("condominio", as_index=False).agg(
+        casas=("casa", "size"),
+        casas_en_mora=("vencido", lambda s: int((s > 0).sum())),
+        saldo=("saldo", "sum"),
+        **{t: (t, "sum") for t in TRAMOS + ["vencido"]},
+    )
+    return rep
+
+
+def cartera_de_casa(casa: str, fecha_corte=None) -> dict:
+    """
+    Fila de cargar_cartera() para una casa, o None si no tiene movimientos.
+    """
+    df = cargar_cartera(fecha_corte)
+    fila = df[df["casa"] == casa]
+    return None if fila.empty else fila.iloc[0].to_dict()
+
+
+def movimientos_casa(casa: str) -> pd.DataFrame:
+    """
+    Saldo corrido mes a mes de una casa (como en los libros).
+    """
+    with conexion() as conn:
+        try:
+            df = pd.read_sql_query("""
+                SELECT mes, cargo, abono, cargo_acum, abono_acum, abono_acum - cargo_acum AS saldo
+                FROM cartera_mov WHERE casa = ? ORDER BY mes
+            """, conn, params=[casa])
+        except Exception:
+            return pd.DataFrame()
+    return df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cartera vencida por condominio.")
+    parser.add_argument("--corte", default=None, help="fecha de corte YYYY-MM-DD (default: hoy)")
+    parser.add_argument("--completo", action="store_true", help="recalcula toda la cartera desde pagos")
+    args = parser.parse_args()
+
+    from migraciones import migrar
+    migrar()
+    if args.completo:
+        with conexion() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            actualizar_cartera(conn, completo=True)
+
+    rep = cartera_por_condominio(args.corte)
+    for col in ["saldo"] + TRAMOS + ["vencido"]:
+        rep[col] = rep[col] / 100
+    print(rep.to_string(index=False))
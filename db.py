@@ -0,0 +1,836 @@
+import os
+import queue
+import random
+import sqlite3
+import sys
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+
+# pandas queda a nivel de módulo a propósito: se importa una vez por
+# proceso de Streamlit (~0.4 s) y los reruns reutilizan el módulo. Lo
+# usan casi todas las funciones de aquí y los módulos que main.py carga al
+# arrancar (migraciones -> cartera, resumen, busqueda, snapshot).
+import pandas as pd
+
+import busqueda
+import rendimiento
+import snapshot
+
+DB_PATH = "condominio.db"
+# Casas iniciales del catálogo de unidades en una BD nueva (ver unidades.py)
+CASAS = [f"C{i:02d}" for i in range(1, 11)]  # C01..C10
+
+# Tamaño máximo del pool (conexiones vivas reutilizables por proceso)
+POOL_SIZE = int(os.environ.get("CONDOMINIO_DB_POOL", "8"))
+# Espera máxima por una conexión libre con el pool lleno
+POOL_ESPERA_S = float(os.environ.get("CONDOMINIO_DB_POOL_ESPERA_S", "30"))
+
+# Espera máxima por el lock de escritura antes de "database is locked"
+BUSY_TIMEOUT_MS = int(os.environ.get("CONDOMINIO_BUSY_TIMEOUT_MS", "5000"))
+
+# Pragmas aplicados a cada conexión nueva.
+# journal_mode=WAL es persistente en el archivo; el resto es por conexión.
+PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",      # seguro con WAL y mucho más barato que FULL
+    "PRAGMA cache_size=-20000",       # ~20 MB de caché de páginas por conexión
+    "PRAGMA mmap_size=268435456",     # 256 MB de lectura vía mmap
+    "PRAGMA temp_store=MEMORY",
+    f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}",
+]
+
+
+# ------------------ Pool de conexiones ------------------
+class PoolConexiones:
+    """
+    Pool de conexiones SQLite compartido por todo el proceso.
+    Streamlit re-ejecuta main.py en cada interacción, pero los módulos
+    importados quedan en memoria: el pool sobrevive a reruns y sesiones.
+    """
+
+    def __init__(self, path: str, size: int = POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._libres = queue.LifoQueue()
+        self._creadas = 0
+        self._lock = threading.Lock()
+
+    def _nueva_conexion(self) -> sqlite3.Connection:
+        # check_same_thread=False: una conexión puede pasar de un hilo de
+        # Streamlit a otro, pero nunca se usa por dos hilos a la vez.
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def obtener(self) -> sqlite3.Connection:
+        try:
+            return self._libres.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._creadas < self.size:
+                self._creadas += 1
+                crear = True
+            else:
+                crear = False
+
+        if crear:
+            try:
+                return self._nueva_conexion()
+            except Exception:
+                with self._lock:
+                    self._creadas -= 1
+                raise
+
+        # Pool lleno: espera a que otra sesión devuelva su conexión. Una
+        # conexión que nunca vuelve (fuga) da error en vez de colgar la app
+        try:
+            return self._libres.get(timeout=POOL_ESPERA_S)
+        except queue.Empty:
+            raise sqlite3.OperationalError(
+                f"pool de conexiones agotado: ninguna de las {self.size} conexiones se liberó en {POOL_ESPERA_S:g} s"
+            ) from None
+
+    def devolver(self, conn: sqlite3.Connection):
+        if conn.in_transaction:
+            conn.rollback()
+        self._libres.put(conn)
+
+    def cerrar(self):
+        while True:
+            try:
+                conn = self._libres.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._creadas -= 1
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> PoolConexiones:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = PoolConexiones(DB_PATH)
+    return _pool
+
+
+def usar_db(path: str):
+    """
+    Apunta el módulo a otra BD (benchmarks, herramientas): cierra el pool
+    actual y vacía las cachés que dependen del archivo.
+    """
+    global _pool, DB_PATH
+    with _pool_lock:
+        if _pool is not None:
+            _pool.cerrar()
+        _pool = None
+        DB_PATH = path
+    invalidar_columnas()
+    invalidar_cache_pagos()
+
+
+@contextmanager
+def conexion():
+    """
+    Presta una conexión del pool. Hace commit al salir si hubo escrituras
+    y rollback si hubo excepción.
+    """
+    pool = get_pool()
+    conn = pool.obtener()
+    trazada = rendimiento.trazar_conexion(conn)
+    try:
+        yield conn
+        if conn.in_transaction:
+            conn.commit()
+    except Exception:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        if trazada:
+            rendimiento.soltar_conexion(conn)
+        pool.devolver(conn)
+
+
+# ------------------ Escrituras con reintento ------------------
+# Una importación tiene el lock de escritura durante toda su transacción;
+# los formularios esperan busy_timeout y, si sigue ocupada, reintentan con
+# espera exponencial (con jitter para que varios admins no choquen en fila).
+REINTENTOS_ESCRITURA = 6
+ESPERA_INICIAL_S = 0.1
+ESPERA_MAX_S = 2.0
+
+
+def _bd_ocupada(e: sqlite3.OperationalError) -> bool:
+    msg = str(e).lower()
+    return "locked" in msg or "busy" in msg
+
+
+def escribir(fn, intentos: int = REINTENTOS_ESCRITURA):
+    """
+    Ejecuta fn(conn) en una transacción BEGIN IMMEDIATE (el lock se toma al
+    inicio: no hay choque a mitad de camino) y devuelve su resultado.
+    Reintenta toda la transacción si la BD está ocupada.
+    """
+    espera = ESPERA_INICIAL_S
+    for intento in range(intentos):
+        try:
+            with conexion() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                return fn(conn)
+        except sqlite3.OperationalError as e:
+            if not _bd_ocupada(e) or intento == intentos - 1:
+                raise
+        time.sleep(espera * (1 + random.random()))
+        espera = min(espera * 2, ESPERA_MAX_S)
+
+
+# ------------------ Metadatos de columnas ------------------
+_columnas = {}
+
+
+def columnas(tabla: str, conn: sqlite3.Connection = None) -> list:
+    """
+    Nombres de columnas de una tabla (PRAGMA table_info), cacheados por proceso.
+    """
+    cols = _columnas.get(tabla)
+    if cols is not None:
+        return cols
+
+    if conn is None:
+        with conexion() as c:
+            return columnas(tabla, c)
+
+    # PRAGMA table_info devuelve tuples (cid, name, type, ...) -> queremos name
+    cols = [r[1] for r in conn.execute(f"PRAGMA table_info({tabla})").fetchall()]
+    if cols:
+        _columnas[tabla] = cols
+    return cols
+
+
+def invalidar_columnas(tabla: str = None):
+    if tabla is None:
+        _columnas.clear()
+    else:
+        _columnas.pop(tabla, None)
+
+
+# ------------------ Generaciones (invalidación de cachés) ------------------
+def leer_generacion(conn: sqlite3.Connection, clave: str = "pagos") -> int:
+    """
+    Contador que sube cada vez que una escritura modifica la tabla `clave`.
+    Leerlo es un lookup por PK: mucho más barato que recargar la tabla.
+    """
+    try:
+        row = conn.execute("SELECT valor FROM meta WHERE clave=?", (clave,)).fetchone()
+    except sqlite3.OperationalError:
+        # meta aún no existe (BD sin importaciones)
+        return 0
+    return int(row[0]) if row else 0
+
+
+def incrementar_generacion(conn: sqlite3.Connection, clave: str = "pagos"):
+    """
+    Debe llamarse dentro de la misma transacción que modifica la tabla,
+    para que los lectores nunca vean datos nuevos con generación vieja.
+    """
+    conn.execute("""
+        INSERT INTO meta (clave, valor) VALUES (?, 1)
+        ON CONFLICT(clave) DO UPDATE SET valor = valor + 1
+    """, (clave,))
+
+
+# ------------------ usuarios ------------------
+# El esquema (tablas e índices) vive en migraciones.py
+def verificar_credenciales(user: str, pw: str):
+    """
+    Devuelve el rol del usuario si las credenciales son válidas, o None.
+    """
+    pw_hash = hashlib.sha256(pw.encode()).hexdigest()
+    with conexion() as conn:
+        row = conn.execute("SELECT rol FROM usuarios WHERE user=? AND pw=?", (user, pw_hash)).fetchone()
+    return row[0] if row else None
+
+
+# ------------------ Datos: pagos ------------------
+# Caché compartida por todas las sesiones del proceso, con claves
+# (consulta, generación). Una entrada se invalida sólo cuando cambia la
+# generación de pagos (importar_datos.py la incrementa).
+# LRU acotada por entradas y por bytes aproximados: una entrada puede ser
+# un frame filtrado de pagos, así que contar entradas no acota la memoria.
+# Un valor más grande que todo el presupuesto se devuelve sin cachear.
+CACHE_MAX_ENTRADAS = 32
+CACHE_MAX_BYTES = int(os.environ.get("CONDOMINIO_CACHE_MB", "256")) * 1024 * 1024
+
+_cache_pagos = OrderedDict()  # key -> (valor, bytes)
+_cache_bytes = 0
+_cache_stats = {"hits": 0, "misses": 0, "ultima_carga_s": 0.0, "generacion": None}
+_cache_lock = threading.Lock()
+
+
+def _tamano(valor) -> int:
+    """
+    Bytes aproximados de un valor cacheado: frames con memory_usage(deep),
+    dicts/listas sumando sus elementos (p. ej. KPIs con agg y chart_df).
+    """
+    if isinstance(valor, pd.DataFrame):
+        return int(valor.memory_usage(index=True, deep=True).sum())
+    if isinstance(valor, pd.Series):
+        return int(valor.memory_usage(index=True, deep=True))
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(_tamano(k) + _tamano(v) for k, v in valor.items())
+    if isinstance(valor, (list, tuple)):
+        return sys.getsizeof(valor) + sum(_tamano(v) for v in valor)
+    return sys.getsizeof(valor)
+
+
+def cacheado(conn: sqlite3.Connection, clave, loader):
+    """
+    Devuelve loader(conn) cacheado por (clave, generación de pagos).
+    Sirve para cualquier lectura derivada de pagos.
+    """
+    global _cache_bytes
+    gen = leer_generacion(conn)
+    key = (clave, gen)
+
+    with _cache_lock:
+        if key in _cache_pagos:
+            _cache_pagos.move_to_end(key)
+            _cache_stats["hits"] += 1
+            return _cache_pagos[key][0]
+
+    t0 = time.perf_counter()
+    valor = loader(conn)
+    elapsed = time.perf_counter() - t0
+    tamano = _tamano(valor)
+
+    with _cache_lock:
+        if tamano <= CACHE_MAX_BYTES:
+            if key in _cache_pagos:
+                _cache_bytes -= _cache_pagos.pop(key)[1]
+            _cache_pagos[key] = (valor, tamano)
+            _cache_bytes += tamano
+            while len(_cache_pagos) > CACHE_MAX_ENTRADAS or _cache_bytes > CACHE_MAX_BYTES:
+                _cache_bytes -= _cache_pagos.popitem(last=False)[1][1]
+        _cache_stats["misses"] += 1
+        _cache_stats["ultima_carga_s"] = elapsed
+        _cache_stats["generacion"] = gen
+
+    return valor
+
+
+# Montos de pagos: enteros en centavos en la BD y en los frames (sumas
+# exactas, sin deriva de float). A dólares sólo al mostrar o exportar.
+MONTOS_PAGOS = ["monto_a_pagar", "monto_pagado", "provision", "decimos", "sueldo", "saldo_pagar"]
+
+# Texto repetido por fila -> category (menos memoria, groupby más rápido)
+CATEGORICAS_PAGOS = ["periodo", "casa", "propietario", "periodo_mes"]
+TEXTO_PAGOS = ["fila_hash"]
+
+
+def _normalizar_df_pagos(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Tipos finales del frame de pagos. casa/propietario ya vienen limpios
+    de la importación (y de la migración 9 para filas anteriores).
+    También sin filas: el frame vacío tiene las mismas columnas y tipos que
+    el que sale del snapshot Parquet.
+    """
+    needed = ["casa", "propietario", "fecha_pago", "monto_pagado", "saldo_pagar"]
+    for c in needed:
+        if c not in df.columns:
+            df[c] = None
+
+    if "id" in df.columns:
+        df["id"] = df["id"].astype("int64")
+    if df.empty:
+        # Sin filas read_sql_query no infiere tipos: el texto queda object
+        for c in TEXTO_PAGOS:
+            if c in df.columns:
+                df[c] = df[c].astype("str")
+
+    df["fecha_pago"] = pd.to_datetime(df["fecha_pago"], errors="coerce").astype("datetime64[us]")
+    df["periodo_mes"] = df["fecha_pago"].dt.to_period("M").astype(str)
+
+    for c in MONTOS_PAGOS:
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0).astype("int64")
+    for c in CATEGORICAS_PAGOS:
+        if c in df.columns:
+            df[c] = df[c].fillna("").astype("category")
+
+    return df
+
+
+def _leer_df_pagos(conn: sqlite3.Connection, where: str = "", params=(), columnas=None) -> pd.DataFrame:
+    select = ",".join(columnas) if columnas else "*"
+    with rendimiento.tramo("db: sql pagos"):
+        try:
+            df = pd.read_sql_query(f"SELECT {select} FROM pagos {where}", conn, params=list(params))
+        except Exception:
+            df = pd.DataFrame(columns=list(columnas or []))
+    with rendimiento.tramo("db: normalización pagos"):
+        df = _normalizar_df_pagos(df)
+    return df[list(columnas)] if columnas else df
+
+
+def _leer_pagos(conn: sqlite3.Connection, columnas=None, casa=None, propietario="", desde=None, hasta=None):
+    """
+    Del snapshot Parquet si está vigente (ya normalizado, sólo las columnas
+    pedidas); si no, con SQL.
+    """
+    with rendimiento.tramo("db: snapshot pagos"):
+        df = snapshot.leer_snapshot(
+            conn, snapshot.ruta_snapshot(DB_PATH), columnas, casa, propietario, desde, hasta
+        )
+    if df is not None:
+        return df
+    where, params = construir_filtro_pagos(casa, propietario, desde, hasta)
+    return _leer_df_pagos(conn, where, params, columnas)
+
+
+def cargar_df_pagos(columnas=None):
+    """
+    DataFrame normalizado de pagos, cacheado por generación.
+    El frame devuelto es compartido: no modificarlo en sitio.
+    """
+    with conexion() as conn:
+        return cacheado(
+            conn,
+            ("todos", tuple(columnas or ())),
+            lambda c: _leer_pagos(c, columnas)
+        )
+
+
+def construir_filtro_pagos(casa: str = None, propietario: str = "", desde=None, hasta=None):
+    """
+    Traduce los filtros del sidebar a un WHERE parametrizado sobre pagos.
+    - casa usa idx_pagos_casa_fecha (y el rango de fechas dentro de la casa)
+    - sólo fechas usa idx_pagos_fecha
+    - propietario usa pagos_nombres_fts y luego idx_pagos_propietario
+    Devuelve (where_sql, params).
+    """
+    conds = []
+    params = []
+
+    if casa and casa != "Todas":
+        conds.append("casa = ?")
+        params.append(casa)
+
+    if desde and hasta:
+        # fecha_pago se guarda como texto ISO (YYYY-MM-DD): comparación lexicográfica
+        conds.append("fecha_pago BETWEEN ? AND ?")
+        params.extend([str(desde), str(hasta)])
+
+    # propietario: palabras (prefijo, sin tildes) en el índice FTS5 de nombres
+    consulta = busqueda.consulta_fts(propietario)
+    if consulta:
+        conds.append(busqueda.FILTRO_PROPIETARIO_PAGOS)
+        params.append(consulta)
+
+    where = ("WHERE " + " AND ".join(conds)) if conds else ""
+    return where, params
+
+
+def cargar_df_pagos_filtrado(casa: str = None, propietario: str = "", desde=None, hasta=None, columnas=None):
+    """
+    Sólo las filas que cumplen los filtros (y las columnas pedidas) llegan
+    a pandas. Cacheado por (filtros, columnas, generación); el frame
+    devuelto es compartido.
+    """
+    where, params = construir_filtro_pagos(casa, propietario, desde, hasta)
+    with conexion() as conn:
+        return cacheado(
+            conn,
+            ("filtrado", where, tuple(params), tuple(columnas or ())),
+            lambda c: _leer_pagos(c, columnas, casa, propietario, desde, hasta)
+        )
+
+
+def contar_pagos(casa: str = None, propietario: str = "", desde=None, hasta=None) -> int:
+    """
+    Total de filas del filtro (COUNT sobre los mismos índices), cacheado.
+    """
+    where, params = construir_filtro_pagos(casa, propietario, desde, hasta)
+
+    def _leer(conn):
+        try:
+            return conn.execute(f"SELECT COUNT(*) FROM pagos {where}", params).fetchone()[0]
+        except sqlite3.OperationalError:
+            return 0
+
+    with conexion() as conn:
+        return cacheado(conn, ("conteo", where, tuple(params)), _leer)
+
+
+# ------------------ Paginación (keyset) ------------------
+# Orden de las tablas: casa ASC, fecha_pago DESC, id DESC (filas sin fecha
+# al final de cada casa). Cada página se busca con un salto en
+# idx_pagos_casa_fecha recorrido hacia atrás: el costo depende del tamaño
+# de página, no de cuántas páginas hay antes.
+PAGINA_TAMANO = 50
+
+
+def _buscar_en_casa(conn, casa: str, propietario: str, desde, hasta, despues, n: int) -> list:
+    """
+    Hasta n filas de una casa, a continuación de `despues` = (fecha_pago, id)
+    de la última fila mostrada (None = desde el inicio).
+    """
+    base, params_base = construir_filtro_pagos(casa, propietario)
+    con_rango = bool(desde and hasta)
+    filas = []
+
+    # Filas con fecha (mientras el cursor no haya pasado a las sin fecha)
+    if despues is None or despues[0] is not None:
+        conds = []
+        params = list(params_base)
+        tope = str(hasta) if con_rango else None
+        if despues is not None:
+            # El tope del rango absorbe el cursor: sigue siendo un rango del índice
+            tope = min(tope, despues[0]) if tope else despues[0]
+        if con_rango:
+            conds.append("fecha_pago BETWEEN ? AND ?")
+            params.extend([str(desde), tope])
+        elif tope:
+            conds.append("fecha_pago <= ?")
+            params.append(tope)
+        else:
+            conds.append("fecha_pago IS NOT NULL")
+        if despues is not None:
+            conds.append("NOT (fecha_pago = ? AND id >= ?)")
+            params.extend(despues)
+        cur = conn.execute(
+            f"SELECT * FROM pagos {base} AND {' AND '.join(conds)} "
+            f"ORDER BY fecha_pago DESC, id DESC LIMIT ?",
+            params + [n]
+        )
+        filas.extend(cur.fetchall())
+
+    # Sin rango de fechas, las filas sin fecha también entran (al final)
+    if len(filas) < n and not con_rango:
+        conds = ["fecha_pago IS NULL"]
+        params = list(params_base)
+        if despues is not None and despues[0] is None:
+            conds.append("id < ?")
+            params.append(despues[1])
+        cur = conn.execute(
+            f"SELECT * FROM pagos {base} AND {' AND '.join(conds)} ORDER BY id DESC LIMIT ?",
+            params + [n - len(filas)]
+        )
+        filas.extend(cur.fetchall())
+
+    return filas
+
+
+def pagina_pagos(
+    casa: str = None,
+    propietario: str = "",
+    desde=None,
+    hasta=None,
+    despues=None,
+    tamano: int = PAGINA_TAMANO,
+):
+    """
+    Una página de pagos para el filtro del sidebar.
+    `despues` es el cursor devuelto por la página anterior (None = primera).
+    Devuelve (df_normalizado, cursor_siguiente); el cursor es None en la última página.
+    """
+    casas = [casa] if casa and casa != "Todas" else casas_en_pagos()
+    if despues is not None:
+        casas = [c for c in casas if c >= despues[0]]
+
+    with conexion() as conn:
+        cols = columnas("pagos", conn)
+        if not cols:
+            return pd.DataFrame(), None
+        i_fecha = cols.index("fecha_pago")
+        i_id = cols.index("id")
+
+        # Una fila de más para saber si hay página siguiente
+        filas = []
+        for c in casas:
+            cursor_casa = despues[1:] if despues is not None and c == despues[0] else None
+            filas.extend(_buscar_en_casa(conn, c, propietario, desde, hasta, cursor_casa, tamano + 1 - len(filas)))
+            if len(filas) > tamano:
+                break
+
+    siguiente = None
+    if len(filas) > tamano:
+        filas = filas[:tamano]
+        ultima = filas[-1]
+        siguiente = (ultima[cols.index("casa")], ultima[i_fecha], ultima[i_id])
+
+    df = pd.DataFrame(filas, columns=cols)
+    return _normalizar_df_pagos(df), siguiente
+
+
+def casas_en_pagos() -> list:
+    """
+    Casas distintas presentes en pagos (recorre sólo idx_pagos_casa_fecha).
+    """
+    def _leer(conn):
+        try:
+            rows = conn.execute("SELECT DISTINCT casa FROM pagos ORDER BY casa").fetchall()
+        except sqlite3.OperationalError:
+            return []
+        return [r[0] for r in rows if r[0]]
+
+    with conexion() as conn:
+        return cacheado(conn, "casas", _leer)
+
+
+def rango_fechas_pagos():
+    """
+    (min, max) de fecha_pago como Timestamps. Cada subconsulta MIN/MAX
+    se resuelve con un solo salto en idx_pagos_fecha, sin escanear la tabla.
+    """
+    def _leer(conn):
+        try:
+            row = conn.execute("""
+                SELECT
+                    (SELECT MIN(fecha_pago) FROM pagos WHERE fecha_pago IS NOT NULL),
+                    (SELECT MAX(fecha_pago) FROM pagos)
+            """).fetchone()
+        except sqlite3.OperationalError:
+            return None, None
+        return pd.to_datetime(row[0], errors="coerce"), pd.to_datetime(row[1], errors="coerce")
+
+    with conexion() as conn:
+        return cacheado(conn, "rango_fechas", _leer)
+
+
+def ultimos_pagos(n: int = 20) -> pd.DataFrame:
+    """
+    Los `n` pagos más recientes (un recorrido corto de idx_pagos_fecha
+    desde el final), para vistas rápidas sin cargar la tabla.
+    """
+    with conexion() as conn:
+        return cacheado(
+            conn,
+            ("ultimos", n),
+            lambda c: _leer_df_pagos(c, "ORDER BY fecha_pago DESC LIMIT ?", [n])
+        )
+
+
+def _trozos_pagos(conn: sqlite3.Connection):
+    """
+    Todos los pagos normalizados, de a snapshot.ROW_GROUP filas, en el
+    orden del snapshot (casa, fecha; idx_pagos_casa_fecha, sin ordenar en
+    memoria). id desempata como el orden de inserción de la lectura SQL.
+    """
+    sql = "SELECT * FROM pagos ORDER BY casa, fecha_pago, id"
+    for df in pd.read_sql_query(sql, conn, chunksize=snapshot.ROW_GROUP):
+        yield _normalizar_df_pagos(df)
+
+
+def actualizar_snapshot_pagos(forzar: bool = False) -> bool:
+    """
+    Reescribe el snapshot Parquet de pagos si falta o quedó viejo (lo llama
+    importar_datos.py tras cada carga). Versión y filas se leen en la
+    misma transacción de lectura. El costo en tiempo sigue siendo el de
+    toda la tabla (se reescribe entera), pero la memoria es la de un row
+    group: las filas van del cursor al archivo por bloques.
+    Devuelve True si escribió.
+    """
+    if not snapshot.disponible():
+        return False
+    path = snapshot.ruta_snapshot(DB_PATH)
+    with conexion() as conn:
+        conn.execute("BEGIN")
+        if not forzar and snapshot.vigente(conn, path):
+            return False
+        version = snapshot.version_bd(conn)
+        with rendimiento.tramo("db: escribir snapshot"):
+            filas = snapshot.escribir_snapshot(path, _trozos_pagos(conn), version)
+    return filas > 0
+
+
+def invalidar_cache_pagos():
+    global _cache_bytes
+    with _cache_lock:
+        _cache_pagos.clear()
+        _cache_bytes = 0
+
+
+def cache_stats() -> dict:
+    with _cache_lock:
+        stats = dict(_cache_stats)
+        stats["entradas"] = len(_cache_pagos)
+        stats["bytes"] = _cache_bytes
+        completo = [v for k, (v, _) in _cache_pagos.items() if k[0] == ("todos", ())]
+        stats["filas"] = len(completo[-1]) if completo else 0
+    return stats
+
+
+# ------------------ Datos: propietarios CRUD ------------------
+def _ahora() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+PROPIETARIO_COLS = [
+    "casa", "foto_path", "nombre", "cedula", "telefono_fijo", "celular",
+    "area", "alicuota_pct", "email",
+    "tiene_arrendatario", "no_autos",
+    "placa1", "placa2", "placa3", "placa4", "placa5", "placa6",
+    "asistente_hogar", "asistente_nombre",
+    "actualizado_en"
+]
+
+
+def get_propietario(casa: str) -> dict:
+    with conexion() as conn:
+        row = conn.execute("SELECT * FROM propietarios WHERE casa=?", (casa,)).fetchone()
+        if not row:
+            return {"casa": casa}
+        cols = columnas("propietarios", conn)
+
+    return dict(zip(cols, row))
+
+
+def upsert_propietario(data: dict):
+    """
+    Inserta/actualiza por casa, todas las columnas (carga masiva). Para
+    ediciones desde el formulario usar guardar_propietario().
+    placa1..placa6 se reflejan en la tabla placas en la misma transacción
+    (PlacasOcupadas si alguna está vigente en otra casa).
+    """
+    # Import local: placas importa db
+    from placas import asignar_placas
+
+    data = dict(data)
+    data["actualizado_en"] = _ahora()
+
+    cols = PROPIETARIO_COLS
+
+    # Normaliza ausentes
+    for c in cols:
+        if c not in data:
+            data[c] = None
+
+    placeholders = ",".join(["?"] * len(cols))
+    update_set = ",".join([f"{c}=excluded.{c}" for c in cols if c != "casa"])
+
+    placas = [str(p).strip().upper() for p in (data[f"placa{i}"] for i in range(1, 7)) if pd.notna(p) and str(p).strip()]
+
+    def _upsert(conn):
+        conn.execute(f"""
+            INSERT INTO propietarios ({",".join(cols)})
+            VALUES ({placeholders})
+            ON CONFLICT(casa) DO UPDATE SET
+            {update_set}, version = propietarios.version + 1
+        """, [data[c] for c in cols])
+        asignar_placas(conn, data["casa"], placas)
+
+    escribir(_upsert)
+
+
+class ConflictoEdicion(Exception):
+    """
+    Otro usuario guardó la misma ficha después de leerla y cambió alguna
+    de las columnas editadas. `actual` es la fila vigente y `diferencias`
+    una lista de {campo, leido, actual, tuyo}.
+    """
+
+    def __init__(self, casa: str, actual: dict, diferencias: list):
+        super().__init__(f"La ficha de {casa} cambió mientras se editaba: {', '.join(d['campo'] for d in diferencias)}")
+        self.casa = casa
+        self.actual = actual
+        self.diferencias = diferencias
+
+
+def _igual_en_ficha(nuevo, leido) -> bool:
+    """
+    Valor del formulario frente al de la ficha: los vacíos de los widgets
+    ("" de un text_input, 0.0 de un number_input) equivalen a NULL.
+    """
+    if leido is None:
+        return nuevo is None or nuevo == "" or nuevo == 0
+    return nuevo == leido
+
+
+def cambios_ficha(original: dict, nuevos: dict) -> dict:
+    """
+    Columnas de `nuevos` que de verdad difieren de `original`.
+    """
+    return {
+        c: nuevos[c] for c in PROPIETARIO_COLS
+        if c in nuevos and c not in ("casa", "actualizado_en") and not _igual_en_ficha(nuevos[c], original.get(c))
+    }
+
+
+def guardar_propietario(original: dict, nuevos: dict, extra=None) -> list:
+    """
+    Guarda sólo las columnas que difieren de `original` (la ficha tal como
+    se leyó con get_propietario). Bloqueo optimista por `version`: si otro
+    usuario guardó entre medio, sus cambios en otras columnas se conservan
+    y, si tocó alguna de las mismas, lanza ConflictoEdicion sin escribir.
+    extra(conn) corre en la misma transacción (p. ej. placas).
+    Devuelve las columnas escritas.
+    """
+    casa = original["casa"]
+    cambios = cambios_ficha(original, nuevos)
+
+    def _guardar(conn):
+        row = conn.execute("SELECT * FROM propietarios WHERE casa=?", (casa,)).fetchone()
+        actual = dict(zip(columnas("propietarios", conn), row)) if row else None
+
+        if actual is not None and actual.get("version") != original.get("version"):
+            choques = [
+                c for c in cambios
+                if actual.get(c) != original.get(c) and not _igual_en_ficha(cambios[c], actual.get(c))
+            ]
+            if choques:
+                raise ConflictoEdicion(casa, actual, [
+                    {"campo": c, "leido": original.get(c), "actual": actual.get(c), "tuyo": cambios[c]}
+                    for c in choques
+                ])
+
+        if cambios:
+            valores = dict(cambios, actualizado_en=_ahora())
+            if actual is None:
+                cols = ["casa"] + list(valores)
+                conn.execute(
+                    f"INSERT INTO propietarios ({','.join(cols)}, version) VALUES ({','.join(['?'] * len(cols))}, 1)",
+                    [casa] + list(valores.values())
+                )
+            else:
+                conn.execute(
+                    f"UPDATE propietarios SET {', '.join(f'{c}=?' for c in valores)}, version = version + 1 "
+                    f"WHERE casa=?",
+                    list(valores.values()) + [casa]
+                )
+        if extra is not None:
+            extra(conn)
+        return list(cambios)
+
+    return escribir(_guardar)
+
+
+def buscar_propietarios(texto: str, limite: int = busqueda.LIMITE_PROPIETARIOS) -> pd.DataFrame:
+    """
+    Búsqueda global: nombre, cédula, teléfono, email o casa (por palabras,
+    sin tildes, por prefijo).
+    """
+    with conexion() as conn:
+        return busqueda.buscar_propietarios(conn, texto, limite)
+
+
+def cargar_df_propietarios_resumen():
+    with conexion() as conn:
+        try:
+            return pd.read_sql_query(
+                "SELECT casa, nombre, cedula, celular, email, actualizado_en FROM propietarios", conn
+            )
+        except Exception:
+            return pd.DataFrame()
@@ -0,0 +1,167 @@
+import csv
+import glob
+import os
+import tempfile
+import time
+
+from db import MONTOS_PAGOS, conexion, construir_filtro_pagos
+from importar_propietarios import ARCHIVO_COLS
+
+# openpyxl es opcional: sin él sólo se exporta CSV
+try:
+    from openpyxl import Workbook
+except ImportError:
+    Workbook = None
+
+# Exportación del histórico filtrado: se genera sólo cuando se pide, leyendo
+# pagos por bloques con fetchmany y escribiendo a un archivo temporal.
+# La memoria queda acotada por EXPORT_CHUNK filas.
+
+EXPORT_CHUNK = 10_000
+EXPORT_PREFIJO = "condominio_export_"
+EXPORT_MAX_EDAD_S = 3600
+
+# Mismas columnas que pagos_planos_2025.csv (el archivo se puede reimportar)
+EXPORT_COLS = [
+    "periodo", "casa", "propietario",
+    "monto_a_pagar", "fecha_pago", "monto_pagado",
+    "provision", "decimos", "sueldo", "saldo_pagar"
+]
+
+FORMATOS = {
+    "csv": ("text/csv", ".csv"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", ".xlsx"),
+}
+
+
+def formatos_disponibles() -> list:
+    return [f for f in FORMATOS if f != "xlsx" or Workbook is not None]
+
+
+def iterar_pagos(casa: str = None, propietario: str = "", desde=None, hasta=None, chunk: int = EXPORT_CHUNK):
+    """
+    Bloques de hasta `chunk` filas (tuplas en el orden de EXPORT_COLS)
+    con los filtros del sidebar, en el orden de las tablas.
+    """
+    where, params = construir_filtro_pagos(casa, propietario, desde, hasta)
+    # Montos de centavos a dólares: el archivo se puede reimportar tal cual
+    select = ",".join(f"{c} / 100.0" if c in MONTOS_PAGOS else c for c in EXPORT_COLS)
+    with conexion() as conn:
+        cur = conn.execute(
+            f"SELECT {select} FROM pagos {where} "
+            f"ORDER BY casa, fecha_pago DESC, id DESC",
+            params
+        )
+        while True:
+            filas = cur.fetchmany(chunk)
+            if not filas:
+                break
+            yield filas
+
+
+def iterar_propietarios(chunk: int = EXPORT_CHUNK):
+    """
+    Propietarios en el formato de importar_propietarios (ARCHIVO_COLS):
+    condominio/bloque del catálogo y las placas vigentes separadas por espacio.
+    """
+    with conexion() as conn:
+        cur = conn.execute("""
+            SELECT p.casa, COALESCE(u.condominio, ''), COALESCE(u.bloque, ''),
+                   p.nombre, p.cedula, p.telefono_fijo, p.celular, p.email,
+                   p.area, p.alicuota_pct,
+                   CASE WHEN p.tiene_arrendatario = 1 THEN 'Sí' ELSE 'No' END, p.no_autos,
+                   CASE WHEN p.asistente_hogar = 1 THEN 'Sí' ELSE 'No' END, p.asistente_nombre,
+                   COALESCE(pl.placas, '')
+            FROM propietarios p
+            LEFT JOIN unidades u ON u.codigo = p.casa
+            LEFT JOIN (
+                SELECT casa, group_concat(placa, ' ') AS placas
+                FROM (SELECT casa, placa FROM placas WHERE valido_hasta IS NULL ORDER BY casa, valido_desde, placa)
+                GROUP BY casa
+            ) pl ON pl.casa = p.casa
+            ORDER BY p.casa
+        """)
+        while True:
+            filas = cur.fetchmany(chunk)
+            if not filas:
+                break
+            yield filas
+
+
+def _escribir_csv(path: str, bloques, cols=EXPORT_COLS) -> int:
+    n = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(cols)
+        for filas in bloques:
+            w.writerows(filas)
+            n += len(filas)
+    return n
+
+
+def _escribir_xlsx(path: str, bloques, cols=EXPORT_COLS, hoja: str = "pagos") -> int:
+    if Workbook is None:
+        raise RuntimeError("Exportar a Excel requiere openpyxl (pip install openpyxl).")
+    # write_only: las filas se vuelcan a disco, no quedan en memoria
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(hoja)
+    ws.append(cols)
+    n = 0
+    for filas in bloques:
+        for fila in filas:
+            ws.append(fila)
+        n += len(filas)
+    wb.save(path)
+    return n
+
+
+def limpiar_exportaciones(max_edad_s: int = EXPORT_MAX_EDAD_S):
+    """
+    Borra exportaciones temporales viejas (de sesiones que no descargaron).
+    """
+    limite = time.time() - max_edad_s
+    for path in glob.glob(os.path.join(tempfile.gettempdir(), EXPORT_PREFIJO + "*")):
+        try:
+            if os.path.getmtime(path) < limite:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def _exportar(formato: str, bloques, cols, hoja: str) -> tuple:
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato no soportado: {formato}")
+    mime, ext = FORMATOS[formato]
+
+    limpiar_exportaciones()
+    fd, path = tempfile.mkstemp(prefix=EXPORT_PREFIJO, suffix=ext)
+    os.close(fd)
+
+    try:
+        if formato == "csv":
+            n = _escribir_csv(path, bloques, cols)
+        else:
+            n = _escribir_xlsx(path, bloques, cols, hoja)
+    except Exception:
+        os.remove(path)
+        raise
+    finally:
+        # Devuelve la conexión al pool aunque la escritura falle a mitad
+        bloques.close()
+    return path, mime, n
+
+
+def exportar_pagos(formato: str = "csv", casa: str = None, propietario: str = "", desde=None, hasta=None) -> tuple:
+    """
+    Escribe el filtro actual a un archivo temporal.
+    Devuelve (path, mime, filas). El llamador borra el archivo al terminar.
+    """
+    return _exportar(formato, iterar_pagos(casa, propietario, desde, hasta), EXPORT_COLS, "pagos")
+
+
+def exportar_propietarios(formato: str = "csv") -> tuple:
+    """
+    Todos los propietarios a un archivo temporal, reimportable con
+    importar_propietarios. Devuelve (path, mime, filas).
+    """
+    return _exportar(formato, iterar_propietarios(), ARCHIVO_COLS, "propietarios")
@@ -0,0 +1,172 @@
+import hashlib
+import os
+import threading
+import time
+
+from db import conexion
+
+# Pillow es opcional: sin él no hay miniaturas y se muestra el original
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Fotos direccionadas por contenido: uploads/<aa>/<sha256><ext>.
+# Subir la misma imagen dos veces reutiliza el archivo; la miniatura se
+# genera una sola vez al subir. Lo que ya no referencia propietarios.foto_path
+# se borra (al reemplazar una foto o con recolectar_fotos()).
+
+FOTOS_DIR = "uploads"
+MINIATURAS_DIR = os.path.join(FOTOS_DIR, "miniaturas")
+MINI_ANCHO = 220
+EXTENSIONES = {".png", ".jpg", ".jpeg", ".webp"}
+
+# La recolección completa no toca archivos más nuevos que esto: pueden ser
+# de un guardado en curso cuyo propietario aún no se actualizó
+GRACIA_S = 600
+
+
+def _ruta_foto(digest: str, ext: str) -> str:
+    return os.path.join(FOTOS_DIR, digest[:2], f"{digest}{ext}")
+
+
+def _ruta_miniatura(path: str, ancho: int = MINI_ANCHO) -> str:
+    digest = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(MINIATURAS_DIR, f"{digest}_{ancho}.jpg")
+
+
+def _temporal(path: str) -> str:
+    # Por proceso y por hilo: dos sesiones pueden escribir el mismo archivo
+    return f"{path}.tmp{os.getpid()}_{threading.get_ident()}"
+
+
+def _escribir_atomico(path: str, datos: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = _temporal(path)
+    with open(tmp, "wb") as f:
+        f.write(datos)
+    os.replace(tmp, path)
+
+
+def _crear_miniatura(path: str, ancho: int = MINI_ANCHO):
+    if Image is None:
+        return
+    destino = _ruta_miniatura(path, ancho)
+    if os.path.exists(destino):
+        return
+    os.makedirs(MINIATURAS_DIR, exist_ok=True)
+    # Al lado y con os.replace: nadie ve una miniatura a medio escribir
+    tmp = _temporal(destino)
+    try:
+        with Image.open(path) as img:
+            img.thumbnail((ancho, ancho * 4))
+            img.convert("RGB").save(tmp, "JPEG", quality=85, optimize=True)
+        os.replace(tmp, destino)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def guardar_foto(datos: bytes, nombre: str) -> str:
+    """
+    Guarda la foto (si no existe ya) y su miniatura. Devuelve el path relativo.
+    """
+    datos = bytes(datos)
+    ext = os.path.splitext(nombre or "")[1].lower()
+    if ext not in EXTENSIONES:
+        ext = ".jpg"
+    path = _ruta_foto(hashlib.sha256(datos).hexdigest(), ext)
+
+    if not os.path.exists(path):
+        _escribir_atomico(path, datos)
+    else:
+        # Reutilizada: se renueva la fecha para que la recolección la respete
+        os.utime(path)
+    try:
+        _crear_miniatura(path)
+    except Exception:
+        # Imagen que Pillow no entiende: se queda sin miniatura
+        pass
+    return path
+
+
+def miniatura(path: str, ancho: int = MINI_ANCHO) -> str:
+    """
+    Path de la miniatura. Las fotos anteriores al almacén la generan la
+    primera vez que se muestran; sin Pillow se devuelve el original.
+    """
+    mini = _ruta_miniatura(path, ancho)
+    if not os.path.exists(mini) and os.path.exists(path):
+        try:
+            _crear_miniatura(path, ancho)
+        except Exception:
+            pass
+    return mini if os.path.exists(mini) else path
+
+
+def _referenciadas() -> set:
+    with conexion() as conn:
+        rows = conn.execute(
+            "SELECT DISTINCT foto_path FROM propietarios WHERE foto_path IS NOT NULL AND foto_path <> ''"
+        ).fetchall()
+    return {os.path.normpath(r[0]) for r in rows}
+
+
+def _borrar(path: str) -> int:
+    try:
+        tam = os.path.getsize(path)
+        os.remove(path)
+        return tam
+    except OSError:
+        return 0
+
+
+def liberar_foto(path: str) -> int:
+    """
+    Borra `path` y su miniatura si ninguna casa la referencia ya
+    (tras reemplazar una foto). Devuelve los bytes liberados. Como en
+    recolectar_fotos(), no toca archivos más nuevos que GRACIA_S: el mismo
+    contenido puede estar recién subido por otra sesión que aún no guardó.
+    """
+    if not path or not os.path.normpath(path).startswith(os.path.normpath(FOTOS_DIR) + os.sep):
+        return 0
+    try:
+        if os.path.getmtime(path) > time.time() - GRACIA_S:
+            return 0
+    except OSError:
+        return 0
+    if os.path.normpath(path) in _referenciadas():
+        return 0
+    return _borrar(path) + _borrar(_ruta_miniatura(path))
+
+
+def recolectar_fotos(gracia_s: int = GRACIA_S) -> dict:
+    """
+    Borra de FOTOS_DIR las fotos (también las antiguas con nombre por fecha)
+    y miniaturas que ninguna casa referencia. Devuelve archivos y bytes liberados.
+    """
+    if not os.path.isdir(FOTOS_DIR):
+        return {"archivos": 0, "bytes": 0}
+
+    refs = _referenciadas()
+    minis_vivas = {os.path.normpath(_ruta_miniatura(p)) for p in refs}
+    limite = time.time() - gracia_s
+    archivos = 0
+    liberados = 0
+
+    for raiz, _, nombres in os.walk(FOTOS_DIR):
+        en_miniaturas = os.path.normpath(raiz) == os.path.normpath(MINIATURAS_DIR)
+        for nombre in nombres:
+            path = os.path.normpath(os.path.join(raiz, nombre))
+            vivo = path in minis_vivas if en_miniaturas else path in refs
+            if vivo:
+                continue
+            try:
+                if os.path.getmtime(path) > limite:
+                    continue
+            except OSError:
+                continue
+            liberados += _borrar(path)
+            archivos += 1
+
+    return {"archivos": archivos, "bytes": liberados}
@@ -0,0 +1,137 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# Datos sintéticos con la forma de pagos_planos_2025.csv y de propietarios,
+# para N condominios × M casas × Y años.
+
+# Proporciones de la cuota observadas en los libros (C01: 8.02 / 12.79 / 65.07 sobre 279.57)
+PCT_PROVISION = 0.0287
+PCT_DECIMOS = 0.0457
+PCT_SUELDO = 0.2327
+
+NOMBRES = [
+    "Canelos", "Pérez", "Escorza", "Parra", "Nieding", "Toscano", "Martínez", "Alvarez",
+    "Gallegos", "Rodríguez", "Vega", "Granda", "Serrano", "Morán", "Obando", "Guerra",
+    "Apráez", "Arias", "Hidalgo", "Zambrano", "Cevallos", "Andrade", "Salazar", "Mora",
+]
+LETRAS = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+
+
+def codigo_casa(condominio: int, casa: int) -> str:
+    # Un solo condominio conserva el formato actual (C01..C10)
+    if condominio is None:
+        return f"C{casa:02d}"
+    return f"N{condominio:02d}-C{casa:03d}"
+
+
+def generar_casas(condominios: int, casas: int) -> list:
+    if condominios == 1 and casas <= 99:
+        return [codigo_casa(None, c) for c in range(1, casas + 1)]
+    return [codigo_casa(n, c) for n in range(1, condominios + 1) for c in range(1, casas + 1)]
+
+
+def generar_pagos(condominios: int, casas: int, anios: int, anio_inicio: int = 2025, semilla: int = 0) -> pd.DataFrame:
+    """
+    Un registro por casa y mes. ~85% de los meses se paga a tiempo, ~10% no
+    se paga y el resto paga con diferencia; saldo_pagar es el acumulado
+    (pagado - cuota) de cada casa.
+    """
+    rng = np.random.default_rng(semilla)
+    codigos = np.array(generar_casas(condominios, casas))
+    n_casas = len(codigos)
+    meses = pd.period_range(f"{anio_inicio}-01", periods=12 * anios, freq="M")
+    n_meses = len(meses)
+
+    nombres = rng.choice(NOMBRES, size=(n_casas, 2))
+    propietario_casa = np.char.add(np.char.add(nombres[:, 0], " - "), nombres[:, 1])
+    cuota_casa = rng.uniform(150, 350, n_casas).round(2)
+
+    casa = np.repeat(codigos, n_meses)
+    propietario = np.repeat(propietario_casa, n_meses)
+    cuota = np.repeat(cuota_casa, n_meses)
+    mes = np.tile(np.arange(n_meses), n_casas)
+
+    estado = rng.random(len(casa))
+    no_paga = estado < 0.10
+    parcial = (estado >= 0.10) & (estado < 0.15)
+    pagado = cuota.copy()
+    pagado[parcial] = (cuota[parcial] * rng.uniform(0.5, 2.5, parcial.sum())).round(2)
+    pagado[no_paga] = 0.0
+
+    inicio_mes = meses.to_timestamp().values[mes]
+    fecha = pd.Series(inicio_mes + pd.to_timedelta(rng.integers(0, 28, len(casa)), unit="D").values)
+    fecha_txt = fecha.dt.strftime("%m/%d/%Y").where(~no_paga, "")
+
+    diferencia = (pagado - cuota).reshape(n_casas, n_meses)
+    saldo = diferencia.cumsum(axis=1).reshape(-1).round(2)
+
+    proporcion = np.where(no_paga, 0.0, 1.0)
+    return pd.DataFrame({
+        # "YYYY-MM" mantiene única la clave (periodo, casa) entre años
+        "periodo": meses.strftime("%Y-%m").values[mes],
+        "casa": casa,
+        "propietario": propietario,
+        "monto_a_pagar": cuota,
+        "fecha_pago": fecha_txt.values,
+        "monto_pagado": pagado,
+        "provision": (cuota * PCT_PROVISION * proporcion).round(2),
+        "decimos": (cuota * PCT_DECIMOS * proporcion).round(2),
+        "sueldo": (cuota * PCT_SUELDO * proporcion).round(2),
+        "saldo_pagar": saldo,
+    })
+
+
+def _placas(rng, n: int) -> np.ndarray:
+    letras = rng.choice(LETRAS, size=(n, 3))
+    numeros = rng.integers(0, 10000, n)
+    return np.array([f"{''.join(l)}{d:04d}" for l, d in zip(letras, numeros)])
+
+
+def generar_propietarios(condominios: int, casas: int, semilla: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(semilla + 1)
+    codigos = generar_casas(condominios, casas)
+    n = len(codigos)
+    nombres = rng.choice(NOMBRES, size=(n, 2))
+    no_autos = rng.integers(0, 4, n)
+    placas = [_placas(rng, n) for _ in range(6)]
+    asistente = rng.random(n) < 0.3
+
+    df = pd.DataFrame({
+        "casa": codigos,
+        "nombre": [f"{a} {b}" for a, b in nombres],
+        "cedula": [f"{c:010d}" for c in rng.integers(10**9, 10**10 - 1, n)],
+        "telefono_fijo": [f"02{t:07d}" for t in rng.integers(0, 10**7, n)],
+        "celular": [f"09{t:08d}" for t in rng.integers(0, 10**8, n)],
+        "area": rng.uniform(80, 250, n).round(1),
+        "alicuota_pct": rng.uniform(0.5, 3.0, n).round(3),
+        "email": [f"{a.lower()}.{b.lower()}{i}@correo.ec" for i, (a, b) in enumerate(nombres)],
+        "tiene_arrendatario": (rng.random(n) < 0.2).astype(int),
+        "no_autos": no_autos,
+        "asistente_hogar": asistente.astype(int),
+        "asistente_nombre": np.where(asistente, rng.choice(NOMBRES, n), None),
+    })
+    for i in range(6):
+        df[f"placa{i + 1}"] = np.where(no_autos > i, placas[i], None)
+    return df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera pagos y propietarios sintéticos.")
+    parser.add_argument("--condominios", type=int, default=1)
+    parser.add_argument("--casas", type=int, default=10, help="casas por condominio")
+    parser.add_argument("--anios", type=int, default=1)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", default="pagos_sinteticos.csv")
+    parser.add_argument("--propietarios", default=None, help="CSV de propietarios (opcional)")
+    args = parser.parse_args()
+
+    pagos = generar_pagos(args.condominios, args.casas, args.anios, semilla=args.semilla)
+    pagos.to_csv(args.salida, index=False)
+    print(f"✅ {len(pagos):,} pagos sintéticos en {args.salida}")
+
+    if args.propietarios:
+        props = generar_propietarios(args.condominios, args.casas, semilla=args.semilla)
+        props.to_csv(args.propietarios, index=False)
+        print(f"✅ {len(props):,} propietarios sintéticos en {args.propietarios}")
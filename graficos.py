@@ -0,0 +1,163 @@
+import altair as alt
+import pandas as pd
+
+from agregados import SERIE_NEG, SERIE_PAGADO, SERIE_POS, SERIES, chart_df
+from db import cacheado, conexion, construir_filtro_pagos
+from resumen import resumen_aplicable
+
+# Datos y specs de los gráficos del Dashboard. Lo que llega al navegador
+# ya viene agregado en el servidor y acotado: a lo sumo MAX_CASAS barras
+# por serie y MAX_PUNTOS_SERIE puntos por serie en la tendencia, así el
+# tamaño del spec (y el render) no depende de cuántas filas tiene pagos.
+# Los specs (dict Vega-Lite) se cachean por filtro y generación de pagos:
+# un rerun con los mismos filtros no vuelve a construir ni serializar.
+
+MAX_CASAS = 60
+MAX_PUNTOS_SERIE = 240
+
+SERIE_A_PAGAR = "A pagar (Σ)"
+COLORES_CASAS = alt.Scale(
+    domain=[SERIE_PAGADO, SERIE_NEG, SERIE_POS],
+    range=["#2e7d32", "#ef6c00", "#6a1b9a"]  # verde / anaranjado / morado
+)
+COLORES_TENDENCIA = alt.Scale(domain=[SERIE_PAGADO, SERIE_A_PAGAR], range=["#2e7d32", "#1565c0"])
+
+# Agrupaciones de la tendencia, de la más fina a la más gruesa
+_FRECUENCIAS = [("M", "%b %Y"), ("Q", "%b %Y"), ("Y", "%Y")]
+
+
+def _clave_filtro(f: dict) -> tuple:
+    return (f["casa"], (f["propietario"] or "").strip(), str(f["desde"]), str(f["hasta"]))
+
+
+# ------------------ Barras por casa ------------------
+def capar_casas(agg: pd.DataFrame, max_casas: int = MAX_CASAS) -> pd.DataFrame:
+    """
+    Deja las max_casas casas con más movimiento (pagado + |saldos|) y suma
+    el resto en una barra "Otras (n)".
+    """
+    if len(agg) <= max_casas:
+        return agg
+    peso = agg["pagado_sum"].abs() + agg["saldo_ultimo_neg"].abs() + agg["saldo_ultimo_pos"]
+    orden = peso.sort_values(ascending=False, kind="stable").index
+    top = agg.loc[orden[:max_casas]].sort_values("casa")
+    resto = agg.loc[orden[max_casas:], list(SERIES)].sum()
+    otras = pd.DataFrame([{"casa": f"Otras ({len(orden) - max_casas})", **resto.to_dict()}])
+    return pd.concat([top, otras], ignore_index=True)
+
+
+def _spec_barras(agg: pd.DataFrame) -> dict:
+    capado = capar_casas(agg[["casa"] + list(SERIES)].sort_values("casa"))
+    datos = chart_df(capado)
+    bars = (
+        alt.Chart(datos)
+        .mark_bar()
+        .encode(
+            # Orden de las casas; "Otras (n)" al final
+            x=alt.X("casa:N", title="Casa", sort=capado["casa"].tolist()),
+            y=alt.Y("valor:Q", title="Monto (Σ) | Negativos hacia abajo", axis=alt.Axis(format=",.2f")),
+            color=alt.Color("categoria:N", scale=COLORES_CASAS, legend=alt.Legend(title="Serie")),
+            tooltip=[
+                alt.Tooltip("casa:N", title="Casa"),
+                alt.Tooltip("categoria:N", title="Serie"),
+                alt.Tooltip("valor:Q", title="Valor", format=",.2f"),
+            ],
+        )
+        .properties(height=420)
+    )
+    zero_line = alt.Chart(pd.DataFrame({"y": [0]})).mark_rule().encode(y="y:Q")
+    return (bars + zero_line).to_dict()
+
+
+def spec_barras_casas(f: dict, agg: pd.DataFrame) -> dict:
+    """
+    Spec Vega-Lite de las barras por casa (agg de agregados), cacheado
+    por filtro.
+    """
+    with conexion() as conn:
+        return cacheado(conn, ("grafico", "casas", _clave_filtro(f)), lambda c: _spec_barras(agg))
+
+
+# ------------------ Tendencia mensual ------------------
+def _mensual(conn, f: dict) -> pd.DataFrame:
+    """
+    mes, pagado, a_pagar (centavos) agregados en SQL: del resumen casa × mes
+    si el filtro lo permite, si no con GROUP BY sobre pagos.
+    """
+    if resumen_aplicable(f["propietario"], f["desde"], f["hasta"], f["min_fecha"], f["max_fecha"]):
+        conds = ["mes BETWEEN ? AND ?"]
+        params = [pd.Timestamp(f["desde"]).strftime("%Y-%m"), pd.Timestamp(f["hasta"]).strftime("%Y-%m")]
+        if f["casa"] and f["casa"] != "Todas":
+            conds.append("casa = ?")
+            params.append(f["casa"])
+        sql = f"""
+            SELECT mes, SUM(total_pagado) AS pagado, SUM(monto_a_pagar) AS a_pagar
+            FROM resumen_casa_mes WHERE {' AND '.join(conds)}
+            GROUP BY mes ORDER BY mes
+        """
+    else:
+        where, params = construir_filtro_pagos(f["casa"], f["propietario"], f["desde"], f["hasta"])
+        where = f"{where} AND fecha_pago IS NOT NULL" if where else "WHERE fecha_pago IS NOT NULL"
+        sql = f"""
+            SELECT substr(fecha_pago, 1, 7) AS mes,
+                   SUM(monto_pagado) AS pagado, SUM(monto_a_pagar) AS a_pagar
+            FROM pagos {where}
+            GROUP BY mes ORDER BY mes
+        """
+    try:
+        df = pd.read_sql_query(sql, conn, params=params)
+    except Exception:
+        return pd.DataFrame(columns=["mes", "pagado", "a_pagar"])
+    df[["pagado", "a_pagar"]] = df[["pagado", "a_pagar"]].fillna(0).astype("int64")
+    return df
+
+
+def capar_serie(mensual: pd.DataFrame, max_puntos: int = MAX_PUNTOS_SERIE) -> tuple:
+    """
+    Si hay más meses que max_puntos, agrupa por trimestre o por año.
+    Devuelve (frame con fecha, pagado, a_pagar; formato de la etiqueta).
+    """
+    df = mensual.assign(fecha=pd.to_datetime(mensual["mes"] + "-01"))
+    for frecuencia, formato in _FRECUENCIAS:
+        grupos = df["fecha"].dt.to_period(frecuencia)
+        if grupos.nunique() <= max_puntos or frecuencia == _FRECUENCIAS[-1][0]:
+            break
+    out = df.groupby(grupos)[["pagado", "a_pagar"]].sum()
+    out.index = out.index.to_timestamp()
+    return out.rename_axis("fecha").reset_index(), formato
+
+
+def _spec_tendencia(mensual: pd.DataFrame) -> dict:
+    serie, formato = capar_serie(mensual)
+    largo = serie.melt(id_vars="fecha", value_vars=["pagado", "a_pagar"], var_name="serie", value_name="valor")
+    largo["serie"] = largo["serie"].map({"pagado": SERIE_PAGADO, "a_pagar": SERIE_A_PAGAR})
+    largo["valor"] = largo["valor"] / 100
+    return (
+        alt.Chart(largo)
+        .mark_line(point=True)
+        .encode(
+            x=alt.X("fecha:T", title="Período", axis=alt.Axis(format=formato)),
+            y=alt.Y("valor:Q", title="Monto (Σ)", axis=alt.Axis(format=",.2f")),
+            color=alt.Color("serie:N", scale=COLORES_TENDENCIA, legend=alt.Legend(title="Serie")),
+            tooltip=[
+                alt.Tooltip("fecha:T", title="Período", format=formato),
+                alt.Tooltip("serie:N", title="Serie"),
+                alt.Tooltip("valor:Q", title="Valor", format=",.2f"),
+            ],
+        )
+        .properties(height=320)
+        .to_dict()
+    )
+
+
+def spec_tendencia(f: dict):
+    """
+    Spec Vega-Lite de pagado vs a pagar por mes para el filtro, cacheado;
+    None si no hay meses con datos.
+    """
+    def _leer(conn):
+        mensual = _mensual(conn, f)
+        return None if mensual.empty else _spec_tendencia(mensual)
+
+    with conexion() as conn:
+        return cacheado(conn, ("grafico", "tendencia", _clave_filtro(f)), _leer)
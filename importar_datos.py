@@ -1,48 +1,103 @@
+import argparse
+import hashlib
 import sqlite3
+import numpy as np
 import pandas as pd
 import os
 
-DB_PATH = "condominio.db"
+import db
+from db import MONTOS_PAGOS, conexion, incrementar_generacion, invalidar_columnas
+from migraciones import PAGOS_DDL, crear_busqueda_pagos, crear_indices_pagos, migrar
+import cartera
+from resumen import actualizar_resumen, crear_pendientes
+from unidades import registrar_desde
+
 CSV_PATH = "pagos_planos_2025.csv"
 
+# Filas por bloque al leer el CSV (acota la memoria pico)
+CHUNK_SIZE = 50_000
+
+# Columnas que vienen del CSV (y que entran al hash de contenido)
+PAGOS_COLS = [
+    "periodo", "casa", "propietario",
+    "monto_a_pagar", "fecha_pago", "monto_pagado",
+    "provision", "decimos", "sueldo", "saldo_pagar"
+]
+
+# Clave natural: una fila por casa y periodo. El periodo lleva año
+# (YYYY-MM, ver periodo_con_anio): con "1".."12" el archivo del año
+# siguiente pisaría las filas de éste
+CLAVE_PAGOS = ["periodo", "casa"]
+
 
 def recreate_pagos_table(conn: sqlite3.Connection):
+    """
+    Borra y recrea pagos. No hace commit: el llamador decide la transacción,
+    así los lectores (WAL) siguen viendo la tabla anterior hasta el final.
+    """
     cur = conn.cursor()
 
     # Borra solo la tabla pagos (no toca usuarios)
     cur.execute("DROP TABLE IF EXISTS pagos")
 
     # Crea tabla con esquema final
-    cur.execute("""
-        CREATE TABLE pagos (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            periodo TEXT,
-            casa TEXT NOT NULL,
-            propietario TEXT NOT NULL,
-            monto_a_pagar REAL,
-            fecha_pago TEXT,
-            monto_pagado REAL,
-            provision REAL,
-            decimos REAL,
-            sueldo REAL,
-            saldo_pagar REAL
+    cur.execute(PAGOS_DDL.format(if_not_exists=""))
+    crear_indices_pagos(conn)
+    crear_busqueda_pagos(conn)
+    invalidar_columnas("pagos")
+
+
+def ensure_pagos_table(conn: sqlite3.Connection):
+    """
+    Verifica el índice único por (periodo, casa) que necesita el upsert.
+    Falta si la tabla venía con duplicados de una versión anterior
+    (migraciones.py no lo pudo crear).
+    """
+    try:
+        crear_indices_pagos(conn)
+    except sqlite3.IntegrityError:
+        raise ValueError(
+            "La tabla pagos tiene filas duplicadas por (periodo, casa); "
+            "ejecuta una carga completa (--completo) para rehacerla."
         )
-    """)
 
-    # Índices útiles
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_pagos_casa_fecha ON pagos(casa, fecha_pago)")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_pagos_periodo ON pagos(periodo)")
 
-    conn.commit()
+def periodo_con_anio(df: pd.DataFrame) -> pd.Series:
+    """
+    periodo "1".."12" (CSV plano anual) -> "YYYY-MM" con el criterio de la
+    cartera (cartera.MES_PERIODO): el año de fecha_pago, corrido al que deja
+    el mes más cerca del pago; sin fecha, el del último pago de la casa en
+    el bloque, o del bloque. Los demás periodos quedan igual.
+    ValueError si un periodo de sólo mes no se puede fechar.
+    """
+    periodo = df["periodo"]
+    mes = pd.to_numeric(periodo.where(periodo.str.fullmatch(r"\d{1,2}", na=False)), errors="coerce")
+    solo_mes = mes.between(1, 12)
+    if not solo_mes.any():
+        return periodo
+
+    fecha = pd.to_datetime(df["fecha_pago"], errors="coerce")
+    corrimiento = np.select([mes - fecha.dt.month > 6, fecha.dt.month - mes > 6], [-1, 1], 0)
+    anio = fecha.dt.year + corrimiento
+    if anio[solo_mes].isna().any():
+        ultimo_de_casa = df["casa"].map(fecha.groupby(df["casa"]).max().dt.year)
+        anio = anio.fillna(ultimo_de_casa).fillna(fecha.max().year if fecha.notna().any() else np.nan)
+    faltan = solo_mes & anio.isna()
+    if faltan.any():
+        raise ValueError(
+            f"{int(faltan.sum())} filas con periodo de sólo mes y sin ninguna fecha_pago: no se puede saber el año"
+        )
+
+    con_anio = (
+        anio[solo_mes].astype("int64").astype(str) + "-"
+        + mes[solo_mes].astype("int64").astype(str).str.zfill(2)
+    )
+    return periodo.where(~solo_mes, con_anio)
 
 
 def normalize_df(df: pd.DataFrame) -> pd.DataFrame:
     # Verificación de columnas mínimas
-    required = [
-        "periodo", "casa", "propietario",
-        "monto_a_pagar", "fecha_pago", "monto_pagado",
-        "provision", "decimos", "sueldo", "saldo_pagar"
-    ]
+    required = PAGOS_COLS
     missing = [c for c in required if c not in df.columns]
     if missing:
         raise ValueError(f"Faltan columnas en el CSV: {missing}")
@@ -55,35 +110,191 @@ def normalize_df(df: pd.DataFrame) -> pd.DataFrame:
     # Fecha a formato ISO (si viene vacía queda None)
     df["fecha_pago"] = pd.to_datetime(df["fecha_pago"], errors="coerce").dt.strftime("%Y-%m-%d")
     df["fecha_pago"] = df["fecha_pago"].where(df["fecha_pago"].notna(), None)
+    df["periodo"] = periodo_con_anio(df)
 
-    # Numéricos
-    num_cols = ["monto_a_pagar", "monto_pagado", "provision", "decimos", "sueldo", "saldo_pagar"]
-    for c in num_cols:
-        df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0.0).round(2)
+    # Montos en centavos enteros: el CSV trae dólares con 2 decimales
+    for c in MONTOS_PAGOS:
+        df[c] = (pd.to_numeric(df[c], errors="coerce").fillna(0.0) * 100).round().astype("int64")
 
     return df
 
 
-def importar_desde_csv():
-    if not os.path.exists(CSV_PATH):
-        raise FileNotFoundError(f"No se encontró el archivo CSV: {CSV_PATH}")
+def hash_filas(df: pd.DataFrame) -> pd.Series:
+    """
+    Hash de contenido por fila (sobre PAGOS_COLS ya normalizadas).
+    Permite saber si una fila existente cambió sin comparar columna a columna.
+    """
+    def _texto(c):
+        # Nulos como "" (astype(str) los trata distinto según la versión de pandas)
+        return df[c].astype(object).where(df[c].notna(), "").astype(str)
+
+    texto = _texto(PAGOS_COLS[0])
+    for c in PAGOS_COLS[1:]:
+        texto = texto + "|" + _texto(c)
+    return pd.Series(
+        [hashlib.sha1(t.encode("utf-8")).hexdigest() for t in texto],
+        index=df.index
+    )
+
+
+def _filas(df: pd.DataFrame, cols: list):
+    return df[cols].astype(object).where(df[cols].notna(), None).itertuples(index=False, name=None)
+
+
+def _crear_stage(conn: sqlite3.Connection):
+    cols = ",".join(PAGOS_COLS + ["fila_hash"])
+    conn.execute("DROP TABLE IF EXISTS temp._stage_pagos")
+    conn.execute(f"CREATE TEMP TABLE _stage_pagos AS SELECT {cols} FROM pagos WHERE 0")
+
+
+def _upsert_incremental(conn: sqlite3.Connection, df: pd.DataFrame) -> dict:
+    """
+    Inserta filas nuevas y actualiza sólo las que cambiaron de hash.
+    Las filas idénticas no generan escrituras. Requiere _crear_stage().
+    """
+    cols = PAGOS_COLS + ["fila_hash"]
+    col_list = ",".join(cols)
+
+    conn.execute("DELETE FROM _stage_pagos")
+    conn.executemany(
+        f"INSERT INTO _stage_pagos ({col_list}) VALUES ({','.join(['?'] * len(cols))})",
+        _filas(df, cols)
+    )
+
+    nuevas = conn.execute("""
+        SELECT COUNT(*) FROM _stage_pagos s
+        WHERE NOT EXISTS (
+            SELECT 1 FROM pagos p WHERE p.periodo = s.periodo AND p.casa = s.casa
+        )
+    """).fetchone()[0]
+
+    _marcar_resumen(conn)
+    cartera.marcar_desde_stage(conn)
+
+    update_set = ",".join([f"{c}=excluded.{c}" for c in cols if c not in CLAVE_PAGOS])
+    # "WHERE true" evita la ambigüedad de INSERT ... SELECT ... ON CONFLICT.
+    # rowcount no cuenta lo que escriben los triggers (pagos_nombres)
+    escritas = conn.execute(f"""
+        INSERT INTO pagos ({col_list})
+        SELECT {col_list} FROM _stage_pagos WHERE true
+        ON CONFLICT(periodo, casa) DO UPDATE SET
+        {update_set}
+        WHERE pagos.fila_hash IS NOT excluded.fila_hash
+    """).rowcount
+
+    actualizadas = escritas - nuevas
+    return {
+        "insertadas": nuevas,
+        "actualizadas": actualizadas,
+        "sin_cambios": len(df) - nuevas - actualizadas,
+    }
+
+
+def _marcar_resumen(conn: sqlite3.Connection):
+    """
+    Marca los (casa, mes) que cambian con este bloque: el mes nuevo de cada
+    fila nueva o modificada y, si cambió de fecha, también el mes anterior.
+    """
+    conn.execute("""
+        INSERT OR IGNORE INTO _resumen_pendiente (casa, mes)
+        SELECT s.casa, substr(s.fecha_pago, 1, 7)
+        FROM _stage_pagos s
+        LEFT JOIN pagos p ON p.periodo = s.periodo AND p.casa = s.casa
+        WHERE s.fecha_pago IS NOT NULL AND p.fila_hash IS NOT s.fila_hash
+        UNION
+        SELECT p.casa, substr(p.fecha_pago, 1, 7)
+        FROM _stage_pagos s
+        JOIN pagos p ON p.periodo = s.periodo AND p.casa = s.casa
+        WHERE p.fecha_pago IS NOT NULL AND p.fila_hash IS NOT s.fila_hash
+    """)
+
+
+def _progreso_consola(filas: int, fraccion: float):
+    print(f"  … {filas:,} filas procesadas ({fraccion:.0%})", flush=True)
+
+
+def importar_desde_csv(
+    completo: bool = False,
+    chunksize: int = CHUNK_SIZE,
+    progreso=_progreso_consola,
+    csv_path: str = CSV_PATH,
+) -> dict:
+    """
+    Importa csv_path a pagos en una sola transacción, leyendo por bloques
+    de `chunksize` filas (memoria acotada sin importar el tamaño del CSV).
+    - incremental (default): upsert por (periodo, casa) con hash de contenido
+    - completo: borra y recarga toda la tabla
+    `progreso(filas, fraccion)` se llama tras cada bloque (None = silencioso).
+    Devuelve conteos insertadas / actualizadas / sin_cambios.
+    """
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"No se encontró el archivo CSV: {csv_path}")
+
+    migrar()
+    total_bytes = os.path.getsize(csv_path) or 1
+    conteos = {"insertadas": 0, "actualizadas": 0, "sin_cambios": 0}
+    filas = 0
+
+    with conexion() as conn, open(csv_path, "r", encoding="utf-8") as f:
+        conn.execute("BEGIN IMMEDIATE")
+
+        if completo:
+            # Rehacer tabla pagos
+            recreate_pagos_table(conn)
+        else:
+            ensure_pagos_table(conn)
+        _crear_stage(conn)
+        crear_pendientes(conn)
+        cartera.crear_pendientes(conn)
+
+        # Texto como str en todos los bloques: evita que "periodo" cambie
+        # de tipo (int/float) según los valores de cada bloque
+        lector = pd.read_csv(f, chunksize=chunksize, dtype={"periodo": str, "casa": str, "propietario": str})
+        for chunk in lector:
+            chunk = normalize_df(chunk)
+            # Si el bloque repite (periodo, casa), gana la última fila;
+            # entre bloques, el upsert hace lo mismo
+            chunk = chunk.drop_duplicates(subset=CLAVE_PAGOS, keep="last")
+            chunk["fila_hash"] = hash_filas(chunk)
+
+            parcial = _upsert_incremental(conn, chunk)
+            # Casas nuevas entran al catálogo de unidades
+            registrar_desde(conn, "_stage_pagos")
+            for k in conteos:
+                conteos[k] += parcial[k]
 
-    df = pd.read_csv(CSV_PATH, encoding="utf-8")
-    df = normalize_df(df)
+            filas += len(chunk)
+            if progreso:
+                progreso(filas, min(f.tell() / total_bytes, 1.0))
 
-    conn = sqlite3.connect(DB_PATH)
+        conn.execute("DROP TABLE temp._stage_pagos")
 
-    # Rehacer tabla pagos
-    recreate_pagos_table(conn)
+        # Resumen casa × mes: sólo lo tocado (o todo si se rehízo pagos)
+        actualizar_resumen(conn, completo=completo)
+        # Cartera: cada casa tocada desde su primer mes cambiado
+        cartera.actualizar_cartera(conn, completo=completo)
 
-    # Insert masivo con to_sql (rápido y confiable)
-    df.to_sql("pagos", conn, if_exists="append", index=False)
+        # Avisa a la app (caché de pagos) que la tabla cambió
+        if completo or conteos["insertadas"] or conteos["actualizadas"]:
+            incrementar_generacion(conn, "pagos")
 
-    conn.commit()
-    conn.close()
+    # Snapshot Parquet para lecturas en frío (fuera de la transacción:
+    # hasta que se reescribe, la app usa SQL porque la versión no coincide)
+    db.actualizar_snapshot_pagos()
 
-    print(f"✅ Importación OK: {len(df)} filas cargadas desde {CSV_PATH} a {DB_PATH}")
+    modo = "completa" if completo else "incremental"
+    print(
+        f"✅ Importación {modo} OK desde {csv_path} a {db.DB_PATH}: "
+        f"{conteos['insertadas']} insertadas, {conteos['actualizadas']} actualizadas, "
+        f"{conteos['sin_cambios']} sin cambios"
+    )
+    return conteos
 
 
 if __name__ == "__main__":
-    importar_desde_csv()
+    parser = argparse.ArgumentParser(description="Importa pagos desde CSV a SQLite.")
+    parser.add_argument("--completo", action="store_true", help="borra y recarga toda la tabla pagos")
+    parser.add_argument("--csv", default=CSV_PATH, help="archivo CSV de pagos")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE, help="filas por bloque de lectura")
+    args = parser.parse_args()
+    importar_desde_csv(completo=args.completo, chunksize=args.chunksize, csv_path=args.csv)
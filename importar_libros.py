@@ -0,0 +1,294 @@
+import argparse
+import csv
+import glob
+import hashlib
+import os
+import re
+import sqlite3
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import db
+from db import conexion, incrementar_generacion
+from migraciones import migrar
+
+# Libros mensuales: MMYYYY.csv (012025.csv … 122025.csv)
+LIBROS_GLOB = "[01][0-9][12][0-9][0-9][0-9].csv"
+ARCHIVO_RE = re.compile(r"(\d{2})(\d{4})\.csv$", re.IGNORECASE)
+
+# Columnas del libro (posición en la fila del CSV)
+COL_SECCION = 0
+COL_DESCRIPCION = 1
+COL_OFICIAL = 2      # G_OFICIAL: presupuesto / cuota
+COL_FECHA = 3
+COL_ENTRA = 4
+COL_SALE = 5
+COL_SALDO_GNRL = 6
+COL_PROVISION = 7
+COL_DECIMOS = 8
+COL_SUELDO = 9
+COL_FALTANTE = 10
+COL_SALDO_CASA = 11  # columna sin título: saldo acumulado por casa
+
+NOMBRES_COLUMNA = {
+    COL_ENTRA: "entra", COL_SALE: "sale", COL_SALDO_GNRL: "saldo_gnrl",
+    COL_PROVISION: "provision", COL_DECIMOS: "decimos", COL_SUELDO: "sueldo",
+    COL_FALTANTE: "faltante", COL_SALDO_CASA: "saldo",
+}
+
+SECCIONES = {"SALDOS", "GASTOS FIJOS", "GASTO EVENTUAL", "INGRESOS"}
+CIERRES = ("SUBTOTAL MES", "TOTAL ACUMULADO", "SALDO PARA", "SALDO CONJUNTO", "SALDO EN CUENTA")
+
+MESES_ES = {
+    "enero": "Jan", "febrero": "Feb", "marzo": "Mar", "abril": "Apr", "mayo": "May", "junio": "Jun",
+    "julio": "Jul", "agosto": "Aug", "septiembre": "Sep", "setiembre": "Sep", "octubre": "Oct",
+    "noviembre": "Nov", "diciembre": "Dec",
+}
+FORMATOS_FECHA = ["%d-%b-%Y", "%d/%b/%Y", "%m/%d/%y", "%m/%d/%Y", "%d/%m/%y", "%d/%m/%Y"]
+
+# Fila de ingreso por casa: "C01 Canelos - Pérez" (a veces sin la C: "07 Serrano - Morán")
+CASA_RE = re.compile(r"^C?(\d{2})\s+(.+)$", re.IGNORECASE)
+
+
+# ------------------ Parseo de celdas ------------------
+def _decodificar(linea: bytes) -> str:
+    """
+    Los libros mezclan UTF-8 con bytes de Excel/DOS por línea.
+    Los acentos de cp850 (é=0x82, ó=0xA2…) caen en 0x80-0xA5; los de
+    cp1252 (é=0xE9, ó=0xF3…) en 0xC0-0xFF.
+    """
+    try:
+        return linea.decode("utf-8")
+    except UnicodeDecodeError:
+        pass
+    if re.search(rb"[\x80-\xa5]", linea):
+        return linea.decode("cp850", errors="replace")
+    return linea.decode("cp1252", errors="replace")
+
+
+def _sin_acentos(texto: str) -> str:
+    return "".join(
+        c for c in unicodedata.normalize("NFKD", texto) if not unicodedata.combining(c)
+    ).lower()
+
+
+def parse_moneda(texto: str):
+    """
+    Centavos enteros, como pagos:
+    " $(1,254.83)" -> -125483 ; " $-   " -> 0 ; "" -> None
+    """
+    t = (texto or "").strip().replace("$", "").replace(",", "").replace(" ", "")
+    if not t:
+        return None
+    if t == "-":
+        return 0
+    negativo = t.startswith("(") and t.endswith(")")
+    t = t.strip("()")
+    try:
+        valor = round(float(t) * 100)
+    except (ValueError, OverflowError):
+        return None
+    return -valor if negativo else valor
+
+
+def parse_fecha(texto: str):
+    """
+    Fechas mezcladas del libro ("19-Jan-2024", "01/16/25", "31/marzo/2023"…)
+    a ISO YYYY-MM-DD, o None.
+    """
+    t = (texto or "").strip()
+    if not t or t == "0":
+        return None
+    for es, en in MESES_ES.items():
+        t = re.sub(es, en, t, flags=re.IGNORECASE)
+    for fmt in FORMATOS_FECHA:
+        try:
+            return datetime.strptime(t, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return None
+
+
+def _celda(fila: list, i: int) -> str:
+    return fila[i].strip() if i < len(fila) else ""
+
+
+# ------------------ Parseo de un libro ------------------
+def periodo_de_archivo(path: str) -> str:
+    m = ARCHIVO_RE.search(os.path.basename(path))
+    if not m:
+        raise ValueError(f"Nombre de libro no reconocido (se espera MMYYYY.csv): {path}")
+    return f"{m.group(2)}-{m.group(1)}"
+
+
+def parsear_libro(path: str) -> dict:
+    """
+    Convierte un libro mensual en filas normalizadas:
+    - gastos:   (seccion, descripcion, oficial, fecha, sale, saldo_gnrl)
+    - ingresos: (casa, propietario, cuota, fecha_pago, monto_pagado, saldo_gnrl,
+                 provision, decimos, sueldo, faltante, saldo)
+    - saldos:   (seccion, concepto, columna, valor)  arrastres y cierres del mes
+    Función pura (sin BD) para poder correr en un proceso aparte.
+    """
+    periodo = periodo_de_archivo(path)
+    with open(path, "rb") as f:
+        lineas = [_decodificar(l).rstrip("\r\n") for l in f]
+
+    gastos, ingresos, saldos = [], [], []
+    por_casa = {}
+    seccion = None
+
+    for fila in csv.reader(lineas):
+        cab = _celda(fila, COL_SECCION).upper()
+        desc = _celda(fila, COL_DESCRIPCION)
+
+        if cab in SECCIONES:
+            seccion = cab
+        if desc.upper().startswith(CIERRES):
+            seccion = "CIERRE"
+
+        if seccion is None or not desc:
+            continue
+
+        if seccion in ("SALDOS", "CIERRE"):
+            columnas = dict(NOMBRES_COLUMNA)
+            # "Cartera Vencida" viene como etiqueta + valor a la derecha
+            if _celda(fila, COL_PROVISION).lower() == "cartera vencida":
+                valor = parse_moneda(_celda(fila, COL_SUELDO))
+                if valor is not None:
+                    saldos.append((seccion, "Cartera Vencida", "valor", valor))
+                for i in (COL_PROVISION, COL_DECIMOS, COL_SUELDO):
+                    columnas.pop(i)
+            for i, nombre in columnas.items():
+                valor = parse_moneda(_celda(fila, i))
+                if valor is not None:
+                    saldos.append((seccion, desc, nombre, valor))
+
+        elif seccion in ("GASTOS FIJOS", "GASTO EVENTUAL"):
+            gastos.append((
+                seccion, desc,
+                parse_moneda(_celda(fila, COL_OFICIAL)),
+                parse_fecha(_celda(fila, COL_FECHA)),
+                parse_moneda(_celda(fila, COL_SALE)) or 0,
+                parse_moneda(_celda(fila, COL_SALDO_GNRL)),
+            ))
+
+        elif seccion == "INGRESOS":
+            m = CASA_RE.match(desc)
+            if not m:
+                # Totales del bloque ("Provisión", "Décimos", "Sueldo")
+                continue
+            casa = f"C{m.group(1)}"
+            resto = _sin_acentos(m.group(2))
+
+            if resto.startswith("provision"):
+                por_casa.setdefault(casa, {})["provision"] = parse_moneda(_celda(fila, COL_PROVISION)) or 0
+            elif resto.startswith("decimos"):
+                por_casa.setdefault(casa, {})["decimos"] = parse_moneda(_celda(fila, COL_DECIMOS)) or 0
+            elif resto.startswith("sueldo"):
+                por_casa.setdefault(casa, {})["sueldo"] = parse_moneda(_celda(fila, COL_SUELDO)) or 0
+            else:
+                por_casa.setdefault(casa, {}).update({
+                    "propietario": m.group(2).strip(),
+                    "cuota": parse_moneda(_celda(fila, COL_OFICIAL)),
+                    "fecha_pago": parse_fecha(_celda(fila, COL_FECHA)),
+                    "monto_pagado": parse_moneda(_celda(fila, COL_ENTRA)) or 0,
+                    "saldo_gnrl": parse_moneda(_celda(fila, COL_SALDO_GNRL)),
+                    "faltante": parse_moneda(_celda(fila, COL_FALTANTE)),
+                    "saldo": parse_moneda(_celda(fila, COL_SALDO_CASA)),
+                })
+
+    for casa, d in sorted(por_casa.items()):
+        if "propietario" not in d:
+            continue
+        ingresos.append((
+            casa, d["propietario"], d["cuota"], d["fecha_pago"], d["monto_pagado"], d["saldo_gnrl"],
+            d.get("provision", 0), d.get("decimos", 0), d.get("sueldo", 0),
+            d["faltante"], d["saldo"],
+        ))
+
+    return {"periodo": periodo, "gastos": gastos, "ingresos": ingresos, "saldos": saldos}
+
+
+# ------------------ Carga a SQLite ------------------
+# Las tablas libros_* las crea migraciones.py (montos en centavos)
+def sha256_archivo(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for bloque in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def _guardar_libro(conn: sqlite3.Connection, archivo: str, condominio: str, sha: str, libro: dict):
+    periodo = libro["periodo"]
+    for tabla in ("libro_gastos", "libro_ingresos", "libro_saldos"):
+        conn.execute(f"DELETE FROM {tabla} WHERE archivo=?", (archivo,))
+
+    base = (archivo, condominio, periodo)
+    conn.executemany(
+        "INSERT INTO libro_gastos VALUES (?,?,?,?,?,?,?,?,?)",
+        [base + g for g in libro["gastos"]]
+    )
+    conn.executemany(
+        "INSERT INTO libro_ingresos VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)",
+        [base + i for i in libro["ingresos"]]
+    )
+    conn.executemany(
+        "INSERT INTO libro_saldos VALUES (?,?,?,?,?,?,?)",
+        [base + s for s in libro["saldos"]]
+    )
+    conn.execute("""
+        INSERT INTO libros_archivos (archivo, condominio, periodo, sha256, procesado_en)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(archivo) DO UPDATE SET
+        condominio=excluded.condominio, periodo=excluded.periodo,
+        sha256=excluded.sha256, procesado_en=excluded.procesado_en
+    """, (archivo, condominio, periodo, sha, datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+
+
+def importar_libros(paths: list = None, condominio: str = "", workers: int = None, forzar: bool = False) -> dict:
+    """
+    Parsea los libros mensuales en paralelo (un proceso por archivo) y los
+    carga a la BD. Los archivos cuyo sha256 no cambió se saltan.
+    """
+    if paths is None:
+        paths = sorted(glob.glob(LIBROS_GLOB))
+    paths = [os.path.normpath(p) for p in paths]
+
+    migrar()
+    with conexion() as conn:
+        conocidos = dict(conn.execute("SELECT archivo, sha256 FROM libros_archivos").fetchall())
+
+    hashes = {p: sha256_archivo(p) for p in paths}
+    pendientes = [p for p in paths if forzar or conocidos.get(p) != hashes[p]]
+
+    if pendientes:
+        # El parseo es CPU (regex + strptime): un proceso por archivo.
+        # La escritura queda en este proceso: SQLite admite un solo escritor.
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            libros = list(pool.map(parsear_libro, pendientes))
+
+        with conexion() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for path, libro in zip(pendientes, libros):
+                _guardar_libro(conn, path, condominio, hashes[path], libro)
+            incrementar_generacion(conn, "libros")
+
+    resultado = {"procesados": len(pendientes), "sin_cambios": len(paths) - len(pendientes)}
+    print(
+        f"✅ Libros OK en {db.DB_PATH}: {resultado['procesados']} procesados, "
+        f"{resultado['sin_cambios']} sin cambios"
+    )
+    return resultado
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Importa los libros mensuales (MMYYYY.csv) a SQLite.")
+    parser.add_argument("archivos", nargs="*", help=f"libros a importar (default: {LIBROS_GLOB})")
+    parser.add_argument("--condominio", default="", help="condominio al que pertenecen los libros")
+    parser.add_argument("--workers", type=int, default=None, help="procesos de parseo (default: CPUs)")
+    parser.add_argument("--forzar", action="store_true", help="reprocesa aunque el archivo no haya cambiado")
+    args = parser.parse_args()
+    importar_libros(args.archivos or None, condominio=args.condominio, workers=args.workers, forzar=args.forzar)
@@ -0,0 +1,302 @@
+import argparse
+import os
+import sqlite3
+import unicodedata
+from datetime import datetime
+
+import pandas as pd
+
+from db import conexion, escribir
+from migraciones import migrar
+from placas import MAX_PLACAS, PLATE_RE
+from unidades import agregar_unidades, registrar_desde
+
+# Carga masiva de propietarios desde CSV/XLSX (el mismo formato que
+# exportar.exportar_propietarios, así un archivo exportado se reimporta).
+# Se valida todo el archivo con operaciones de pandas sobre columnas;
+# las filas con error se reportan y se saltan, el resto se escribe con
+# executemany en una sola transacción (propietarios, unidades y placas).
+# Sólo se escriben las columnas presentes en el archivo; las filas
+# idénticas a la BD no se tocan.
+
+ARCHIVO_COLS = [
+    "casa", "condominio", "bloque",
+    "nombre", "cedula", "telefono_fijo", "celular", "email",
+    "area", "alicuota_pct",
+    "tiene_arrendatario", "no_autos",
+    "asistente_hogar", "asistente_nombre",
+    "placas",
+]
+
+# Encabezados alternativos (sin tildes, minúsculas) -> columna
+ALIAS = {
+    "mail": "email",
+    "correo": "email",
+    "telefono": "telefono_fijo",
+    "alicuota": "alicuota_pct",
+    "arrendatario": "tiene_arrendatario",
+    "autos": "no_autos",
+    "asistente": "asistente_hogar",
+}
+
+_TEXTO = ["nombre", "cedula", "telefono_fijo", "celular", "email", "asistente_nombre"]
+_SI = {"si", "s", "1", "x", "true", "verdadero"}
+_NO = {"no", "n", "0", "false", "falso", ""}
+_EMAIL = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
+
+
+def _ahora() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _sin_acentos(texto: str) -> str:
+    return "".join(c for c in unicodedata.normalize("NFD", texto) if unicodedata.category(c) != "Mn")
+
+
+# ------------------ Lectura ------------------
+def leer_archivo(origen, nombre: str = None) -> pd.DataFrame:
+    """
+    CSV o XLSX (por extensión) como texto, con encabezados normalizados.
+    `origen` es una ruta o un archivo abierto (p. ej. st.file_uploader).
+    """
+    nombre = nombre or (origen if isinstance(origen, str) else getattr(origen, "name", ""))
+    if str(nombre).lower().endswith(".xlsx"):
+        try:
+            df = pd.read_excel(origen, dtype=str)
+        except ImportError:
+            raise RuntimeError("Importar Excel requiere openpyxl (pip install openpyxl).")
+    else:
+        df = pd.read_csv(origen, dtype=str, keep_default_na=False)
+
+    cols = [_sin_acentos(str(c)).strip().lower().replace(" ", "_") for c in df.columns]
+    df.columns = [ALIAS.get(c, c) for c in cols]
+    return df.fillna("")
+
+
+# ------------------ Validación (vectorizada) ------------------
+def _si_no(s: pd.Series) -> pd.Series:
+    t = s.str.strip().str.lower().map(_sin_acentos)
+    return pd.Series(
+        [1 if v in _SI else 0 if v in _NO else pd.NA for v in t], index=s.index, dtype="Int64"
+    )
+
+
+def validar(df: pd.DataFrame) -> tuple:
+    """
+    Devuelve (filas, placas, errores):
+    - filas: columnas de propietarios listas para escribir (sólo filas válidas)
+    - placas: (casa, placa) vigentes por casa, o None si el archivo no trae placas
+    - errores: DataFrame fila/casa/error (fila = línea del archivo)
+    """
+    if "casa" not in df.columns:
+        raise ValueError("El archivo no tiene la columna 'casa'.")
+
+    errores = []
+    lineas = pd.Series(df.index + 2, index=df.index)  # +1 encabezado, +1 base 1
+
+    def marcar(mascara: pd.Series, mensaje: str):
+        for i in mascara[mascara].index:
+            errores.append((int(lineas[i]), i, mensaje))
+
+    out = pd.DataFrame(index=df.index)
+    out["casa"] = df["casa"].str.strip().str.upper()
+    marcar(out["casa"] == "", "casa vacía")
+    marcar(out["casa"].duplicated(keep=False) & (out["casa"] != ""), "casa repetida en el archivo")
+
+    for c in ["condominio", "bloque"]:
+        if c in df.columns:
+            out[c] = df[c].str.strip()
+
+    for c in _TEXTO:
+        if c in df.columns:
+            out[c] = df[c].str.strip().replace("", None)
+    if "email" in out.columns:
+        marcar(out["email"].notna() & ~out["email"].fillna("").str.match(_EMAIL), "email inválido")
+
+    for c in ["area", "alicuota_pct"]:
+        if c in df.columns:
+            texto = df[c].str.strip().str.replace(",", ".", regex=False)
+            out[c] = pd.to_numeric(texto, errors="coerce")
+            marcar((texto != "") & out[c].isna(), f"{c} no es un número")
+            marcar(out[c] < 0, f"{c} negativo")
+    if "no_autos" in df.columns:
+        texto = df["no_autos"].str.strip()
+        out["no_autos"] = pd.to_numeric(texto, errors="coerce")
+        marcar((texto != "") & (out["no_autos"].isna() | (out["no_autos"] % 1 != 0) | (out["no_autos"] < 0)),
+               "no_autos debe ser un entero >= 0")
+        out["no_autos"] = out["no_autos"].fillna(0).astype("int64")
+
+    for c in ["tiene_arrendatario", "asistente_hogar"]:
+        if c in df.columns:
+            out[c] = _si_no(df[c])
+            marcar(out[c].isna(), f"{c} debe ser Sí/No")
+    if "asistente_hogar" in out.columns and "asistente_nombre" in out.columns:
+        # Como el formulario: el nombre sólo si hay asistente
+        out.loc[out["asistente_hogar"] != 1, "asistente_nombre"] = None
+
+    placas = None
+    if "placas" in df.columns:
+        # Una fila por (fila del archivo, placa): mismas reglas que parse_placas()
+        p = df["placas"].str.upper().str.split(r"[,\s]+", regex=True).explode()
+        p = p[p.notna() & (p != "")]
+        p = p[~pd.Series(list(zip(p.index, p)), index=p.index).duplicated()]
+        marcar(pd.Series(p.index.value_counts() > MAX_PLACAS).reindex(df.index, fill_value=False),
+               f"más de {MAX_PLACAS} placas")
+        malas = p[~p.str.match(PLATE_RE.pattern)]
+        for i, placa in malas.items():
+            errores.append((int(lineas[i]), i, f"placa inválida (AAA1234): {placa}"))
+        repetidas = p[p.duplicated(keep=False)]
+        for i, placa in repetidas.items():
+            errores.append((int(lineas[i]), i, f"placa {placa} en varias filas del archivo"))
+        placas = pd.DataFrame({"fila": p.index, "placa": p.to_numpy()})
+        placas["orden"] = placas.groupby("fila").cumcount()
+        placas["casa"] = out.loc[placas["fila"], "casa"].to_numpy()
+        # placa1..placa6 de propietarios (el formulario los sigue mostrando)
+        for k in range(MAX_PLACAS):
+            col = placas[placas["orden"] == k].set_index("fila")["placa"]
+            out[f"placa{k + 1}"] = col.reindex(df.index).astype(object).where(lambda s: s.notna(), None)
+
+    err = pd.DataFrame(errores, columns=["fila", "indice", "error"])
+    malas_filas = set(err["indice"])
+    err["casa"] = out.loc[err["indice"], "casa"].to_numpy() if len(err) else []
+    err = err.sort_values(["fila", "error"])[["fila", "casa", "error"]].reset_index(drop=True)
+
+    validas = out[~out.index.isin(malas_filas)]
+    if placas is not None:
+        placas = placas[placas["fila"].isin(validas.index)][["casa", "placa"]]
+    return validas, placas, err
+
+
+# ------------------ Escritura ------------------
+def _placas_ocupadas(conn: sqlite3.Connection) -> pd.DataFrame:
+    # Placa vigente en una casa que el archivo no reasigna
+    return pd.read_sql_query("""
+        SELECT i.casa, i.placa, p.casa AS otra
+        FROM _import_placas i
+        JOIN placas p ON p.placa = i.placa AND p.valido_hasta IS NULL AND p.casa <> i.casa
+        WHERE p.casa NOT IN (SELECT casa FROM _import_casas)
+    """, conn)
+
+
+def _escribir(conn: sqlite3.Connection, filas: pd.DataFrame, placas, solo_validar: bool) -> dict:
+    ahora = _ahora()
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS _import_casas (casa TEXT PRIMARY KEY)")
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS _import_placas (casa TEXT, placa TEXT)")
+    conn.execute("DELETE FROM _import_casas")
+    conn.execute("DELETE FROM _import_placas")
+    conn.executemany("INSERT INTO _import_casas (casa) VALUES (?)", ((c,) for c in filas["casa"]))
+
+    errores = []
+    if placas is not None:
+        conn.executemany("INSERT INTO _import_placas (casa, placa) VALUES (?, ?)", placas.itertuples(index=False))
+        # Las casas del archivo entregan todas sus placas: sólo choca una
+        # placa vigente en una casa que no viene en el archivo
+        ocupadas = _placas_ocupadas(conn)
+        if not ocupadas.empty:
+            errores = [(c, f"placa {p} ya registrada en {o}") for c, p, o in ocupadas.itertuples(index=False)]
+            fuera = set(ocupadas["casa"])
+            filas = filas[~filas["casa"].isin(fuera)]
+            placas = placas[~placas["casa"].isin(fuera)]
+            conn.executemany("DELETE FROM _import_casas WHERE casa = ?", ((c,) for c in fuera))
+            conn.executemany("DELETE FROM _import_placas WHERE casa = ?", ((c,) for c in fuera))
+
+    existentes = {r[0] for r in conn.execute(
+        "SELECT casa FROM propietarios WHERE casa IN (SELECT casa FROM _import_casas)"
+    )}
+    resultado = {
+        "insertadas": int((~filas["casa"].isin(existentes)).sum()),
+        "actualizadas": 0,
+        "errores": errores,
+    }
+    if solo_validar or filas.empty:
+        return resultado
+
+    # Catálogo de unidades: condominio/bloque del archivo o del código
+    if "condominio" in filas.columns:
+        agregar_unidades(conn, zip(
+            filas["casa"], filas["condominio"],
+            filas["bloque"] if "bloque" in filas.columns else [""] * len(filas)
+        ))
+    registrar_desde(conn, "_import_casas")
+
+    # Upsert: sólo columnas del archivo; filas iguales no se reescriben
+    cols = [c for c in filas.columns if c not in ("condominio", "bloque")]
+    datos = filas[cols].astype(object).where(filas[cols].notna(), None)
+    otras = [c for c in cols if c != "casa"]
+    distinto = " OR ".join(f"propietarios.{c} IS NOT excluded.{c}" for c in otras) or "0"
+    cur = conn.executemany(f"""
+        INSERT INTO propietarios ({', '.join(cols)}, actualizado_en, version)
+        VALUES ({', '.join(['?'] * len(cols))}, ?, 1)
+        ON CONFLICT(casa) DO UPDATE SET
+        {', '.join(f'{c}=excluded.{c}' for c in otras + ['actualizado_en'])},
+        version = propietarios.version + 1
+        WHERE {distinto}
+    """, (list(f) + [ahora] for f in datos.itertuples(index=False)))
+    resultado["actualizadas"] = cur.rowcount - resultado["insertadas"]
+
+    if placas is not None:
+        # Primero se cierran las que salen, después se abren las nuevas:
+        # una placa puede pasar de una casa del archivo a otra
+        conn.execute("""
+            UPDATE placas SET valido_hasta = ?
+            WHERE valido_hasta IS NULL AND casa IN (SELECT casa FROM _import_casas)
+              AND (casa, placa) NOT IN (SELECT casa, placa FROM _import_placas)
+        """, (ahora,))
+        conn.execute("""
+            INSERT INTO placas (placa, casa, valido_desde)
+            SELECT i.placa, i.casa, ? FROM _import_placas i
+            WHERE NOT EXISTS (
+                SELECT 1 FROM placas p WHERE p.placa = i.placa AND p.casa = i.casa AND p.valido_hasta IS NULL
+            )
+        """, (ahora,))
+    return resultado
+
+
+def importar_propietarios(origen, nombre: str = None, solo_validar: bool = False) -> dict:
+    """
+    Valida e importa un archivo de propietarios. Devuelve dict con filas,
+    insertadas, actualizadas y errores (DataFrame fila/casa/error).
+    Con solo_validar=True no escribe nada.
+    """
+    migrar()
+    df = leer_archivo(origen, nombre)
+    filas, placas, errores = validar(df)
+
+    if solo_validar:
+        # Sólo lee (las tablas temporales no tocan la BD): sin lock de escritura
+        with conexion() as conn:
+            res = _escribir(conn, filas, placas, solo_validar=True)
+    else:
+        res = escribir(lambda conn: _escribir(conn, filas, placas, solo_validar=False))
+
+    if res["errores"]:
+        lineas = df.index.to_series().groupby(df["casa"].str.strip().str.upper()).first() + 2
+        extra = pd.DataFrame(res["errores"], columns=["casa", "error"])
+        extra.insert(0, "fila", extra["casa"].map(lineas).astype(int))
+        errores = pd.concat([errores, extra]).sort_values("fila").reset_index(drop=True)
+
+    con_error = errores["fila"].nunique()
+    return {
+        "filas": len(df),
+        "insertadas": res["insertadas"],
+        "actualizadas": res["actualizadas"],
+        "sin_cambios": len(df) - con_error - res["insertadas"] - res["actualizadas"],
+        "con_error": con_error,
+        "errores": errores,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Carga masiva de propietarios (CSV/XLSX).")
+    parser.add_argument("archivo", help="archivo con columnas: " + ", ".join(ARCHIVO_COLS))
+    parser.add_argument("--validar", action="store_true", help="sólo valida, no escribe")
+    args = parser.parse_args()
+
+    r = importar_propietarios(args.archivo, solo_validar=args.validar)
+    modo = "validación" if args.validar else "importación"
+    print(
+        f"✅ {modo.capitalize()} de {os.path.basename(args.archivo)}: {r['insertadas']} nuevas, "
+        f"{r['actualizadas']} actualizadas, {r['sin_cambios']} sin cambios, {r['con_error']} con error"
+    )
+    if not r["errores"].empty:
+        print(r["errores"].to_string(index=False))
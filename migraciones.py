@@ -0,0 +1,625 @@
+import hashlib
+import re
+import sqlite3
+import threading
+from datetime import datetime
+
+import db
+from busqueda import TOKENIZADOR
+from db import CASAS, MONTOS_PAGOS, conexion, incrementar_generacion, invalidar_columnas
+from cartera import MES_PERIODO, actualizar_cartera
+from placas import migrar_desde_propietarios
+from resumen import actualizar_resumen
+from unidades import agregar_unidades, registrar_desde, sincronizar_propietarios
+
+# Esquema completo de la BD, versionado con PRAGMA user_version.
+# migrar() aplica las migraciones pendientes una vez por proceso (y por
+# archivo de BD); los reruns de Streamlit no vuelven a tocar el esquema.
+# Todas son idempotentes (IF NOT EXISTS), así una BD creada antes de este
+# módulo (user_version = 0) queda al día sin perder datos.
+# Para cambiar el esquema: agregar una función al final de MIGRACIONES.
+
+
+def _ahora() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _existe_tabla(conn: sqlite3.Connection, tabla: str) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (tabla,)
+    ).fetchone() is not None
+
+
+# ------------------ usuarios + propietarios ------------------
+# id explícito (INTEGER PRIMARY KEY): es la clave del índice FTS5 de
+# propietarios y, a diferencia del rowid implícito, VACUUM no la renumera
+PROPIETARIOS_DDL = """
+        CREATE TABLE {if_not_exists} propietarios (
+            id INTEGER PRIMARY KEY,
+            casa TEXT NOT NULL UNIQUE,
+
+            foto_path TEXT,                        -- ver fotos.py
+            nombre TEXT,
+            cedula TEXT,
+            telefono_fijo TEXT,
+            celular TEXT,
+
+            area REAL,                             -- m2
+            alicuota_pct REAL,                     -- % alícuota
+            email TEXT,
+
+            tiene_arrendatario INTEGER DEFAULT 0,  -- 0/1
+            no_autos INTEGER DEFAULT 0,
+
+            placa1 TEXT,                           -- placas vigentes: tabla placas
+            placa2 TEXT,
+            placa3 TEXT,
+            placa4 TEXT,
+            placa5 TEXT,
+            placa6 TEXT,
+
+            asistente_hogar INTEGER DEFAULT 0,     -- 0/1
+            asistente_nombre TEXT,                 -- solo si asistente_hogar=1
+
+            actualizado_en TEXT,
+            version INTEGER NOT NULL DEFAULT 0     -- bloqueo optimista (db.guardar_propietario)
+        )
+"""
+
+
+def crear_propietarios(conn: sqlite3.Connection):
+    conn.execute(PROPIETARIOS_DDL.format(if_not_exists="IF NOT EXISTS"))
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_prop_nombre ON propietarios(nombre)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_prop_cedula ON propietarios(cedula)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_prop_email ON propietarios(email)")
+
+
+def _m001_base(conn: sqlite3.Connection):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS usuarios (
+            user TEXT PRIMARY KEY,
+            pw TEXT,
+            rol TEXT
+        )
+    """)
+    pw_hash = hashlib.sha256("admin123".encode()).hexdigest()
+    conn.execute("INSERT OR IGNORE INTO usuarios VALUES ('admin', ?, 'ADMINISTRADOR')", (pw_hash,))
+    crear_propietarios(conn)
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (clave TEXT PRIMARY KEY, valor INTEGER)")
+
+
+# ------------------ pagos ------------------
+PAGOS_DDL = """
+    CREATE TABLE {if_not_exists} pagos (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        periodo TEXT,
+        casa TEXT NOT NULL,
+        propietario TEXT NOT NULL,
+        monto_a_pagar INTEGER,           -- montos en centavos (db.MONTOS_PAGOS)
+        fecha_pago TEXT,
+        monto_pagado INTEGER,
+        provision INTEGER,
+        decimos INTEGER,
+        sueldo INTEGER,
+        saldo_pagar INTEGER,
+        fila_hash TEXT
+    )
+"""
+
+# Índices que necesitan los filtros del sidebar y la paginación
+PAGOS_INDICES = [
+    "CREATE INDEX IF NOT EXISTS idx_pagos_casa_fecha ON pagos(casa, fecha_pago)",
+    "CREATE INDEX IF NOT EXISTS idx_pagos_periodo ON pagos(periodo)",
+    "CREATE INDEX IF NOT EXISTS idx_pagos_fecha ON pagos(fecha_pago)",
+    "CREATE INDEX IF NOT EXISTS idx_pagos_propietario ON pagos(propietario)",
+]
+
+# Clave natural para el upsert incremental
+PAGOS_CLAVE_INDICE = "CREATE UNIQUE INDEX IF NOT EXISTS idx_pagos_clave ON pagos(periodo, casa)"
+
+
+def crear_indices_pagos(conn: sqlite3.Connection):
+    """
+    Índices de pagos. sqlite3.IntegrityError si hay filas duplicadas por
+    (periodo, casa): el importador lo reporta y pide --completo.
+    """
+    for sql in PAGOS_INDICES:
+        conn.execute(sql)
+    conn.execute(PAGOS_CLAVE_INDICE)
+
+
+def _m002_pagos(conn: sqlite3.Connection):
+    conn.execute(PAGOS_DDL.format(if_not_exists="IF NOT EXISTS"))
+    cols = [r[1] for r in conn.execute("PRAGMA table_info(pagos)").fetchall()]
+    if "fila_hash" not in cols:
+        conn.execute("ALTER TABLE pagos ADD COLUMN fila_hash TEXT")
+    try:
+        crear_indices_pagos(conn)
+    except sqlite3.IntegrityError:
+        # Tabla vieja con duplicados: queda sin índice único hasta la
+        # próxima carga completa (los índices de filtros sí se crean)
+        pass
+
+
+# ------------------ resumen casa × mes ------------------
+def _m003_resumen(conn: sqlite3.Connection):
+    existia = _existe_tabla(conn, "resumen_casa_mes")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS resumen_casa_mes (
+            casa TEXT NOT NULL,
+            mes TEXT NOT NULL,               -- YYYY-MM
+            total_pagado INTEGER,            -- centavos
+            monto_a_pagar INTEGER,
+            provision INTEGER,
+            decimos INTEGER,
+            sueldo INTEGER,
+            registros INTEGER,
+            fecha_ultimo_pago TEXT,
+            saldo_ultimo INTEGER,            -- saldo_pagar del último pago del mes
+            PRIMARY KEY (casa, mes)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_resumen_mes ON resumen_casa_mes(mes)")
+    if not existia:
+        # BDs con pagos importados antes de que existiera el resumen
+        actualizar_resumen(conn, completo=True)
+
+
+# ------------------ libros mensuales ------------------
+def _m004_libros(conn: sqlite3.Connection):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS libros_archivos (
+            archivo TEXT PRIMARY KEY,
+            condominio TEXT NOT NULL DEFAULT '',
+            periodo TEXT NOT NULL,
+            sha256 TEXT NOT NULL,
+            procesado_en TEXT
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS libro_gastos (
+            archivo TEXT NOT NULL,
+            condominio TEXT NOT NULL DEFAULT '',
+            periodo TEXT NOT NULL,
+            seccion TEXT,
+            descripcion TEXT,
+            oficial REAL,
+            fecha TEXT,
+            sale REAL,
+            saldo_gnrl REAL
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS libro_ingresos (
+            archivo TEXT NOT NULL,
+            condominio TEXT NOT NULL DEFAULT '',
+            periodo TEXT NOT NULL,
+            casa TEXT NOT NULL,
+            propietario TEXT,
+            cuota REAL,
+            fecha_pago TEXT,
+            monto_pagado REAL,
+            saldo_gnrl REAL,
+            provision REAL,
+            decimos REAL,
+            sueldo REAL,
+            faltante REAL,
+            saldo REAL
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS libro_saldos (
+            archivo TEXT NOT NULL,
+            condominio TEXT NOT NULL DEFAULT '',
+            periodo TEXT NOT NULL,
+            seccion TEXT,
+            concepto TEXT,
+            columna TEXT,
+            valor REAL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_libro_gastos_archivo ON libro_gastos(archivo)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_libro_gastos_periodo ON libro_gastos(condominio, periodo)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_libro_ingresos_archivo ON libro_ingresos(archivo)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_libro_ingresos_casa ON libro_ingresos(condominio, casa, periodo)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_libro_saldos_archivo ON libro_saldos(archivo)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_libro_saldos_periodo ON libro_saldos(condominio, periodo)")
+
+
+# ------------------ trabajos en segundo plano ------------------
+TRABAJOS_ACTIVOS = ("en_cola", "corriendo")
+
+
+def _m005_trabajos(conn: sqlite3.Connection):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS trabajos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            tipo TEXT NOT NULL,
+            estado TEXT NOT NULL,            -- en_cola | corriendo | ok | error
+            parametros TEXT,
+            progreso REAL DEFAULT 0,
+            filas INTEGER DEFAULT 0,
+            insertadas INTEGER,
+            actualizadas INTEGER,
+            sin_cambios INTEGER,
+            error TEXT,
+            pid INTEGER,
+            creado_en TEXT,
+            iniciado_en TEXT,
+            terminado_en TEXT
+        )
+    """)
+    # A lo sumo un trabajo activo por tipo, garantizado por la BD
+    conn.execute(f"""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_trabajos_activo
+        ON trabajos(tipo) WHERE estado IN {TRABAJOS_ACTIVOS}
+    """)
+
+
+# ------------------ catálogo de unidades ------------------
+def _m006_unidades(conn: sqlite3.Connection):
+    # COLLATE NOCASE en el código: LIKE 'abc%' usa el índice (búsqueda por prefijo)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS unidades (
+            codigo TEXT PRIMARY KEY COLLATE NOCASE,
+            condominio TEXT NOT NULL DEFAULT '',
+            bloque TEXT NOT NULL DEFAULT '',
+            creado_en TEXT
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_unidades_condominio ON unidades(condominio, codigo)")
+    if not conn.execute("SELECT 1 FROM unidades LIMIT 1").fetchone():
+        agregar_unidades(conn, ((c, "", "") for c in CASAS))
+    registrar_desde(conn, "pagos")
+    registrar_desde(conn, "propietarios")
+    sincronizar_propietarios(conn)
+
+
+# ------------------ placas ------------------
+def _m007_placas(conn: sqlite3.Connection):
+    existia = _existe_tabla(conn, "placas")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS placas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            placa TEXT NOT NULL,
+            casa TEXT NOT NULL,
+            valido_desde TEXT NOT NULL,
+            valido_hasta TEXT                -- NULL = vigente
+        )
+    """)
+    # Una asignación vigente por placa: la consulta de garita es un salto aquí
+    conn.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_placas_vigente
+        ON placas(placa) WHERE valido_hasta IS NULL
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_placas_casa
+        ON placas(casa) WHERE valido_hasta IS NULL
+    """)
+    if not existia:
+        migrar_desde_propietarios(conn)
+
+
+# ------------------ identidad de la BD ------------------
+def _m008_instancia(conn: sqlite3.Connection):
+    # Número aleatorio por archivo de BD: junto con la generación de pagos
+    # versiona los snapshots (una BD recreada vuelve a la generación 1)
+    conn.execute("INSERT OR IGNORE INTO meta (clave, valor) VALUES ('instancia', abs(random()))")
+
+
+# ------------------ montos en centavos ------------------
+def _m009_centavos(conn: sqlite3.Connection):
+    # Los montos eran REAL en dólares: se reconstruye pagos con INTEGER
+    # (afinidad REAL convertiría los enteros de vuelta a float) y de paso
+    # se limpian casa/propietario, que la lectura ya no re-normaliza
+    cols = [r[1] for r in conn.execute("PRAGMA table_info(pagos)").fetchall()]
+    exprs = []
+    for c in cols:
+        if c in MONTOS_PAGOS:
+            exprs.append(f"CAST(ROUND({c} * 100) AS INTEGER)")
+        elif c == "casa":
+            exprs.append("UPPER(TRIM(casa))")
+        elif c == "propietario":
+            exprs.append("TRIM(propietario)")
+        else:
+            exprs.append(c)
+    conn.execute(PAGOS_DDL.format(if_not_exists="").replace("pagos (", "_pagos_centavos (", 1))
+    conn.execute(f"""
+        INSERT INTO _pagos_centavos ({",".join(cols)})
+        SELECT {",".join(exprs)} FROM pagos
+    """)
+    conn.execute("DROP TABLE pagos")
+    conn.execute("ALTER TABLE _pagos_centavos RENAME TO pagos")
+    try:
+        crear_indices_pagos(conn)
+    except sqlite3.IntegrityError:
+        for sql in PAGOS_INDICES:
+            conn.execute(sql)
+
+    # El resumen se rehace completo con sumas enteras
+    conn.execute("DROP TABLE IF EXISTS resumen_casa_mes")
+    _m003_resumen(conn)
+    # Cachés y snapshots con montos en dólares quedan inválidos
+    incrementar_generacion(conn, "pagos")
+
+
+# ------------------ cartera vencida ------------------
+def _m010_cartera(conn: sqlite3.Connection):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS cartera_mov (
+            casa TEXT NOT NULL,
+            mes TEXT NOT NULL,               -- YYYY-MM del periodo
+            cargo INTEGER NOT NULL,          -- centavos
+            abono INTEGER NOT NULL,
+            cargo_acum INTEGER NOT NULL,     -- acumulados por casa hasta este mes
+            abono_acum INTEGER NOT NULL,
+            PRIMARY KEY (casa, mes)
+        ) WITHOUT ROWID
+    """)
+    # La cola impaga de una casa (cargo_acum > abonos) es un rango aquí
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_cartera_mov_acum ON cartera_mov(casa, cargo_acum)")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS cartera_casa (
+            casa TEXT PRIMARY KEY,
+            cargos INTEGER NOT NULL,
+            abonos INTEGER NOT NULL,
+            saldo INTEGER NOT NULL,          -- abonos - cargos (negativo = deuda)
+            mes_desde TEXT,
+            mes_hasta TEXT,
+            actualizado_en TEXT
+        )
+    """)
+    actualizar_cartera(conn, completo=True)
+
+
+# ------------------ búsqueda FTS5 ------------------
+# Columnas de la ficha que entran en la búsqueda global de propietarios
+PROPIETARIOS_FTS_COLS = ["casa", "nombre", "cedula", "telefono_fijo", "celular", "email"]
+
+
+def crear_busqueda_propietarios(conn: sqlite3.Connection):
+    """
+    Índice FTS5 sobre propietarios (external content: no duplica el texto)
+    y sus triggers. Reindexa todo: llamarla también después de recrear
+    la tabla propietarios.
+    """
+    cols = ", ".join(PROPIETARIOS_FTS_COLS)
+    nuevos = ", ".join(f"new.{c}" for c in PROPIETARIOS_FTS_COLS)
+    viejos = ", ".join(f"old.{c}" for c in PROPIETARIOS_FTS_COLS)
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS propietarios_fts USING fts5(
+            {cols}, content='propietarios', content_rowid='id', tokenize='{TOKENIZADOR}', prefix='2 3'
+        )
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS propietarios_fts_ai AFTER INSERT ON propietarios BEGIN
+            INSERT INTO propietarios_fts (rowid, {cols}) VALUES (new.id, {nuevos});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS propietarios_fts_ad AFTER DELETE ON propietarios BEGIN
+            INSERT INTO propietarios_fts (propietarios_fts, rowid, {cols}) VALUES ('delete', old.id, {viejos});
+        END
+    """)
+    # Fotos, placas, etc. no cambian el índice
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS propietarios_fts_au AFTER UPDATE OF {cols} ON propietarios BEGIN
+            INSERT INTO propietarios_fts (propietarios_fts, rowid, {cols}) VALUES ('delete', old.id, {viejos});
+            INSERT INTO propietarios_fts (rowid, {cols}) VALUES (new.id, {nuevos});
+        END
+    """)
+    conn.execute("INSERT INTO propietarios_fts (propietarios_fts) VALUES ('rebuild')")
+
+
+def crear_busqueda_pagos(conn: sqlite3.Connection):
+    """
+    Nombres distintos de pagos.propietario (pagos_nombres) con su índice
+    FTS5, alimentados por triggers sobre pagos. Llamarla también después
+    de recrear pagos: quita los nombres que ya no aparecen.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS pagos_nombres (
+            id INTEGER PRIMARY KEY,
+            nombre TEXT NOT NULL UNIQUE
+        )
+    """)
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS pagos_nombres_fts USING fts5(
+            nombre, content='pagos_nombres', content_rowid='id', tokenize='{TOKENIZADOR}', prefix='2 3'
+        )
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS pagos_nombres_fts_ai AFTER INSERT ON pagos_nombres BEGIN
+            INSERT INTO pagos_nombres_fts (rowid, nombre) VALUES (new.id, new.nombre);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS pagos_nombres_fts_ad AFTER DELETE ON pagos_nombres BEGIN
+            INSERT INTO pagos_nombres_fts (pagos_nombres_fts, rowid, nombre) VALUES ('delete', old.id, old.nombre);
+        END
+    """)
+    # Un nombre que deja de usarse queda hasta la próxima carga completa:
+    # no coincide con ninguna fila de pagos, así que no cambia resultados.
+    # Sin OR IGNORE: dentro de un INSERT ... ON CONFLICT DO UPDATE (el
+    # upsert del importador) manda el manejo de conflictos de la sentencia
+    # externa y el duplicado fallaría con IntegrityError
+    for evento in ["INSERT", "UPDATE OF propietario"]:
+        sufijo = "ai" if evento == "INSERT" else "au"
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS pagos_nombres_{sufijo} AFTER {evento} ON pagos
+            WHEN new.propietario IS NOT NULL BEGIN
+                INSERT INTO pagos_nombres (nombre)
+                SELECT new.propietario
+                WHERE NOT EXISTS (SELECT 1 FROM pagos_nombres WHERE nombre = new.propietario);
+            END
+        """)
+    conn.execute("""
+        DELETE FROM pagos_nombres
+        WHERE nombre NOT IN (SELECT propietario FROM pagos WHERE propietario IS NOT NULL)
+    """)
+    conn.execute("""
+        INSERT OR IGNORE INTO pagos_nombres (nombre)
+        SELECT DISTINCT propietario FROM pagos WHERE propietario IS NOT NULL
+    """)
+
+
+def _m011_busqueda(conn: sqlite3.Connection):
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_pagos_propietario ON pagos(propietario)")
+    # propietarios_fts necesita propietarios.id: lo crea la v15
+    crear_busqueda_pagos(conn)
+
+
+# ------------------ edición concurrente ------------------
+def _m012_version_propietarios(conn: sqlite3.Connection):
+    cols = [r[1] for r in conn.execute("PRAGMA table_info(propietarios)").fetchall()]
+    if "version" not in cols:
+        conn.execute("ALTER TABLE propietarios ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+
+
+# ------------------ búsqueda: triggers de pagos_nombres ------------------
+def _m013_triggers_nombres(conn: sqlite3.Connection):
+    # Los triggers de la v11 usaban INSERT OR IGNORE (falla en el upsert)
+    conn.execute("DROP TRIGGER IF EXISTS pagos_nombres_ai")
+    conn.execute("DROP TRIGGER IF EXISTS pagos_nombres_au")
+    crear_busqueda_pagos(conn)
+
+
+# ------------------ cartera por año ------------------
+def _m014_cartera_anio(conn: sqlite3.Connection):
+    # Los meses de periodos numéricos ya no se fijan en 2025: se recalcula
+    actualizar_cartera(conn, completo=True)
+
+
+# ------------------ propietarios con id ------------------
+def _m015_propietarios_id(conn: sqlite3.Connection):
+    # El índice FTS de la v11 iba por el rowid implícito de propietarios
+    # (clave TEXT), que VACUUM puede renumerar: se reconstruye la tabla con
+    # id INTEGER PRIMARY KEY (conservando el rowid actual) y el índice con él
+    conn.execute("DROP TABLE IF EXISTS propietarios_fts")
+    for sufijo in ["ai", "ad", "au"]:
+        conn.execute(f"DROP TRIGGER IF EXISTS propietarios_fts_{sufijo}")
+
+    cols = [r[1] for r in conn.execute("PRAGMA table_info(propietarios)").fetchall()]
+    if "id" not in cols:
+        conn.execute(PROPIETARIOS_DDL.format(if_not_exists="").replace("propietarios (", "_propietarios_id (", 1))
+        conn.execute(f"""
+            INSERT INTO _propietarios_id (id, {",".join(cols)})
+            SELECT rowid, {",".join(cols)} FROM propietarios
+        """)
+        conn.execute("DROP TABLE propietarios")
+        conn.execute("ALTER TABLE _propietarios_id RENAME TO propietarios")
+        crear_propietarios(conn)
+        invalidar_columnas("propietarios")
+    crear_busqueda_propietarios(conn)
+
+
+# ------------------ periodo con año ------------------
+def _m016_periodo_con_anio(conn: sqlite3.Connection):
+    # periodo "1".."12" no distinguía años en la clave (periodo, casa): pasa
+    # a YYYY-MM con el criterio de la cartera. OR IGNORE: si la casa ya
+    # tiene ese YYYY-MM, la fila vieja queda como estaba
+    numerico = "(p.periodo GLOB '[0-9]' OR p.periodo GLOB '[0-9][0-9]') AND CAST(p.periodo AS INTEGER) BETWEEN 1 AND 12"
+    conn.execute(f"""
+        UPDATE OR IGNORE pagos AS p SET periodo = {MES_PERIODO}
+        WHERE {numerico} AND ({MES_PERIODO}) IS NOT NULL
+    """)
+    incrementar_generacion(conn, "pagos")
+
+
+# ------------------ libros en centavos ------------------
+# Montos de los libros en centavos enteros, como pagos (la v4 los creaba REAL)
+MONTOS_LIBROS = {
+    "libro_gastos": ["oficial", "sale", "saldo_gnrl"],
+    "libro_ingresos": [
+        "cuota", "monto_pagado", "saldo_gnrl", "provision", "decimos", "sueldo", "faltante", "saldo",
+    ],
+    "libro_saldos": ["valor"],
+}
+
+
+def _m017_libros_centavos(conn: sqlite3.Connection):
+    # Se reconstruye cada tabla con las columnas de montos INTEGER (con
+    # afinidad REAL los enteros volverían a float) y se copian x 100
+    for tabla, montos in MONTOS_LIBROS.items():
+        info = conn.execute(f"PRAGMA table_info({tabla})").fetchall()
+        if all(tipo.upper() == "INTEGER" for _, c, tipo, *_ in info if c in montos):
+            continue
+        cols = [r[1] for r in info]
+        ddl = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (tabla,)).fetchone()[0]
+        for c in montos:
+            ddl = re.sub(rf"\b{c} REAL\b", f"{c} INTEGER", ddl)
+        conn.execute(ddl.replace(f"TABLE {tabla} (", f"TABLE _{tabla}_centavos (", 1))
+        exprs = [f"CAST(ROUND({c} * 100) AS INTEGER)" if c in montos else c for c in cols]
+        conn.execute(f"INSERT INTO _{tabla}_centavos ({','.join(cols)}) SELECT {','.join(exprs)} FROM {tabla}")
+        conn.execute(f"DROP TABLE {tabla}")
+        conn.execute(f"ALTER TABLE _{tabla}_centavos RENAME TO {tabla}")
+    # DROP TABLE se llevó los índices de la v4
+    _m004_libros(conn)
+    incrementar_generacion(conn, "libros")
+
+
+# (versión, descripción, función) en orden; user_version = última aplicada
+MIGRACIONES = [
+    (1, "usuarios, propietarios y meta", _m001_base),
+    (2, "pagos con fila_hash e índices", _m002_pagos),
+    (3, "resumen casa × mes", _m003_resumen),
+    (4, "libros mensuales", _m004_libros),
+    (5, "trabajos en segundo plano", _m005_trabajos),
+    (6, "catálogo de unidades", _m006_unidades),
+    (7, "placas con vigencia", _m007_placas),
+    (8, "instancia de la BD en meta", _m008_instancia),
+    (9, "montos en centavos (INTEGER)", _m009_centavos),
+    (10, "cartera vencida por casa", _m010_cartera),
+    (11, "búsqueda FTS5 de propietarios", _m011_busqueda),
+    (12, "versión de fila en propietarios", _m012_version_propietarios),
+    (13, "triggers de nombres de pagos sin OR IGNORE", _m013_triggers_nombres),
+    (14, "cartera: año de periodos numéricos desde fecha_pago", _m014_cartera_anio),
+    (15, "propietarios con id explícito para el índice FTS5", _m015_propietarios_id),
+    (16, "periodo de pagos con año (YYYY-MM)", _m016_periodo_con_anio),
+    (17, "montos de los libros en centavos (INTEGER)", _m017_libros_centavos),
+]
+VERSION_ACTUAL = MIGRACIONES[-1][0]
+
+_migradas = set()
+_lock = threading.Lock()
+
+
+def version_esquema(conn: sqlite3.Connection = None) -> int:
+    if conn is None:
+        with conexion() as c:
+            return version_esquema(c)
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrar() -> list:
+    """
+    Aplica las migraciones pendientes en una sola transacción. Después de
+    la primera llamada del proceso (para la BD actual) no hace nada.
+    Devuelve las versiones aplicadas.
+    """
+    path = db.DB_PATH
+    if path in _migradas:
+        return []
+    with _lock:
+        if path in _migradas:
+            return []
+        aplicadas = []
+        with conexion() as conn:
+            if version_esquema(conn) < VERSION_ACTUAL:
+                conn.execute("BEGIN IMMEDIATE")
+                # Otro proceso pudo migrar mientras esperábamos el lock
+                actual = version_esquema(conn)
+                for version, _, fn in MIGRACIONES:
+                    if version > actual:
+                        fn(conn)
+                        conn.execute(f"PRAGMA user_version = {version}")
+                        aplicadas.append(version)
+        if aplicadas:
+            invalidar_columnas()
+        _migradas.add(path)
+    return aplicadas
+
+
+if __name__ == "__main__":
+    aplicadas = migrar()
+    print(f"✅ Esquema en versión {version_esquema()} ({db.DB_PATH}); aplicadas: {aplicadas or 'ninguna'}")
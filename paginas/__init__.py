@@ -0,0 +1,18 @@
+import importlib
+
+# Páginas de la app: cada una es un módulo con mostrar(). Se importa sólo
+# la página elegida (Altair, exportación, fotos… se cargan cuando se usan)
+# y cada página lee únicamente sus datos: Propietarios no toca pagos.
+
+PAGINAS = {
+    "Dashboard": "dashboard",
+    "Histórico": "historico",
+    "Cartera": "cartera",
+    "Propietarios": "propietarios",
+    "Garita": "garita",
+    "Administrador": "administrador",
+}
+
+
+def mostrar(nombre: str):
+    importlib.import_module(f"{__name__}.{PAGINAS[nombre]}").mostrar()
@@ -0,0 +1,171 @@
+import os
+
+import streamlit as st
+
+import rendimiento
+from agregados import en_dolares
+from db import cache_stats, cargar_df_propietarios_resumen, contar_pagos, ultimos_pagos
+from exportar import exportar_propietarios, formatos_disponibles
+from fotos import recolectar_fotos
+from importar_propietarios import ARCHIVO_COLS, importar_propietarios
+from migraciones import VERSION_ACTUAL, version_esquema
+from trabajos import lanzar_importacion, trabajo_activo, ultimos_trabajos
+from unidades import completar_propietarios, contar_unidades
+
+
+# ------------------ Importación en segundo plano ------------------
+def panel_importacion():
+    """
+    Progreso de la importación activa y últimos trabajos. Cuando el
+    trabajo que esta sesión vio corriendo termina, recarga la página.
+    """
+    trabajo = trabajo_activo()
+    if trabajo is not None:
+        st.session_state.trabajo_visto = trabajo["id"]
+        st.progress(
+            min(float(trabajo["progreso"] or 0.0), 1.0),
+            text=f"Importación #{trabajo['id']} ({trabajo['estado']}): {trabajo['filas'] or 0:,} filas"
+        )
+    elif st.session_state.get("trabajo_visto"):
+        st.session_state.trabajo_visto = None
+        st.rerun()
+
+    hist = ultimos_trabajos(5)
+    if not hist.empty:
+        ultimo = hist.iloc[0]
+        if ultimo["estado"] == "ok":
+            st.success(
+                f"✅ Importación #{ultimo['id']}: {ultimo['insertadas']} insertadas, "
+                f"{ultimo['actualizadas']} actualizadas, {ultimo['sin_cambios']} sin cambios."
+            )
+        elif ultimo["estado"] == "error":
+            st.error(f"❌ Importación #{ultimo['id']} falló.")
+            st.code(ultimo["error"] or "", language="text")
+        st.dataframe(hist.drop(columns=["error"]), use_container_width=True)
+
+
+# Con st.fragment el panel se refresca solo, sin rerun de toda la página
+if hasattr(st, "fragment"):
+    panel_importacion = st.fragment(run_every=1.0)(panel_importacion)
+
+
+# ------------------ Carga masiva de propietarios ------------------
+def panel_propietarios_masivo():
+    st.caption("Columnas: " + ", ".join(ARCHIVO_COLS) + ". Sólo se actualizan las columnas presentes.")
+    col_i, col_e = st.columns(2)
+
+    with col_i:
+        archivo = st.file_uploader("Archivo de propietarios", type=["csv", "xlsx"], key="prop_masivo_archivo")
+        solo_validar = st.checkbox("Sólo validar (no escribe)", value=False, key="prop_masivo_validar")
+        if archivo is not None and st.button("📥 Importar propietarios"):
+            try:
+                r = importar_propietarios(archivo, archivo.name, solo_validar=solo_validar)
+            except (ValueError, RuntimeError) as e:
+                st.error(str(e))
+            else:
+                verbo = "Se insertarían" if solo_validar else "Insertadas"
+                st.success(
+                    f"✅ {verbo}: {r['insertadas']} · actualizadas: {r['actualizadas']} · "
+                    f"sin cambios: {r['sin_cambios']} · con error: {r['con_error']}"
+                )
+                if not r["errores"].empty:
+                    st.dataframe(r["errores"], use_container_width=True, hide_index=True)
+
+    with col_e:
+        formato = st.radio("Formato", formatos_disponibles(), horizontal=True, key="prop_export_formato")
+        export = st.session_state.get("prop_export")
+        if st.button("📦 Preparar exportación de propietarios"):
+            if export and os.path.exists(export["path"]):
+                os.remove(export["path"])
+            path, mime, n = exportar_propietarios(formato)
+            export = {"formato": formato, "path": path, "mime": mime, "filas": n}
+            st.session_state.prop_export = export
+        if export and export["formato"] == formato and os.path.exists(export["path"]):
+            with open(export["path"], "rb") as fh:
+                st.download_button(
+                    f"⬇️ Descargar {formato.upper()} ({export['filas']:,} propietarios)",
+                    data=fh,
+                    file_name=f"propietarios.{formato}",
+                    mime=export["mime"]
+                )
+
+
+# ------------------ Página ------------------
+def mostrar():
+    st.subheader("🛠 Administrador")
+
+    # Cargas, carga masiva/exportación de propietarios (cédulas, teléfonos,
+    # emails), limpieza de fotos y rendimiento: todo sólo para ADMINISTRADOR
+    if st.session_state.get("rol") != "ADMINISTRADOR":
+        st.info("Solo un ADMINISTRADOR puede usar esta página.")
+        return
+
+    st.warning("Acciones de carga/actualización de base de datos.")
+
+    colA, colB = st.columns(2)
+    with colA:
+        completo = st.checkbox("Carga completa (rehacer tabla pagos)", value=False)
+        if st.button("🚀 Ejecutar Carga Pagos (importar_datos.py)"):
+            trabajo_id = lanzar_importacion(completo=completo)
+            if trabajo_id is None:
+                st.warning("Ya hay una importación en curso.")
+            else:
+                st.session_state.trabajo_visto = trabajo_id
+                st.rerun()
+
+    with colB:
+        if st.button("✅ Inicializar/Verificar tabla propietarios"):
+            n = completar_propietarios()
+            st.success(
+                f"Esquema v{version_esquema()} (de {VERSION_ACTUAL}); {n} filas agregadas, "
+                f"{contar_unidades():,} unidades en el catálogo."
+            )
+        if st.button("🧹 Borrar fotos sin uso"):
+            r = recolectar_fotos()
+            st.success(f"{r['archivos']} archivos borrados ({r['bytes'] / 1024:,.0f} KB).")
+
+    panel_importacion()
+
+    st.divider()
+    st.subheader("👥 Carga masiva de propietarios")
+    panel_propietarios_masivo()
+
+    st.divider()
+    st.subheader("Vista rápida")
+
+    # Conteo y últimos 20 por índice: la tabla completa no se carga
+    st.write(f"Registros en pagos: **{contar_pagos()}**")
+    stats = cache_stats()
+    st.caption(
+        f"Caché pagos → hits: {stats['hits']} | misses: {stats['misses']} | "
+        f"generación: {stats['generacion']} | última carga: {stats['ultima_carga_s'] * 1000:.1f} ms | "
+        f"{stats['entradas']} entradas, {stats['bytes'] / 1024 ** 2:,.1f} MB"
+    )
+    df2 = ultimos_pagos(20)
+    if not df2.empty:
+        st.dataframe(en_dolares(df2), use_container_width=True)
+
+    # Vista rápida propietarios
+    dfp = cargar_df_propietarios_resumen()
+
+    st.write(f"Registros en propietarios: **{len(dfp)}**")
+    if not dfp.empty:
+        st.dataframe(dfp.sort_values("casa"), use_container_width=True)
+
+    # Rendimiento: p50/p95 por etapa y por sentencia SQL
+    st.divider()
+    st.subheader("⏱️ Rendimiento")
+
+    activo = st.checkbox("Instrumentación activa", value=rendimiento.activo())
+    if activo != rendimiento.activo():
+        rendimiento.activar(activo)
+
+    st.caption(f"Últimas {rendimiento.MAX_MUESTRAS} mediciones por etapa · log: {rendimiento.LOG_PATH}")
+    st.dataframe(rendimiento.estadisticas(), use_container_width=True)
+
+    st.caption("SQL (duración hasta la siguiente sentencia o el fin del préstamo de la conexión)")
+    st.dataframe(rendimiento.estadisticas_sql(), use_container_width=True)
+
+    if st.button("🧹 Reiniciar métricas"):
+        rendimiento.reiniciar()
+        st.rerun()
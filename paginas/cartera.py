@@ -0,0 +1,67 @@
+from datetime import date
+
+import streamlit as st
+
+from agregados import dinero, en_dolares
+from cartera import TRAMOS, TRAMOS_TITULO, VENCIDOS, cargar_cartera, cartera_por_condominio, movimientos_casa
+from rendimiento import tramo
+from unidades import condominios
+
+MONTOS_CARTERA = ["cargos", "abonos", "saldo", "vencido"] + TRAMOS
+
+
+def _tabla(df):
+    return en_dolares(df, MONTOS_CARTERA).rename(columns=TRAMOS_TITULO)
+
+
+# Cartera vencida: lee sólo las tablas cartera_* (materializadas al importar)
+def mostrar():
+    st.subheader("💰 Cartera vencida")
+
+    col_c, col_f = st.columns(2)
+    with col_c:
+        corte = st.date_input("Fecha de corte", value=date.today(), key="cartera_corte")
+    with col_f:
+        conds = condominios()
+        condominio = None
+        if len(conds) > 1:
+            elegido = st.selectbox(
+                "Condominio", ["Todos"] + conds, key="cartera_condominio",
+                format_func=lambda c: c or "(sin condominio)"
+            )
+            condominio = None if elegido == "Todos" else elegido
+
+    with tramo("cartera: cargar"):
+        df = cargar_cartera(corte, condominio)
+    if df.empty:
+        st.info("No hay pagos importados. Ejecuta la carga desde 'Administrador'.")
+        return
+
+    en_mora = df[df["vencido"] > 0]
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Cartera vencida", dinero(df["vencido"].sum()))
+    c2.metric("Más de 90 días", dinero(df["d90_mas"].sum()))
+    c3.metric("Casas en mora", f"{len(en_mora)} de {len(df)}")
+    c4.metric("Saldo neto", dinero(df["saldo"].sum()))
+
+    if condominio is None and len(conds) > 1:
+        st.divider()
+        st.subheader("Por condominio")
+        st.dataframe(_tabla(cartera_por_condominio(corte)), use_container_width=True)
+
+    st.divider()
+    st.subheader("Por casa")
+    solo_mora = st.checkbox("Sólo casas con valores vencidos", value=True, key="cartera_solo_mora")
+    vista = (en_mora if solo_mora else df).sort_values(VENCIDOS[::-1], ascending=False)
+    st.dataframe(
+        _tabla(vista[["casa", "condominio", "propietario", "saldo", "vencido"] + TRAMOS]),
+        use_container_width=True
+    )
+
+    casa = st.selectbox("Saldo corrido de la casa", vista["casa"].tolist(), key="cartera_casa")
+    if casa:
+        mov = movimientos_casa(casa)
+        st.dataframe(
+            en_dolares(mov, ["cargo", "abono", "cargo_acum", "abono_acum", "saldo"]),
+            use_container_width=True
+        )
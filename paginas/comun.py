@@ -0,0 +1,129 @@
+import pandas as pd
+import streamlit as st
+
+from agregados import en_dolares
+from db import PAGINA_TAMANO, buscar_propietarios, casas_en_pagos, contar_pagos, pagina_pagos, rango_fechas_pagos
+from rendimiento import tramo
+from unidades import LIMITE_BUSQUEDA, buscar_unidades, condominios
+
+
+# ------------------ Tablas paginadas ------------------
+def tabla_paginada(clave: str, casa: str, propietario: str, desde, hasta):
+    """
+    Muestra pagos página a página (keyset). En session_state se guarda la
+    pila de cursores de las páginas visitadas; cambia de filtro -> página 1.
+    """
+    filtro = (casa, propietario, str(desde), str(hasta))
+    estado = st.session_state.setdefault(clave, {"filtro": None, "cursores": [None], "tamano": PAGINA_TAMANO})
+
+    col_t, col_p = st.columns([1, 3])
+    with col_t:
+        opciones = [25, 50, 100, 200]
+        tamano = st.selectbox(
+            "Filas por página", opciones,
+            index=opciones.index(estado["tamano"]) if estado["tamano"] in opciones else 1,
+            key=f"{clave}_tamano"
+        )
+    if estado["filtro"] != filtro or estado["tamano"] != tamano:
+        estado.update(filtro=filtro, cursores=[None], tamano=tamano)
+
+    total = contar_pagos(casa, propietario, desde, hasta)
+    paginas = max(1, -(-total // tamano))
+    actual = len(estado["cursores"])
+
+    with tramo(f"db: página {clave}"):
+        pagina, siguiente = pagina_pagos(casa, propietario, desde, hasta, estado["cursores"][-1], tamano)
+
+    with col_p:
+        st.caption(f"Página {actual} de {paginas} · {total:,} registros")
+        b1, b2, b3 = st.columns(3)
+        if b1.button("⏮️ Primera", key=f"{clave}_primera", disabled=actual == 1):
+            estado["cursores"] = [None]
+            st.rerun()
+        if b2.button("◀️ Anterior", key=f"{clave}_anterior", disabled=actual == 1):
+            estado["cursores"].pop()
+            st.rerun()
+        if b3.button("Siguiente ▶️", key=f"{clave}_siguiente", disabled=siguiente is None):
+            estado["cursores"].append(siguiente)
+            st.rerun()
+
+    with tramo(f"tabla: {clave}"):
+        st.dataframe(en_dolares(pagina), use_container_width=True)
+
+
+# ------------------ Selector de unidad ------------------
+def selector_unidad(etiqueta: str, clave: str, contenedor=st, con_todas: bool = False):
+    """
+    Búsqueda por prefijo sobre el catálogo de unidades: el selectbox sólo
+    recibe hasta LIMITE_BUSQUEDA códigos, no la lista completa.
+    """
+    conds = condominios()
+    condominio = None
+    if len(conds) > 1:
+        elegido = contenedor.selectbox(
+            "Condominio", ["Todos"] + conds, key=f"{clave}_condominio",
+            format_func=lambda c: c or "(sin condominio)"
+        )
+        condominio = None if elegido == "Todos" else elegido
+
+    texto = contenedor.text_input(f"Buscar {etiqueta.lower()} (código)", value="", key=f"{clave}_buscar")
+    opciones = buscar_unidades(texto, condominio)
+    if len(opciones) == LIMITE_BUSQUEDA:
+        contenedor.caption(f"Mostrando las primeras {LIMITE_BUSQUEDA}; escribe más para acotar.")
+    if con_todas:
+        opciones = ["Todas"] + opciones
+    return contenedor.selectbox(etiqueta, opciones, key=f"{clave}_sel")
+
+
+# ------------------ Búsqueda global de propietarios ------------------
+def buscador_propietarios():
+    """
+    Caja del sidebar: busca fichas por nombre, cédula, teléfono, email o
+    casa en el índice FTS5. Sólo consulta cuando hay texto.
+    """
+    texto = st.sidebar.text_input("🔎 Buscar propietario", value="", key="buscar_propietario")
+    if not texto.strip():
+        return
+    with tramo("db: buscar propietarios"):
+        res = buscar_propietarios(texto)
+    if res.empty:
+        st.sidebar.caption("Sin coincidencias.")
+    else:
+        st.sidebar.dataframe(res, use_container_width=True, hide_index=True)
+
+
+# ------------------ Filtros de pagos (sidebar) ------------------
+def filtros_pagos():
+    """
+    Dibuja los filtros de pagos en el sidebar (sólo las páginas que los
+    usan). Devuelve dict con casa, propietario, desde, hasta, min_fecha y
+    max_fecha, o None si pagos está vacía. No carga filas: cada página
+    decide qué leer (conteo, página, resumen o frame filtrado).
+    """
+    with tramo("db: casas"):
+        casas_pagos = casas_en_pagos()
+
+    st.sidebar.divider()
+    st.sidebar.subheader("🎛️ Filtros (Pagos)")
+
+    if not casas_pagos:
+        st.sidebar.info("No hay datos. Ejecuta la carga desde 'Administrador'.")
+        return None
+
+    casa = selector_unidad("Casa", "filtro_casa", st.sidebar, con_todas=True)
+    propietario = st.sidebar.text_input(
+        "Propietario (palabras o inicio, sin tildes)", value="", key="filtro_propietario"
+    )
+
+    with tramo("db: rango fechas"):
+        min_fecha, max_fecha = rango_fechas_pagos()
+    col1, col2 = st.sidebar.columns(2)
+    with col1:
+        desde = st.date_input("Desde", value=min_fecha.date() if pd.notna(min_fecha) else None, key="filtro_desde")
+    with col2:
+        hasta = st.date_input("Hasta", value=max_fecha.date() if pd.notna(max_fecha) else None, key="filtro_hasta")
+
+    return {
+        "casa": casa, "propietario": propietario, "desde": desde, "hasta": hasta,
+        "min_fecha": min_fecha, "max_fecha": max_fecha,
+    }
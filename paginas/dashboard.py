@@ -0,0 +1,61 @@
+import streamlit as st
+
+from agregados import COLS_DASHBOARD, dashboard_desde_pagos, dashboard_desde_resumen, dinero
+from db import cargar_df_pagos_filtrado, contar_pagos
+from graficos import spec_barras_casas, spec_tendencia
+from paginas.comun import filtros_pagos, tabla_paginada
+from rendimiento import tramo
+from resumen import cargar_resumen, resumen_aplicable
+
+
+def _kpis(f: dict) -> dict:
+    # Con filtros a nivel de mes, los KPIs salen del resumen casa × mes;
+    # sólo si no aplica se leen las filas filtradas de pagos
+    with tramo("agregación: dashboard"):
+        if resumen_aplicable(f["propietario"], f["desde"], f["hasta"], f["min_fecha"], f["max_fecha"]):
+            res = cargar_resumen(f["casa"], f["desde"], f["hasta"])
+            if not res.empty:
+                return dashboard_desde_resumen(res)
+        with tramo("filtro: pagos"):
+            df_f = cargar_df_pagos_filtrado(
+                f["casa"], f["propietario"], f["desde"], f["hasta"], columnas=COLS_DASHBOARD
+            )
+        return dashboard_desde_pagos(df_f)
+
+
+def mostrar():
+    f = filtros_pagos()
+    st.subheader("📊 Dashboard por Casa (Pagado Σ vs Saldo último período)")
+
+    if f is None or contar_pagos(f["casa"], f["propietario"], f["desde"], f["hasta"]) == 0:
+        st.info("No hay datos para mostrar con los filtros seleccionados.")
+        return
+
+    kpis = _kpis(f)
+
+    last_period = kpis["last_period"]
+    st.caption(f"Último período detectado (según filtros): **{last_period if last_period else 'N/D'}**")
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Monto Pagado (Σ)", dinero(kpis["total_pagado"]))
+    c2.metric("Saldo último período (Σ negativos)", dinero(kpis["total_saldo_neg"]))
+    c3.metric("Saldo último período (Σ positivos)", dinero(kpis["total_saldo_pos"]))
+    c4.metric("Registros (filtrados)", f"{kpis['registros']}")
+
+    st.divider()
+
+    # Specs ya agregados y acotados (graficos.py), cacheados por filtro
+    with tramo("gráfico: casas"):
+        st.vega_lite_chart(spec_barras_casas(f, kpis["agg"]), use_container_width=True)
+
+    st.subheader("📈 Tendencia mensual (Pagado vs A pagar)")
+    with tramo("gráfico: tendencia"):
+        spec = spec_tendencia(f)
+    if spec is None:
+        st.info("No hay pagos con fecha en el rango seleccionado.")
+    else:
+        st.vega_lite_chart(spec, use_container_width=True)
+
+    st.divider()
+    st.subheader("📄 Detalle (tabla filtrada)")
+    tabla_paginada("detalle", f["casa"], f["propietario"], f["desde"], f["hasta"])
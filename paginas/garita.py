@@ -0,0 +1,28 @@
+import time
+
+import streamlit as st
+
+from placas import buscar_placa
+from rendimiento import tramo
+
+
+def mostrar():
+    st.subheader("🚗 Garita: consulta de placa")
+
+    placa = st.text_input("Placa", value="", placeholder="AAA1234")
+    if placa:
+        with tramo("garita: placa"):
+            t0 = time.perf_counter()
+            info = buscar_placa(placa)
+            dt_ms = (time.perf_counter() - t0) * 1000
+
+        if info is None:
+            st.error(f"❌ {placa.strip().upper()} no está registrada.")
+        else:
+            st.success(f"✅ {info['placa']} → Casa **{info['casa']}**")
+            c1, c2, c3 = st.columns(3)
+            c1.metric("Propietario", info["nombre"] or "N/D")
+            c2.metric("Celular", info["celular"] or "N/D")
+            c3.metric("Arrendatario", "Sí" if info["tiene_arrendatario"] else "No")
+            st.caption(f"Registrada desde {info['valido_desde']}")
+        st.caption(f"Consulta: {dt_ms:.2f} ms")
@@ -0,0 +1,48 @@
+import os
+
+import streamlit as st
+
+from db import contar_pagos
+from exportar import exportar_pagos, formatos_disponibles
+from paginas.comun import filtros_pagos, tabla_paginada
+from rendimiento import tramo
+
+
+def mostrar():
+    f = filtros_pagos()
+    st.subheader("📚 Histórico (filtrado)")
+
+    total = contar_pagos(f["casa"], f["propietario"], f["desde"], f["hasta"]) if f else 0
+    if total == 0:
+        st.info("No hay datos para los filtros seleccionados.")
+        return
+
+    casa_sel, prop_filter, f_ini, f_fin = f["casa"], f["propietario"], f["desde"], f["hasta"]
+    st.caption(f"Registros filtrados: {total}")
+    tabla_paginada("historico", casa_sel, prop_filter, f_ini, f_fin)
+
+    # Exportación bajo demanda: nada se genera hasta que se pide
+    st.divider()
+    col_f, col_b = st.columns([1, 3])
+    with col_f:
+        formato = st.radio("Formato", formatos_disponibles(), horizontal=True, key="export_formato")
+    filtro = (casa_sel, prop_filter, str(f_ini), str(f_fin), formato)
+    export = st.session_state.get("export")
+
+    with col_b:
+        if st.button("📦 Preparar descarga (filtrado)"):
+            if export and os.path.exists(export["path"]):
+                os.remove(export["path"])
+            with tramo("export: generar"):
+                path, mime, n = exportar_pagos(formato, casa_sel, prop_filter, f_ini, f_fin)
+            export = {"filtro": filtro, "path": path, "mime": mime, "filas": n}
+            st.session_state.export = export
+
+        if export and export["filtro"] == filtro and os.path.exists(export["path"]):
+            with open(export["path"], "rb") as fh:
+                st.download_button(
+                    f"⬇️ Descargar {formato.upper()} ({export['filas']:,} filas)",
+                    data=fh,
+                    file_name=f"historico_filtrado.{formato}",
+                    mime=export["mime"]
+                )
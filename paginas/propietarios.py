@@ -0,0 +1,211 @@
+import os
+import sqlite3
+
+import pandas as pd
+import streamlit as st
+
+from db import ConflictoEdicion, cambios_ficha, get_propietario, guardar_propietario
+from fotos import guardar_foto, liberar_foto, miniatura
+from paginas.comun import selector_unidad
+from placas import PlacasOcupadas, asignar_placas, parse_placas, placas_en_otra_casa, validate_placas
+
+
+# Ver (todos) y editar (sólo ADMINISTRADOR) la ficha de una casa.
+# Sólo lee propietarios, unidades y placas: nunca la tabla pagos.
+def _placas_de(ficha: dict) -> list:
+    return [ficha.get(f"placa{i}") for i in range(1, 7) if ficha.get(f"placa{i}")]
+
+
+def _guardar(casa: str, original: dict, cambios: dict, placas) -> bool:
+    """
+    Guarda sobre `original` sólo `cambios` (y las placas vigentes si
+    placas no es None). Si otro usuario guardó entre medio deja el conflicto
+    en session_state; si la base sigue ocupada tras los reintentos o una
+    placa quedó tomada por otra casa entre medio, avisa.
+    Devuelve True si quedó guardado.
+    """
+    extra = None if placas is None else (lambda conn: asignar_placas(conn, casa, placas))
+    try:
+        guardar_propietario(original, dict(original, **cambios), extra=extra)
+    except ConflictoEdicion as e:
+        st.session_state[f"prop_conflicto_{casa}"] = {
+            "diferencias": e.diferencias, "actual": e.actual, "cambios": cambios, "placas": placas,
+        }
+        return False
+    except PlacasOcupadas as e:
+        st.error(str(e))
+        return False
+    except sqlite3.OperationalError as e:
+        st.error(f"No se pudo guardar: la base de datos está ocupada ({e}). Intenta de nuevo.")
+        return False
+    # La foto reemplazada se borra si ninguna otra casa la usa
+    if "foto_path" in cambios:
+        liberar_foto(original.get("foto_path"))
+    return True
+
+
+def mostrar():
+    st.subheader("🏠 Propietarios por Casa")
+
+    casa = selector_unidad("Casa", "prop_casa")
+    if not casa:
+        st.info("No hay unidades que coincidan con la búsqueda.")
+        return
+
+    # Solo admin puede editar
+    is_admin = (st.session_state.rol == "ADMINISTRADOR")
+
+    # Al editar, la ficha tal como se leyó al abrirla: guardar compara
+    # contra ella (bloqueo optimista) y sólo escribe lo que cambió
+    clave_original = f"prop_original_{casa}"
+    clave_conflicto = f"prop_conflicto_{casa}"
+    if not is_admin:
+        data = get_propietario(casa)
+    else:
+        if clave_original not in st.session_state:
+            st.session_state[clave_original] = get_propietario(casa)
+        data = st.session_state[clave_original]
+
+    # Mostrar foto actual si existe
+    foto_path = data.get("foto_path") or ""
+    if foto_path and os.path.exists(foto_path):
+        st.image(miniatura(foto_path), caption=f"Foto actual {casa}", width=220)
+    elif foto_path:
+        st.info(f"Foto registrada pero no encontrada en disco: {foto_path}")
+
+    st.divider()
+
+    if not is_admin:
+        st.info("Solo un ADMINISTRADOR puede editar. Aquí puedes visualizar la información.")
+        st.json({k: v for k, v in data.items() if k not in ["id"]})
+        return
+
+    st.subheader("📝 Formulario de registro / edición")
+
+    conflicto = st.session_state.get(clave_conflicto)
+    if conflicto:
+        st.error("Otro usuario guardó esta ficha mientras la editabas. Campos en conflicto:")
+        st.dataframe(
+            pd.DataFrame(conflicto["diferencias"]).rename(columns={
+                "campo": "Campo", "leido": "Al abrir", "actual": "Guardado por otro", "tuyo": "Tu cambio",
+            }).astype(str),
+            use_container_width=True, hide_index=True
+        )
+        c1, c2 = st.columns(2)
+        if c1.button("🔄 Descartar mis cambios y recargar"):
+            liberar_foto(conflicto["cambios"].get("foto_path"))
+            st.session_state.pop(clave_original, None)
+            st.session_state.pop(clave_conflicto, None)
+            st.rerun()
+        if c2.button("⚠️ Guardar mis cambios igualmente"):
+            # Sobre la ficha vigente, sólo lo que este usuario cambió: lo
+            # demás que guardó el otro (placas incluidas) se conserva
+            st.session_state.pop(clave_conflicto, None)
+            if _guardar(casa, conflicto["actual"], conflicto["cambios"], conflicto["placas"]):
+                st.session_state.pop(clave_original, None)
+                st.success(f"✅ Propietario de {casa} guardado con tus cambios.")
+                st.rerun()
+            if clave_conflicto in st.session_state:
+                # Un tercero volvió a guardar: se muestra el conflicto nuevo
+                st.rerun()
+            st.session_state[clave_conflicto] = conflicto
+    elif st.button("🔄 Recargar ficha"):
+        st.session_state.pop(clave_original, None)
+        st.rerun()
+
+    with st.form(f"form_prop_{casa}", clear_on_submit=False):
+        colA, colB = st.columns(2)
+
+        with colA:
+            nombre = st.text_input("Nombre", value=data.get("nombre") or "")
+            cedula = st.text_input("Cédula", value=data.get("cedula") or "")
+            telefono_fijo = st.text_input("Teléfono fijo", value=data.get("telefono_fijo") or "")
+            celular = st.text_input("Celular", value=data.get("celular") or "")
+            email = st.text_input("Mail", value=data.get("email") or "")
+
+        with colB:
+            area = st.number_input("Área", min_value=0.0, value=float(data.get("area") or 0.0))
+            alicuota = st.number_input("% Alícuota", min_value=0.0, value=float(data.get("alicuota_pct") or 0.0))
+            no_autos = st.number_input("No. Autos", min_value=0, value=int(data.get("no_autos") or 0), step=1)
+
+            tiene_arrendatario = st.radio(
+                "¿Tiene arrendatario?",
+                options=["No", "Sí"],
+                index=1 if int(data.get("tiene_arrendatario") or 0) == 1 else 0,
+                horizontal=True
+            )
+
+            asistente_hogar = st.radio(
+                "¿Asistente de hogar?",
+                options=["No", "Sí"],
+                index=1 if int(data.get("asistente_hogar") or 0) == 1 else 0,
+                horizontal=True
+            )
+
+            asistente_nombre = ""
+            if asistente_hogar == "Sí":
+                asistente_nombre = st.text_input("Nombre asistente", value=data.get("asistente_nombre") or "")
+
+        st.divider()
+
+        uploaded = st.file_uploader("Foto (opcional)", type=["png", "jpg", "jpeg", "webp"])
+
+        # placas: mostramos las existentes como texto plano editable
+        placas_exist = _placas_de(data)
+        placas_text = st.text_area(
+            "Placas (hasta 6). Formato AAA1234. Sepáralas por coma, espacio o línea.",
+            value=" ".join(placas_exist),
+            height=90
+        )
+
+        guardar = st.form_submit_button("💾 Guardar cambios")
+
+    if guardar:
+        placas = parse_placas(placas_text)
+        bad = validate_placas(placas)
+
+        if bad:
+            st.error(f"Placas inválidas (deben ser AAA1234): {', '.join(bad)}")
+            return
+
+        ocupadas = placas_en_otra_casa(placas, casa)
+        if ocupadas:
+            st.error("Placas ya registradas en otra casa: " + ", ".join(f"{p} ({c})" for p, c in ocupadas.items()))
+            return
+
+        # Foto: si subieron una nueva, la guardamos (misma imagen = mismo archivo)
+        new_foto_path = data.get("foto_path")
+        if uploaded is not None:
+            new_foto_path = guardar_foto(uploaded.getbuffer(), uploaded.name)
+
+        # Asignar placas a columnas, sólo si el usuario las tocó: si no,
+        # se conservan las que haya guardado otro mientras tanto
+        placas_tocadas = placas != placas_exist
+        placas_cols = {f"placa{i+1}": (placas[i] if i < len(placas) else None) for i in range(6)} if placas_tocadas else {}
+
+        payload = {
+            "casa": casa,
+            "foto_path": new_foto_path,
+            "nombre": nombre.strip() or None,
+            "cedula": cedula.strip() or None,
+            "telefono_fijo": telefono_fijo.strip() or None,
+            "celular": celular.strip() or None,
+            "area": float(area),
+            "alicuota_pct": float(alicuota),
+            "email": email.strip() or None,
+            "tiene_arrendatario": 1 if tiene_arrendatario == "Sí" else 0,
+            "no_autos": int(no_autos),
+            "asistente_hogar": 1 if asistente_hogar == "Sí" else 0,
+            "asistente_nombre": (asistente_nombre.strip() or None) if asistente_hogar == "Sí" else None,
+            **placas_cols,
+        }
+
+        # Sólo lo que el usuario cambió respecto de la ficha leída (un
+        # NULL mostrado como "" o 0.0 en el formulario no es un cambio)
+        cambios = cambios_ficha(data, payload)
+        if _guardar(casa, data, cambios, placas if placas_tocadas else None):
+            st.session_state.pop(clave_original, None)
+            st.success(f"✅ Propietario de {casa} guardado correctamente.")
+            st.rerun()
+        if clave_conflicto in st.session_state:
+            st.rerun()
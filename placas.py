@@ -0,0 +1,150 @@
+import re
+import sqlite3
+from datetime import datetime
+
+from db import conexion
+
+# Placas de vehículos por casa, con vigencia. Una placa tiene a lo sumo una
+# asignación vigente (valido_hasta IS NULL), garantizado por índice único
+# parcial; la consulta de garita es un lookup en ese índice.
+# Las columnas placa1..placa6 de propietarios se mantienen para el formulario.
+# La tabla y sus índices los crea migraciones.py.
+
+PLATE_RE = re.compile(r"^[A-Z]{3}\d{4}$")
+MAX_PLACAS = 6
+
+
+def _ahora() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+# ------------------ Validación ------------------
+def parse_placas(text: str):
+    """
+    Acepta placas separadas por coma, espacio o salto de línea.
+    Devuelve lista única, en mayúsculas, máximo 6.
+    """
+    if not text:
+        return []
+    raw = re.split(r"[,\s]+", text.strip().upper())
+    raw = [x for x in raw if x]
+    # únicas preservando orden
+    seen = set()
+    out = []
+    for p in raw:
+        if p not in seen:
+            out.append(p)
+            seen.add(p)
+    return out[:MAX_PLACAS]
+
+
+def validate_placas(placas):
+    bad = [p for p in placas if not PLATE_RE.match(p)]
+    return bad
+
+
+# ------------------ Migración ------------------
+def migrar_desde_propietarios(conn: sqlite3.Connection) -> int:
+    """
+    Copia placa1..placa6 de propietarios a placas (vigentes desde hoy).
+    Si una placa aparece en dos casas queda la primera (por casa).
+    """
+    columnas = " UNION ALL ".join(
+        f"SELECT casa, UPPER(TRIM(placa{i})) AS placa FROM propietarios "
+        f"WHERE placa{i} IS NOT NULL AND TRIM(placa{i}) <> ''"
+        for i in range(1, MAX_PLACAS + 1)
+    )
+    antes = conn.total_changes
+    conn.execute(f"""
+        INSERT OR IGNORE INTO placas (placa, casa, valido_desde)
+        SELECT placa, casa, ? FROM ({columnas}) ORDER BY casa
+    """, (_ahora(),))
+    return conn.total_changes - antes
+
+
+# ------------------ Escritura ------------------
+class PlacasOcupadas(Exception):
+    """
+    Alguna placa está vigente en otra casa. `ocupadas` es {placa: casa}.
+    """
+
+    def __init__(self, ocupadas: dict):
+        super().__init__("Placas ya registradas en otra casa: " + ", ".join(f"{p} ({c})" for p, c in ocupadas.items()))
+        self.ocupadas = ocupadas
+
+
+def _en_otra_casa(conn: sqlite3.Connection, placas, casa: str) -> dict:
+    marcas = ",".join(["?"] * len(placas))
+    rows = conn.execute(
+        f"SELECT placa, casa FROM placas WHERE valido_hasta IS NULL AND placa IN ({marcas}) AND casa <> ?",
+        list(placas) + [casa]
+    ).fetchall()
+    return dict(rows)
+
+
+def placas_en_otra_casa(placas, casa: str) -> dict:
+    """
+    {placa: casa} de las placas vigentes asignadas a otra casa. Sirve para
+    avisar antes de guardar; la verificación que vale es la de asignar_placas().
+    """
+    if not placas:
+        return {}
+    with conexion() as conn:
+        return _en_otra_casa(conn, placas, casa)
+
+
+def asignar_placas(conn: sqlite3.Connection, casa: str, placas):
+    """
+    Deja vigentes exactamente `placas` para la casa: cierra las que ya no
+    están y abre las nuevas. Llamar dentro de la transacción de escritura:
+    si alguna placa está vigente en otra casa lanza PlacasOcupadas sin
+    tocar nada (la verificación y la escritura van bajo el mismo lock).
+    """
+    placas = list(placas)
+    if placas:
+        ocupadas = _en_otra_casa(conn, placas, casa)
+        if ocupadas:
+            raise PlacasOcupadas(ocupadas)
+
+    ahora = _ahora()
+    fuera = f"AND placa NOT IN ({','.join(['?'] * len(placas))})" if placas else ""
+    conn.execute(f"""
+        UPDATE placas SET valido_hasta = ?
+        WHERE casa = ? AND valido_hasta IS NULL {fuera}
+    """, [ahora, casa] + placas)
+    conn.executemany("""
+        INSERT INTO placas (placa, casa, valido_desde)
+        SELECT ?, ?, ?
+        WHERE NOT EXISTS (
+            SELECT 1 FROM placas WHERE placa = ? AND casa = ? AND valido_hasta IS NULL
+        )
+    """, [(p, casa, ahora, p, casa) for p in placas])
+
+
+# ------------------ Lectura (garita) ------------------
+def buscar_placa(placa: str) -> dict:
+    """
+    Casa y propietario de una placa vigente, o None. Un salto en
+    idx_placas_vigente más uno en la PK de propietarios.
+    """
+    placa = (placa or "").strip().upper().replace("-", "").replace(" ", "")
+    if not placa:
+        return None
+    with conexion() as conn:
+        row = conn.execute("""
+            SELECT p.placa, p.casa, p.valido_desde, pr.nombre, pr.celular, pr.tiene_arrendatario
+            FROM placas p
+            LEFT JOIN propietarios pr ON pr.casa = p.casa
+            WHERE p.placa = ? AND p.valido_hasta IS NULL
+        """, (placa,)).fetchone()
+    if row is None:
+        return None
+    return dict(zip(["placa", "casa", "valido_desde", "nombre", "celular", "tiene_arrendatario"], row))
+
+
+def placas_de_casa(casa: str) -> list:
+    with conexion() as conn:
+        rows = conn.execute(
+            "SELECT placa FROM placas WHERE casa = ? AND valido_hasta IS NULL ORDER BY id", (casa,)
+        ).fetchall()
+    return [r[0] for r in rows]
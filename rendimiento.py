@@ -0,0 +1,173 @@
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
+import pandas as pd
+
+# Instrumentación liviana: tramos con nombre (tramo("db: sql")) y tiempo de
+# cada sentencia SQL. Todo va a un log rotativo y a muestras en memoria
+# (por proceso) que lee el panel "Rendimiento" del Administrador.
+# Apagada por defecto (cada tramo cuesta un if): CONDOMINIO_PERF=1 o el
+# panel la encienden. Encendida, la traza SQL corre por cada sentencia,
+# incluida cada fila de un executemany: las repeticiones seguidas de la
+# misma sentencia se juntan en una sola muestra y una sola línea de log.
+
+LOG_PATH = os.environ.get("CONDOMINIO_PERF_LOG", "rendimiento.log")
+LOG_MAX_BYTES = 1_000_000
+LOG_BACKUPS = 3
+
+# Muestras que se guardan por etapa / sentencia (las más recientes)
+MAX_MUESTRAS = 500
+MAX_SENTENCIAS = 200
+
+_activo = os.environ.get("CONDOMINIO_PERF", "0") == "1"
+
+_tramos = {}
+_sql = {}
+_lock = threading.Lock()
+_local = threading.local()
+_log = None
+
+
+def activo() -> bool:
+    return _activo
+
+
+def activar(valor: bool = True):
+    global _activo
+    _activo = bool(valor)
+
+
+def _logger() -> logging.Logger:
+    global _log
+    if _log is None:
+        log = logging.getLogger("condominio.rendimiento")
+        if not log.handlers:
+            handler = RotatingFileHandler(LOG_PATH, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s\t%(message)s"))
+            log.addHandler(handler)
+        log.setLevel(logging.INFO)
+        log.propagate = False
+        _log = log
+    return _log
+
+
+def _registrar(destino: dict, nombre: str, segundos: float, limite: int = None):
+    with _lock:
+        muestras = destino.get(nombre)
+        if muestras is None:
+            if limite is not None and len(destino) >= limite:
+                return
+            muestras = destino[nombre] = deque(maxlen=MAX_MUESTRAS)
+        muestras.append(segundos)
+
+
+# ------------------ Tramos ------------------
+@contextmanager
+def tramo(nombre: str):
+    """
+    Mide el bloque y lo registra bajo `nombre` (p. ej. "db: sql").
+    """
+    if not _activo:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        dt = time.perf_counter() - t0
+        _registrar(_tramos, nombre, dt)
+        _logger().info("tramo\t%s\t%.3f", nombre, dt * 1000)
+
+
+# ------------------ SQL ------------------
+# set_trace_callback avisa cuando una sentencia empieza, no cuando termina:
+# la duración se toma hasta la siguiente sentencia de la misma conexión o
+# hasta que la conexión vuelve al pool (incluye el fetch desde Python).
+_ESPACIOS = re.compile(r"\s+")
+# La traza trae los parámetros ya expandidos: se vuelven "?" para agrupar
+_LITERALES = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def _cerrar_sentencia():
+    pendiente = getattr(_local, "sentencia", None)
+    if pendiente is None:
+        return
+    _local.sentencia = None
+    sql, t0, veces = pendiente
+    dt = time.perf_counter() - t0
+    _registrar(_sql, sql, dt, limite=MAX_SENTENCIAS)
+    _logger().info("sql\t%s\t%.3f\tx%d", sql, dt * 1000, veces)
+
+
+def _traza(sql: str):
+    texto = _ESPACIOS.sub(" ", _LITERALES.sub("?", sql)).strip()[:200]
+    pendiente = getattr(_local, "sentencia", None)
+    if pendiente is not None and pendiente[0] == texto:
+        # Misma sentencia otra vez (p. ej. cada fila de un executemany):
+        # se suma a la muestra abierta
+        pendiente[2] += 1
+        return
+    _cerrar_sentencia()
+    _local.sentencia = [texto, time.perf_counter(), 1]
+
+
+def trazar_conexion(conn) -> bool:
+    """
+    Activa la traza SQL en una conexión prestada si la instrumentación
+    está activa. Devuelve si quedó trazada.
+    """
+    if not _activo:
+        return False
+    conn.set_trace_callback(_traza)
+    return True
+
+
+def soltar_conexion(conn):
+    """
+    Cierra la última sentencia y quita la traza antes de devolver la conexión.
+    """
+    conn.set_trace_callback(None)
+    _cerrar_sentencia()
+
+
+# ------------------ Lectura (panel) ------------------
+def _percentiles(destino: dict, columna: str) -> pd.DataFrame:
+    with _lock:
+        datos = {k: list(v) for k, v in destino.items()}
+    filas = []
+    for nombre, muestras in datos.items():
+        s = pd.Series(muestras) * 1000
+        filas.append({
+            columna: nombre,
+            "n": len(s),
+            "p50_ms": round(s.quantile(0.50), 2),
+            "p95_ms": round(s.quantile(0.95), 2),
+            "max_ms": round(s.max(), 2),
+            "total_ms": round(s.sum(), 2),
+        })
+    if not filas:
+        return pd.DataFrame(columns=[columna, "n", "p50_ms", "p95_ms", "max_ms", "total_ms"])
+    return pd.DataFrame(filas).sort_values("total_ms", ascending=False, ignore_index=True)
+
+
+def estadisticas() -> pd.DataFrame:
+    """
+    p50 / p95 / máx por etapa sobre las últimas MAX_MUESTRAS mediciones.
+    """
+    return _percentiles(_tramos, "etapa")
+
+
+def estadisticas_sql(top: int = 20) -> pd.DataFrame:
+    return _percentiles(_sql, "sentencia").head(top)
+
+
+def reiniciar():
+    with _lock:
+        _tramos.clear()
+        _sql.clear()
@@ -0,0 +1,127 @@
+import sqlite3
+
+import pandas as pd
+
+from db import cacheado, conexion
+
+# Resumen materializado: una fila por casa y mes (mes de fecha_pago).
+# importar_datos.py lo mantiene al día recalculando sólo los (casa, mes)
+# tocados; el Dashboard lee esta tabla chica en vez de agrupar pagos.
+# La tabla la crea migraciones.py.
+
+
+def crear_pendientes(conn: sqlite3.Connection):
+    """
+    Tabla temporal con los (casa, mes) a recalcular en esta transacción.
+    """
+    conn.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS _resumen_pendiente (
+            casa TEXT NOT NULL,
+            mes TEXT NOT NULL,
+            PRIMARY KEY (casa, mes)
+        )
+    """)
+
+
+_SELECT_RESUMEN = """
+    SELECT
+        p.casa,
+        substr(p.fecha_pago, 1, 7) AS mes,
+        SUM(p.monto_pagado),
+        SUM(p.monto_a_pagar),
+        SUM(p.provision),
+        SUM(p.decimos),
+        SUM(p.sueldo),
+        COUNT(*),
+        MAX(p.fecha_pago),
+        -- con un único MAX(), SQLite toma las columnas "sueltas" de esa fila
+        p.saldo_pagar
+    FROM pagos p
+"""
+
+
+def actualizar_resumen(conn: sqlite3.Connection, completo: bool = False):
+    """
+    Recalcula el resumen: todo (completo=True) o sólo los (casa, mes)
+    de _resumen_pendiente (importar_datos.py los marca desde el stage).
+    Debe correr en la misma transacción
+    que la escritura en pagos.
+    """
+    cols = (
+        "casa, mes, total_pagado, monto_a_pagar, provision, decimos, sueldo, "
+        "registros, fecha_ultimo_pago, saldo_ultimo"
+    )
+
+    if completo:
+        conn.execute("DELETE FROM resumen_casa_mes")
+        conn.execute(f"""
+            INSERT INTO resumen_casa_mes ({cols})
+            {_SELECT_RESUMEN}
+            WHERE p.fecha_pago IS NOT NULL
+            GROUP BY p.casa, mes
+        """)
+        conn.execute("DROP TABLE IF EXISTS temp._resumen_pendiente")
+        return
+
+    crear_pendientes(conn)
+    conn.execute("""
+        DELETE FROM resumen_casa_mes
+        WHERE (casa, mes) IN (SELECT casa, mes FROM _resumen_pendiente)
+    """)
+    # Rango de fechas del mes sobre idx_pagos_casa_fecha
+    conn.execute(f"""
+        INSERT INTO resumen_casa_mes ({cols})
+        {_SELECT_RESUMEN}
+        JOIN _resumen_pendiente k
+          ON p.casa = k.casa
+         AND p.fecha_pago >= k.mes || '-01'
+         AND p.fecha_pago < k.mes || '-32'
+        GROUP BY p.casa, mes
+    """)
+    conn.execute("DELETE FROM _resumen_pendiente")
+
+
+# ------------------ Lectura (Dashboard) ------------------
+def resumen_aplicable(prop_filter: str, f_ini, f_fin, min_fecha, max_fecha) -> bool:
+    """
+    El resumen es por mes y no conoce al propietario: sirve cuando no hay
+    filtro de propietario y el rango de fechas cubre meses completos
+    (o se sale de los datos por ese lado).
+    """
+    if (prop_filter or "").strip():
+        return False
+    if not (f_ini and f_fin):
+        return False
+    ini = pd.Timestamp(f_ini)
+    fin = pd.Timestamp(f_fin)
+    ini_ok = ini.day == 1 or (pd.notna(min_fecha) and ini <= min_fecha)
+    fin_ok = fin.is_month_end or (pd.notna(max_fecha) and fin >= max_fecha)
+    return ini_ok and fin_ok
+
+
+def cargar_resumen(casa: str = None, f_ini=None, f_fin=None) -> pd.DataFrame:
+    """
+    Filas de resumen_casa_mes para el filtro (meses entre f_ini y f_fin).
+    Cacheado por generación de pagos; el frame devuelto es compartido.
+    """
+    conds = []
+    params = []
+    if casa and casa != "Todas":
+        conds.append("casa = ?")
+        params.append(casa)
+    if f_ini and f_fin:
+        conds.append("mes BETWEEN ? AND ?")
+        params.extend([pd.Timestamp(f_ini).strftime("%Y-%m"), pd.Timestamp(f_fin).strftime("%Y-%m")])
+    where = ("WHERE " + " AND ".join(conds)) if conds else ""
+
+    def _leer(conn):
+        try:
+            df = pd.read_sql_query(f"SELECT * FROM resumen_casa_mes {where}", conn, params=params)
+        except Exception:
+            return pd.DataFrame()
+        df["fecha_ultimo_pago"] = pd.to_datetime(df["fecha_ultimo_pago"], errors="coerce")
+        return df
+
+    with conexion() as conn:
+        return cacheado(conn, ("resumen", where, tuple(params)), _leer)
+
@@ -0,0 +1,147 @@
+import json
+import os
+
+import pandas as pd
+
+from busqueda import consulta_fts, nombres_pagos
+
+# pyarrow es opcional: sin él la app lee pagos con SQL como siempre
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Snapshot columnar de pagos ya normalizado (tipos finales, fechas como
+# datetime): un Parquet junto a la BD, ordenado por casa y fecha para que
+# los filtros por casa/fechas salten row groups completos (estadísticas
+# min/max). Lleva en sus metadatos la versión de la BD (instancia y
+# generación de pagos en meta): si no coincide, se ignora y se usa SQL,
+# así nunca se sirve un snapshot viejo.
+
+# Filas por row group: la granularidad del salto por filtros
+ROW_GROUP = 64_000
+
+_CLAVE_VERSION = b"condominio.version"
+
+
+def disponible() -> bool:
+    return pq is not None
+
+
+def ruta_snapshot(db_path: str) -> str:
+    return f"{os.path.splitext(db_path)[0]}_pagos.parquet"
+
+
+def version_bd(conn) -> list:
+    """
+    [instancia, generación de pagos]. La instancia (aleatoria, de
+    migraciones.py) distingue una BD recreada que vuelve a la generación 1.
+    """
+    try:
+        valores = dict(conn.execute(
+            "SELECT clave, valor FROM meta WHERE clave IN ('instancia', 'pagos')"
+        ).fetchall())
+    except Exception:
+        return [0, 0]
+    return [int(valores.get("instancia") or 0), int(valores.get("pagos") or 0)]
+
+
+def version_snapshot(path: str):
+    if not disponible() or not os.path.exists(path):
+        return None
+    try:
+        meta = pq.read_metadata(path).metadata or {}
+    except Exception:
+        # Archivo truncado o de otro formato: como si no existiera
+        return None
+    valor = meta.get(_CLAVE_VERSION)
+    return json.loads(valor) if valor else None
+
+
+def vigente(conn, path: str) -> bool:
+    return version_snapshot(path) == version_bd(conn)
+
+
+def _esquema(tabla) -> "pa.Schema":
+    """
+    Esquema fijo para todos los row groups, a partir del primer trozo: los
+    índices de las categóricas a int32 (pandas usa int8/int16 según cuántas
+    categorías tenga cada trozo) y las columnas todo-nulas como texto.
+    """
+    campos = []
+    for campo in tabla.schema:
+        tipo = campo.type
+        if pa.types.is_dictionary(tipo):
+            tipo = pa.dictionary(pa.int32(), tipo.value_type)
+        elif pa.types.is_null(tipo):
+            tipo = pa.string()
+        campos.append(pa.field(campo.name, tipo))
+    return pa.schema(campos, metadata=tabla.schema.metadata)
+
+
+def escribir_snapshot(path: str, trozos, version: list) -> int:
+    """
+    Escribe el snapshot desde `trozos`: frames de pagos ya normalizados y
+    ordenados por casa y fecha (p. ej. de un cursor por bloques de
+    ROW_GROUP filas). Cada trozo va a su row group y se suelta: la memoria
+    es la de un trozo, no la de toda la historia. Archivo temporal +
+    os.replace: los lectores ven el anterior o el nuevo completo.
+    Devuelve las filas escritas (0: no escribe nada).
+    """
+    if not disponible():
+        return 0
+    tmp = f"{path}.tmp{os.getpid()}"
+    escritor = None
+    filas = 0
+    try:
+        for df in trozos:
+            if df.empty:
+                continue
+            tabla = pa.Table.from_pandas(df, preserve_index=False)
+            if escritor is None:
+                esquema = _esquema(tabla)
+                meta = dict(esquema.metadata or {})
+                meta[_CLAVE_VERSION] = json.dumps(version).encode()
+                esquema = esquema.with_metadata(meta)
+                escritor = pq.ParquetWriter(tmp, esquema)
+            escritor.write_table(tabla.cast(esquema), row_group_size=ROW_GROUP)
+            filas += len(df)
+    except BaseException:
+        if escritor is not None:
+            escritor.close()
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    if escritor is None:
+        return 0
+    escritor.close()
+    os.replace(tmp, path)
+    return filas
+
+
+def leer_snapshot(conn, path: str, columnas=None, casa=None, propietario="", desde=None, hasta=None):
+    """
+    Filas del snapshot con los mismos filtros que construir_filtro_pagos(),
+    o None si no hay snapshot vigente (el llamador usa SQL).
+    casa, fechas y propietario se empujan al lector Parquet; propietario
+    pasa antes por el índice FTS5 de nombres de la BD.
+    """
+    if not vigente(conn, path):
+        return None
+
+    filtros = []
+    if casa and casa != "Todas":
+        filtros.append(("casa", "=", str(casa).strip().upper()))
+    if desde and hasta:
+        filtros.append(("fecha_pago", ">=", pd.Timestamp(desde)))
+        filtros.append(("fecha_pago", "<=", pd.Timestamp(hasta)))
+    if consulta_fts(propietario):
+        filtros.append(("propietario", "in", pa.array(nombres_pagos(conn, propietario), pa.string())))
+
+    try:
+        tabla = pq.read_table(path, columns=columnas, filters=filtros or None, memory_map=True)
+    except Exception:
+        return None
+    return tabla.to_pandas()
@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+# Los módulos viven en la raíz del repo (sin paquete)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Sin instrumentación en las pruebas (ni log rotativo en el repo)
+os.environ.setdefault("CONDOMINIO_PERF", "0")
+
+import db  # noqa: E402
+
+PAGOS_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pagos_planos_2025.csv")
+
+
+@pytest.fixture
+def bd(tmp_path):
+    """
+    BD vacía en un directorio temporal; el pool y las cachés apuntan a ella.
+    """
+    anterior = db.DB_PATH
+    db.usar_db(str(tmp_path / "condominio.db"))
+    yield db.DB_PATH
+    db.usar_db(anterior)
@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from agregados import SERIES, chart_df, dashboard_desde_pagos, dashboard_desde_resumen
+
+
+# ------------------ Referencia: el cálculo anterior (apply/iterrows) ------------------
+def _agg_anterior(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.assign(casa=df["casa"].astype(str))
+    pagado_by_casa = df.groupby("casa", as_index=False)["monto_pagado"].sum()
+    pagado_by_casa.rename(columns={"monto_pagado": "pagado_sum"}, inplace=True)
+
+    df_last = df.dropna(subset=["fecha_pago"]).sort_values(["casa", "fecha_pago"])
+    idx = df_last.groupby("casa")["fecha_pago"].idxmax()
+    last_rows = df_last.loc[idx, ["casa", "fecha_pago", "saldo_pagar"]].copy()
+    last_rows["saldo_ultimo_neg"] = last_rows["saldo_pagar"].apply(lambda x: x if x < 0 else 0.0)
+    last_rows["saldo_ultimo_pos"] = last_rows["saldo_pagar"].apply(lambda x: x if x > 0 else 0.0)
+
+    agg = pd.merge(
+        pagado_by_casa,
+        last_rows[["casa", "fecha_pago", "saldo_ultimo_neg", "saldo_ultimo_pos"]],
+        on="casa",
+        how="left"
+    )
+    agg["saldo_ultimo_neg"] = agg["saldo_ultimo_neg"].fillna(0.0)
+    agg["saldo_ultimo_pos"] = agg["saldo_ultimo_pos"].fillna(0.0)
+    return agg
+
+
+def _chart_anterior(agg: pd.DataFrame) -> pd.DataFrame:
+    rows = []
+    for _, r in agg.iterrows():
+        for col, categoria in SERIES.items():
+            rows.append({"casa": r["casa"], "categoria": categoria, "valor": float(r[col]) / 100})
+    return pd.DataFrame(rows, columns=["casa", "categoria", "valor"])
+
+
+@pytest.fixture
+def pagos():
+    """
+    Centavos; C02 con empate de fecha máxima, C03 sin fechas, C04 con
+    saldo NaN en la última fila y una categoría sin filas (C99).
+    """
+    casas = ["C01", "C01", "C02", "C02", "C02", "C03", "C04", "C04"]
+    return pd.DataFrame({
+        "casa": pd.Categorical(casas, categories=sorted(set(casas)) + ["C99"]),
+        "fecha_pago": pd.to_datetime([
+            "2025-01-10", "2025-03-05", "2025-02-01", "2025-04-01", "2025-04-01", None, "2025-01-01", "2025-05-01",
+        ]),
+        "monto_pagado": [1000, 2550, 0, 1200, 800, 500, 300, 700],
+        "saldo_pagar": [-500.0, 250.0, -100.0, -300.0, 400.0, -999.0, 100.0, np.nan],
+    })
+
+
+def _comparar_agg(nuevo: pd.DataFrame, anterior: pd.DataFrame):
+    nuevo = nuevo.assign(casa=nuevo["casa"].astype(str)).sort_values("casa", ignore_index=True)
+    anterior = anterior.sort_values("casa", ignore_index=True)
+    pd.testing.assert_frame_equal(nuevo, anterior, check_dtype=False, check_categorical=False)
+
+
+# ------------------ dashboard_desde_pagos ------------------
+def test_pagos_igual_al_anterior(pagos):
+    r = dashboard_desde_pagos(pagos)
+    anterior = _agg_anterior(pagos)
+
+    _comparar_agg(r["agg"], anterior)
+    assert r["total_pagado"] == pagos["monto_pagado"].sum()
+    assert r["total_saldo_neg"] == anterior["saldo_ultimo_neg"].sum()
+    assert r["total_saldo_pos"] == anterior["saldo_ultimo_pos"].sum()
+    assert r["registros"] == len(pagos)
+    assert r["last_period"] == "2025-05"
+
+    pd.testing.assert_frame_equal(
+        r["chart_df"].assign(casa=r["chart_df"]["casa"].astype(str)), _chart_anterior(anterior), check_dtype=False
+    )
+
+
+def test_pagos_saldos_separados(pagos):
+    agg = dashboard_desde_pagos(pagos)["agg"].set_index("casa")
+    # Empate de fecha en C02: la primera fila con la fecha máxima
+    assert (agg.loc["C02", "saldo_ultimo_neg"], agg.loc["C02", "saldo_ultimo_pos"]) == (-300, 0)
+    # Sin fechas o saldo NaN: ceros
+    assert (agg.loc["C03", "saldo_ultimo_neg"], agg.loc["C03", "saldo_ultimo_pos"]) == (0, 0)
+    assert (agg.loc["C04", "saldo_ultimo_neg"], agg.loc["C04", "saldo_ultimo_pos"]) == (0, 0)
+    assert "C99" not in agg.index
+
+
+def test_pagos_vacio(pagos):
+    r = dashboard_desde_pagos(pagos.iloc[0:0])
+    assert r["agg"].empty
+    assert (r["total_pagado"], r["total_saldo_neg"], r["total_saldo_pos"], r["registros"]) == (0, 0, 0, 0)
+    assert r["last_period"] is None
+    assert r["chart_df"].empty
+    assert list(r["chart_df"].columns) == ["casa", "categoria", "valor"]
+
+
+# ------------------ dashboard_desde_resumen ------------------
+def _kpis_resumen_anterior(res: pd.DataFrame):
+    pagado_by_casa = res.groupby("casa", as_index=False)["total_pagado"].sum()
+    pagado_by_casa.rename(columns={"total_pagado": "pagado_sum"}, inplace=True)
+
+    last_rows = res.sort_values(["casa", "mes"]).groupby("casa", as_index=False).last()
+    last_rows = last_rows[["casa", "fecha_ultimo_pago", "saldo_ultimo"]].rename(
+        columns={"fecha_ultimo_pago": "fecha_pago"}
+    )
+    last_rows["saldo_ultimo_neg"] = last_rows["saldo_ultimo"].clip(upper=0.0)
+    last_rows["saldo_ultimo_pos"] = last_rows["saldo_ultimo"].clip(lower=0.0)
+
+    agg = pd.merge(
+        pagado_by_casa,
+        last_rows[["casa", "fecha_pago", "saldo_ultimo_neg", "saldo_ultimo_pos"]],
+        on="casa",
+        how="left"
+    )
+    agg["saldo_ultimo_neg"] = agg["saldo_ultimo_neg"].fillna(0.0)
+    agg["saldo_ultimo_pos"] = agg["saldo_ultimo_pos"].fillna(0.0)
+    return agg, res["total_pagado"].sum(), int(res["registros"].sum()), res["fecha_ultimo_pago"].max()
+
+
+def test_resumen_igual_al_anterior():
+    res = pd.DataFrame({
+        "casa": ["C01", "C01", "C02", "C03", "C03"],
+        "mes": ["2025-02", "2025-01", "2025-03", "2025-01", "2025-02"],
+        "total_pagado": [500, 1000, 0, 250, 250],
+        "registros": [1, 2, 1, 1, 3],
+        "fecha_ultimo_pago": pd.to_datetime(["2025-02-10", "2025-01-20", "2025-03-01", "2025-01-05", "2025-02-28"]),
+        "saldo_ultimo": [-400.0, 600.0, 0.0, 50.0, np.nan],
+    })
+    r = dashboard_desde_resumen(res)
+    agg, total_pagado, registros, last_date = _kpis_resumen_anterior(res)
+
+    _comparar_agg(r["agg"], agg)
+    assert (r["total_pagado"], r["registros"], r["last_date"]) == (total_pagado, registros, last_date)
+    assert r["total_saldo_neg"] == agg["saldo_ultimo_neg"].sum()
+    assert r["total_saldo_pos"] == agg["saldo_ultimo_pos"].sum()
+    assert r["last_period"] == "2025-03"
+
+
+def test_resumen_vacio():
+    res = pd.DataFrame(columns=["casa", "mes", "total_pagado", "registros", "fecha_ultimo_pago", "saldo_ultimo"])
+    r = dashboard_desde_resumen(res)
+    assert r["agg"].empty
+    assert (r["total_pagado"], r["registros"]) == (0, 0)
+    assert r["last_period"] is None
+
+
+# ------------------ chart_df ------------------
+def test_chart_orden_y_dolares():
+    agg = pd.DataFrame({
+        "casa": ["C02", "C01"],
+        "pagado_sum": [1050, 200],
+        "saldo_ultimo_neg": [-25, 0],
+        "saldo_ultimo_pos": [0, 75],
+    })
+    largo = chart_df(agg)
+    assert largo["casa"].tolist() == ["C01"] * 3 + ["C02"] * 3
+    assert largo["categoria"].tolist() == list(SERIES.values()) * 2
+    assert largo["valor"].tolist() == [2.0, 0.0, 0.75, 10.5, -0.25, 0.0]
@@ -0,0 +1,60 @@
+import pandas as pd
+
+from cartera import actualizar_cartera, cargar_cartera, movimientos_casa
+from conftest import PAGOS_CSV
+from db import conexion
+from importar_datos import importar_desde_csv
+
+
+def _csv(tmp_path, raw: pd.DataFrame) -> str:
+    path = tmp_path / "pagos.csv"
+    raw.to_csv(path, index=False)
+    return str(path)
+
+
+def test_anio_del_periodo_desde_fecha_pago(bd, tmp_path):
+    raw = pd.read_csv(PAGOS_CSV, dtype=str)
+    raw["fecha_pago"] = raw["fecha_pago"].str.replace("2025", "2023")
+    c01 = raw["casa"] == "C01"
+    # Diciembre pagado en enero del año siguiente: sigue siendo 2023-12
+    raw.loc[c01 & (raw["periodo"] == "12"), "fecha_pago"] = "1/5/2024"
+    # Periodo fuera de rango: cae al mes de su fecha_pago, sin romper
+    extra = raw[c01].iloc[[0]].assign(periodo="13", fecha_pago="6/15/2023")
+    importar_desde_csv(completo=True, csv_path=_csv(tmp_path, pd.concat([raw, extra])))
+
+    meses = movimientos_casa("C01")["mes"].tolist()
+    assert meses == [f"2023-{m:02d}" for m in range(1, 13)]
+
+    meses_c02 = movimientos_casa("C02")["mes"].tolist()
+    assert meses_c02 == [f"2023-{m:02d}" for m in range(1, 13)]
+
+    # La antigüedad se calcula sobre esos meses
+    assert not cargar_cartera("2024-06-30").empty
+
+
+def test_periodo_sin_fecha_usa_anio_de_la_casa(bd, tmp_path):
+    raw = pd.read_csv(PAGOS_CSV, dtype=str)
+    raw = raw[raw["casa"] == "C02"].copy()
+    raw["fecha_pago"] = raw["fecha_pago"].str.replace("2025", "2022")
+    raw.loc[raw["periodo"] == "12", "fecha_pago"] = None
+    importar_desde_csv(completo=True, csv_path=_csv(tmp_path, raw))
+
+    assert movimientos_casa("C02")["mes"].tolist()[-1] == "2022-12"
+
+
+def test_pago_que_cambia_de_mes_recalcula_el_anterior(bd, tmp_path):
+    raw = pd.read_csv(PAGOS_CSV, dtype=str)
+    c01 = raw[raw["casa"] == "C01"]
+    # Periodo fuera de rango: su mes es el de fecha_pago
+    extra = c01.iloc[[0]].assign(periodo="13", fecha_pago="3/15/2025")
+    importar_desde_csv(completo=True, csv_path=_csv(tmp_path, pd.concat([c01, extra])))
+
+    # La misma fila, pagada meses después: marzo debe perder ese cargo
+    extra = extra.assign(fecha_pago="11/20/2025")
+    importar_desde_csv(csv_path=_csv(tmp_path, pd.concat([c01, extra])))
+    incremental = movimientos_casa("C01")
+
+    with conexion() as conn:
+        actualizar_cartera(conn, completo=True)
+    desde_cero = movimientos_casa("C01")
+    pd.testing.assert_frame_equal(incremental, desde_cero)
@@ -0,0 +1,99 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+import db
+
+
+def test_cache_acotada_por_bytes(bd, monkeypatch):
+    frame = pd.DataFrame({"x": range(10_000)})
+    tamano = db._tamano(frame)
+    monkeypatch.setattr(db, "CACHE_MAX_BYTES", int(tamano * 2.5))
+    db.invalidar_cache_pagos()
+
+    with db.conexion() as conn:
+        for i in range(4):
+            assert db.cacheado(conn, ("prueba", i), lambda c: frame.copy()) is not None
+        stats = db.cache_stats()
+        # Caben dos frames: los más viejos salen aunque sobren entradas
+        assert stats["entradas"] == 2
+        assert stats["bytes"] <= db.CACHE_MAX_BYTES
+
+        # Más grande que todo el presupuesto: se devuelve sin cachear
+        grande = pd.DataFrame({"x": range(100_000)})
+        assert db.cacheado(conn, ("prueba", "grande"), lambda c: grande) is grande
+        assert db.cache_stats()["entradas"] == 2
+
+    db.invalidar_cache_pagos()
+    assert db.cache_stats()["bytes"] == 0
+
+
+def test_busqueda_propietarios_sobrevive_vacuum(bd):
+    from migraciones import migrar
+    migrar()
+    for i in range(1, 7):
+        db.upsert_propietario({"casa": f"X{i:02d}", "nombre": f"Propietario{i} Apellido"})
+    with db.conexion() as conn:
+        # Huecos en los ids: VACUUM renumeraría un rowid implícito
+        conn.execute("DELETE FROM propietarios WHERE casa IN ('X01', 'X03')")
+    with db.conexion() as conn:
+        conn.execute("VACUUM")
+
+    encontrados = db.buscar_propietarios("Propietario5")
+    assert encontrados["casa"].tolist() == ["X05"]
+
+    # El índice va por el id explícito, no por el rowid implícito
+    with db.conexion() as conn:
+        ddl = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'propietarios_fts'").fetchone()[0]
+        fts = conn.execute("SELECT rowid FROM propietarios_fts WHERE propietarios_fts MATCH 'X05'").fetchone()[0]
+        assert conn.execute("SELECT casa FROM propietarios WHERE id = ?", (fts,)).fetchone()[0] == "X05"
+    assert "content_rowid='id'" in ddl
+
+
+def test_pool_lleno_no_cuelga(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "POOL_ESPERA_S", 0.05)
+    pool = db.PoolConexiones(str(tmp_path / "pool.db"), size=1)
+    conn = pool.obtener()
+    with pytest.raises(sqlite3.OperationalError, match="pool de conexiones agotado"):
+        pool.obtener()
+
+    pool.devolver(conn)
+    assert pool.obtener() is conn
+    pool.devolver(conn)
+    pool.cerrar()
+
+
+@pytest.mark.parametrize("filtro", [
+    {},
+    {"casa": "C02"},
+    {"desde": "2025-03-01", "hasta": "2025-08-31"},
+    {"propietario": "perez"},
+])
+def test_paginas_recorren_todo_sin_repetir(bd, filtro):
+    from conftest import PAGOS_CSV
+    from importar_datos import importar_desde_csv
+    importar_desde_csv(completo=True, csv_path=PAGOS_CSV)
+    with db.conexion() as conn:
+        # Empates de fecha y filas sin fecha: el cursor desempata por id
+        conn.execute("UPDATE pagos SET fecha_pago = '2025-05-05' WHERE periodo IN ('2025-05', '2025-06')")
+        conn.execute("UPDATE pagos SET fecha_pago = NULL WHERE periodo IN ('2025-11', '2025-12')")
+    db.invalidar_cache_pagos()
+
+    where, params = db.construir_filtro_pagos(**filtro)
+    with db.conexion() as conn:
+        esperado = [r[0] for r in conn.execute(
+            f"SELECT id FROM pagos {where} ORDER BY casa, fecha_pago IS NULL, fecha_pago DESC, id DESC", params
+        )]
+    assert esperado
+    if "desde" in filtro:
+        assert len(esperado) < db.contar_pagos()
+
+    ids, cursor = [], None
+    while True:
+        pagina, cursor = db.pagina_pagos(despues=cursor, tamano=7, **filtro)
+        assert len(pagina) <= 7
+        ids.extend(pagina["id"].tolist())
+        if cursor is None:
+            break
+    assert ids == esperado
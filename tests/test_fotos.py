@@ -0,0 +1,20 @@
+import os
+import time
+
+import fotos
+from migraciones import migrar
+
+
+def test_liberar_respeta_subidas_recientes(bd, tmp_path, monkeypatch):
+    migrar()
+    monkeypatch.chdir(tmp_path)
+    path = fotos.guardar_foto(b"no es una imagen", "casa.jpg")
+
+    # Recién subida (quizá por otra sesión que aún no guarda): se queda
+    assert fotos.liberar_foto(path) == 0
+    assert os.path.exists(path)
+
+    viejo = time.time() - fotos.GRACIA_S - 1
+    os.utime(path, (viejo, viejo))
+    assert fotos.liberar_foto(path) > 0
+    assert not os.path.exists(path)
@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+
+import db
+from conftest import PAGOS_CSV
+from importar_datos import importar_desde_csv, periodo_con_anio
+from migraciones import _m016_periodo_con_anio
+
+
+def test_reimportar_fila_editada(bd, tmp_path):
+    importar_desde_csv(completo=True, csv_path=PAGOS_CSV)
+
+    raw = pd.read_csv(PAGOS_CSV, dtype=str)
+    raw.loc[0, "monto_pagado"] = "1.00"
+    editado = tmp_path / "editado.csv"
+    raw.to_csv(editado, index=False)
+
+    # La fila actualizada conserva su propietario: el trigger de
+    # pagos_nombres no debe chocar con el nombre ya registrado
+    r = importar_desde_csv(csv_path=str(editado))
+    assert (r["insertadas"], r["actualizadas"], r["sin_cambios"]) == (0, 1, len(raw) - 1)
+
+    propietario = raw.loc[0, "propietario"]
+    assert db.contar_pagos(None, propietario) == (raw["propietario"] == propietario).sum()
+
+    # Sin cambios: nada que escribir
+    r = importar_desde_csv(csv_path=str(editado))
+    assert (r["insertadas"], r["actualizadas"]) == (0, 0)
+
+
+def test_archivo_del_anio_siguiente_no_pisa_el_anterior(bd, tmp_path):
+    importar_desde_csv(completo=True, csv_path=PAGOS_CSV)
+    raw = pd.read_csv(PAGOS_CSV, dtype=str)
+
+    siguiente = raw.assign(fecha_pago=raw["fecha_pago"].str.replace("2025", "2026"))
+    path = tmp_path / "pagos_2026.csv"
+    siguiente.to_csv(path, index=False)
+
+    r = importar_desde_csv(csv_path=str(path))
+    assert (r["insertadas"], r["actualizadas"]) == (len(raw), 0)
+    assert db.contar_pagos() == 2 * len(raw)
+    with db.conexion() as conn:
+        periodos = {p for (p,) in conn.execute("SELECT DISTINCT periodo FROM pagos WHERE casa = 'C01'")}
+    assert periodos == {f"{a}-{m:02d}" for a in (2025, 2026) for m in range(1, 13)}
+
+
+def test_periodo_de_mes_y_anio_desde_fecha():
+    df = pd.DataFrame({
+        "periodo": ["12", "1", "3", "2025-07", "13"],
+        "casa": ["C01", "C01", "C01", "C02", "C02"],
+        "fecha_pago": ["2026-01-05", "2025-12-20", None, "2025-07-01", "2025-06-01"],
+    })
+    # Diciembre pagado en enero, enero adelantado en diciembre, sin fecha:
+    # el año del último pago de la casa; lo que no es mes queda igual
+    assert periodo_con_anio(df).tolist() == ["2025-12", "2026-01", "2026-03", "2025-07", "13"]
+
+    sin_fechas = pd.DataFrame({"periodo": ["1"], "casa": ["C01"], "fecha_pago": [None]})
+    with pytest.raises(ValueError):
+        periodo_con_anio(sin_fechas)
+
+
+def test_migracion_pasa_periodos_de_mes_a_anio(bd):
+    importar_desde_csv(completo=True, csv_path=PAGOS_CSV)
+    with db.conexion() as conn:
+        # Filas como las dejaba la versión anterior: periodo sin año
+        conn.execute("UPDATE pagos SET periodo = CAST(CAST(substr(periodo, 6, 2) AS INTEGER) AS TEXT)")
+        _m016_periodo_con_anio(conn)
+        periodos = {p for (p,) in conn.execute("SELECT DISTINCT periodo FROM pagos")}
+    assert periodos == {f"2025-{m:02d}" for m in range(1, 13)}
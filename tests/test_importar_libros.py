@@ -0,0 +1,29 @@
+import os
+
+import db
+from importar_libros import importar_libros, parse_moneda
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_parse_moneda_en_centavos():
+    assert parse_moneda(" $(1,254.83)") == -125483
+    assert parse_moneda(" $279.57 ") == 27957
+    assert parse_moneda(" $-   ") == 0
+    assert parse_moneda("") is None
+    assert parse_moneda("abc") is None
+
+
+def test_libro_en_la_bd_activa(bd, capsys):
+    r = importar_libros([os.path.join(RAIZ, "012025.csv")], workers=1)
+    assert r == {"procesados": 1, "sin_cambios": 0}
+    # El mensaje nombra la BD en uso, no la de al importar el módulo
+    assert bd in capsys.readouterr().out
+
+    with db.conexion() as conn:
+        tipos = conn.execute(
+            "SELECT DISTINCT typeof(monto_pagado) FROM libro_ingresos WHERE monto_pagado IS NOT NULL"
+        ).fetchall()
+        sale = conn.execute("SELECT SUM(sale) FROM libro_gastos").fetchone()[0]
+    assert tipos == [("integer",)]
+    assert isinstance(sale, int)
@@ -0,0 +1,69 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+import db
+from importar_propietarios import importar_propietarios
+from migraciones import migrar
+from placas import buscar_placa, placas_de_casa
+
+
+@pytest.fixture
+def archivo(bd, tmp_path):
+    migrar()
+    path = tmp_path / "propietarios.csv"
+    pd.DataFrame([
+        {"casa": "C01", "nombre": "Ana", "email": "ana@x.com", "area": "120,5", "placas": "ABC1234 xyz9876"},
+        {"casa": "C02", "nombre": "Beto", "email": "no-es-email", "area": "", "placas": ""},
+        {"casa": "C03", "nombre": "Carla", "email": "", "area": "80", "placas": "QWE1111"},
+        {"casa": "C04", "nombre": "Dani", "email": "", "area": "-1", "placas": "QWE1111"},
+        {"casa": "d01", "nombre": "Eva", "email": "", "area": "", "placas": ""},
+    ]).to_csv(path, index=False)
+    return str(path)
+
+
+def test_importa_validas_y_reporta_errores(archivo):
+    r = importar_propietarios(archivo)
+    assert (r["filas"], r["insertadas"], r["actualizadas"], r["con_error"]) == (5, 1, 1, 3)
+    assert r["errores"][["casa", "error"]].values.tolist() == [
+        ["C02", "email inválido"],
+        ["C03", "placa QWE1111 en varias filas del archivo"],
+        ["C04", "area negativo"],
+        ["C04", "placa QWE1111 en varias filas del archivo"],
+    ]
+
+    c01 = db.get_propietario("C01")
+    assert (c01["nombre"], c01["area"], c01["placa2"]) == ("Ana", 120.5, "XYZ9876")
+    assert placas_de_casa("C01") == ["ABC1234", "XYZ9876"]
+    assert db.get_propietario("D01")["nombre"] == "Eva"
+    # Las filas con error no se escriben
+    assert db.get_propietario("C02")["nombre"] is None
+    assert buscar_placa("QWE1111") is None
+
+    # El mismo archivo otra vez: nada cambia
+    r = importar_propietarios(archivo)
+    assert (r["insertadas"], r["actualizadas"], r["sin_cambios"]) == (0, 0, 2)
+
+
+def test_placa_de_otra_casa_salta_la_fila(archivo, tmp_path):
+    db.upsert_propietario({"casa": "C09", "placa1": "ABC1234"})
+    r = importar_propietarios(archivo)
+    assert ["C01", "placa ABC1234 ya registrada en C09"] in r["errores"][["casa", "error"]].values.tolist()
+    assert placas_de_casa("C01") == []
+    assert buscar_placa("ABC1234")["casa"] == "C09"
+
+
+def test_solo_validar_no_escribe_ni_espera_el_lock(archivo, bd):
+    # Otra sesión tiene el lock de escritura: validar no debe esperarlo
+    otra = sqlite3.connect(bd, timeout=0)
+    otra.execute("BEGIN IMMEDIATE")
+    try:
+        r = importar_propietarios(archivo, solo_validar=True)
+    finally:
+        otra.rollback()
+        otra.close()
+
+    assert (r["insertadas"], r["actualizadas"], r["con_error"]) == (1, 0, 3)
+    assert db.get_propietario("D01") == {"casa": "D01"}
+    assert db.get_propietario("C01")["nombre"] is None
@@ -0,0 +1,58 @@
+import pytest
+
+import db
+from migraciones import migrar
+from placas import PlacasOcupadas, asignar_placas, buscar_placa, placas_de_casa, placas_en_otra_casa
+
+
+@pytest.fixture
+def casas(bd):
+    migrar()
+    for casa in ("C01", "C02"):
+        db.upsert_propietario({"casa": casa, "nombre": f"Dueño {casa}"})
+    return {c: db.get_propietario(c) for c in ("C01", "C02")}
+
+
+def _guardar_placas(ficha: dict, placas: list, **cambios):
+    return db.guardar_propietario(
+        ficha, dict(ficha, **cambios), extra=lambda conn: asignar_placas(conn, ficha["casa"], placas)
+    )
+
+
+def test_placa_tomada_entre_aviso_y_guardado(casas):
+    # Las dos sesiones validan antes de guardar: la placa está libre
+    assert placas_en_otra_casa(["ABC1234"], "C01") == {}
+    assert placas_en_otra_casa(["ABC1234"], "C02") == {}
+
+    _guardar_placas(casas["C01"], ["ABC1234"])
+    with pytest.raises(PlacasOcupadas) as e:
+        _guardar_placas(casas["C02"], ["ABC1234"], nombre="Otro")
+    assert e.value.ocupadas == {"ABC1234": "C01"}
+
+    # Nada de la segunda edición quedó escrito
+    assert db.get_propietario("C02")["nombre"] == "Dueño C02"
+    assert buscar_placa("abc-1234")["casa"] == "C01"
+
+
+def test_reasignar_cierra_las_que_salen(casas):
+    _guardar_placas(casas["C01"], ["ABC1234", "XYZ9876"])
+    _guardar_placas(casas["C01"], ["XYZ9876"])
+    assert placas_de_casa("C01") == ["XYZ9876"]
+
+    # Liberada por C01, C02 la puede tomar
+    _guardar_placas(casas["C02"], ["ABC1234"])
+    assert buscar_placa("ABC1234")["casa"] == "C02"
+
+
+def test_carga_masiva_sincroniza_placas(casas):
+    db.upsert_propietario({"casa": "C01", "placa1": "abc1234", "placa2": "XYZ9876"})
+    assert placas_de_casa("C01") == ["ABC1234", "XYZ9876"]
+
+    # Todas las columnas: sin placas en la fila, la casa queda sin placas
+    db.upsert_propietario({"casa": "C01", "nombre": "Ana"})
+    assert placas_de_casa("C01") == []
+
+    db.upsert_propietario({"casa": "C02", "placa1": "XYZ9876"})
+    with pytest.raises(PlacasOcupadas):
+        db.upsert_propietario({"casa": "C01", "nombre": "Bea", "placa1": "XYZ9876"})
+    assert db.get_propietario("C01")["nombre"] == "Ana"
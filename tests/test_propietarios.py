@@ -0,0 +1,56 @@
+import pytest
+
+import db
+from migraciones import migrar
+
+
+@pytest.fixture
+def ficha(bd):
+    """
+    C01 con foto, área y alícuota en NULL (como las fichas sembradas).
+    """
+    migrar()
+    db.upsert_propietario({"casa": "C01", "nombre": "Ana", "email": "ana@x.com"})
+    return db.get_propietario("C01")
+
+
+def _formulario(ficha: dict, **cambios) -> dict:
+    # Lo que manda el formulario: NULL se muestra como "" o 0.0
+    valores = {
+        "casa": ficha["casa"],
+        "foto_path": ficha.get("foto_path"),
+        "nombre": ficha.get("nombre"),
+        "email": ficha.get("email"),
+        "area": float(ficha.get("area") or 0.0),
+        "alicuota_pct": float(ficha.get("alicuota_pct") or 0.0),
+        "tiene_arrendatario": int(ficha.get("tiene_arrendatario") or 0),
+        "no_autos": int(ficha.get("no_autos") or 0),
+    }
+    valores.update(cambios)
+    return valores
+
+
+def test_nulos_del_formulario_no_son_cambios(ficha):
+    assert db.cambios_ficha(ficha, _formulario(ficha)) == {}
+    assert db.cambios_ficha(ficha, _formulario(ficha, email="otra@x.com")) == {"email": "otra@x.com"}
+    assert db.guardar_propietario(ficha, _formulario(ficha, email="otra@x.com")) == ["email"]
+
+
+def test_ediciones_concurrentes_en_otras_columnas_se_combinan(ficha):
+    # B guarda el área mientras A edita sólo el email
+    db.guardar_propietario(ficha, _formulario(ficha, area=120.0))
+    assert db.guardar_propietario(ficha, _formulario(ficha, email="a@x.com")) == ["email"]
+
+    actual = db.get_propietario("C01")
+    assert (actual["area"], actual["email"], actual["version"]) == (120.0, "a@x.com", ficha["version"] + 2)
+
+
+def test_misma_columna_es_conflicto(ficha):
+    db.guardar_propietario(ficha, _formulario(ficha, nombre="Bea"))
+    with pytest.raises(db.ConflictoEdicion) as e:
+        db.guardar_propietario(ficha, _formulario(ficha, nombre="Carla"))
+    assert [d["campo"] for d in e.value.diferencias] == ["nombre"]
+    assert db.get_propietario("C01")["nombre"] == "Bea"
+
+    # El mismo valor que guardó el otro no choca
+    assert db.guardar_propietario(ficha, _formulario(ficha, nombre="Bea")) == ["nombre"]
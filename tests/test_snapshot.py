@@ -0,0 +1,41 @@
+import pandas as pd
+import pytest
+
+import db
+import snapshot
+from conftest import PAGOS_CSV
+from importar_datos import importar_desde_csv
+
+pytest.importorskip("pyarrow")
+
+
+def test_snapshot_por_bloques_igual_a_sql(bd, monkeypatch):
+    # Row groups chicos: varios trozos, con categorías distintas en cada uno
+    monkeypatch.setattr(snapshot, "ROW_GROUP", 7)
+    importar_desde_csv(completo=True, csv_path=PAGOS_CSV)
+    assert db.actualizar_snapshot_pagos(forzar=True)
+
+    path = snapshot.ruta_snapshot(bd)
+    with db.conexion() as conn:
+        assert snapshot.vigente(conn, path)
+        desde_snapshot = snapshot.leer_snapshot(conn, path)
+        desde_sql = db._leer_df_pagos(conn)
+
+    desde_snapshot = desde_snapshot.sort_values("id", ignore_index=True)[list(desde_sql.columns)]
+    desde_sql = desde_sql.sort_values("id", ignore_index=True)
+    pd.testing.assert_frame_equal(desde_snapshot, desde_sql, check_categorical=False)
+
+
+@pytest.mark.parametrize("columnas", [None, ["casa", "fecha_pago", "monto_pagado", "saldo_pagar"]])
+def test_vacio_mismo_esquema_en_snapshot_y_sql(bd, columnas):
+    importar_desde_csv(completo=True, csv_path=PAGOS_CSV)
+    assert db.actualizar_snapshot_pagos(forzar=True)
+    path = snapshot.ruta_snapshot(bd)
+
+    with db.conexion() as conn:
+        desde_snapshot = snapshot.leer_snapshot(conn, path, columnas, casa="C99")
+        desde_sql = db._leer_df_pagos(conn, "WHERE casa = ?", ["C99"], columnas)
+
+    assert desde_snapshot.empty and desde_sql.empty
+    assert sorted(desde_snapshot.columns) == sorted(desde_sql.columns)
+    assert (desde_snapshot.dtypes.astype(str)[desde_sql.columns] == desde_sql.dtypes.astype(str)).all()
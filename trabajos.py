@@ -0,0 +1,153 @@
+import os
+import sqlite3
+import threading
+import time
+import traceback
+from datetime import datetime
+
+import pandas as pd
+
+from db import conexion, invalidar_cache_pagos, invalidar_columnas
+from importar_datos import importar_desde_csv
+from migraciones import TRABAJOS_ACTIVOS
+from rendimiento import tramo
+
+# Importaciones en segundo plano: un hilo del mismo proceso corre
+# importar_desde_csv y la tabla trabajos guarda estado, conteos y errores.
+# El progreso en vivo queda en memoria: la importación tiene la BD tomada
+# (BEGIN IMMEDIATE) y no se puede escribir en trabajos hasta el final.
+
+ACTIVOS = TRABAJOS_ACTIVOS
+
+_interrumpidos_ok = False
+_progreso = {}
+_progreso_lock = threading.Lock()
+
+
+def _ahora() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def cerrar_interrumpidos():
+    """
+    Cierra como error los trabajos que quedaron activos en un proceso
+    anterior (reinicio de la app a mitad de una importación).
+    Una sola vez por proceso.
+    """
+    global _interrumpidos_ok
+    if _interrumpidos_ok:
+        return
+    with conexion() as conn:
+        conn.execute(f"""
+            UPDATE trabajos
+            SET estado = 'error', error = 'Interrumpido (la app se reinició)', terminado_en = ?
+            WHERE estado IN {ACTIVOS} AND pid IS NOT ?
+        """, (_ahora(), os.getpid()))
+    _interrumpidos_ok = True
+
+
+def _actualizar(trabajo_id: int, **campos):
+    sets = ",".join(f"{c} = ?" for c in campos)
+    with conexion() as conn:
+        conn.execute(f"UPDATE trabajos SET {sets} WHERE id = ?", list(campos.values()) + [trabajo_id])
+
+
+def _ejecutar_importacion(trabajo_id: int, completo: bool):
+    def progreso(filas: int, fraccion: float):
+        with _progreso_lock:
+            _progreso[trabajo_id] = (filas, fraccion)
+
+    _actualizar(trabajo_id, estado="corriendo", iniciado_en=_ahora())
+    try:
+        with tramo("admin: importación"):
+            conteos = importar_desde_csv(completo=completo, progreso=progreso)
+    except Exception:
+        _actualizar(trabajo_id, estado="error", error=traceback.format_exc(), terminado_en=_ahora())
+    else:
+        with _progreso_lock:
+            filas, _ = _progreso.get(trabajo_id, (0, 1.0))
+        _actualizar(
+            trabajo_id, estado="ok", progreso=1.0, filas=filas, terminado_en=_ahora(), **conteos
+        )
+    finally:
+        with _progreso_lock:
+            _progreso.pop(trabajo_id, None)
+        # La generación ya invalida las lecturas de pagos; una carga completa
+        # además rehízo la tabla, así que también se olvidan sus columnas
+        invalidar_columnas("pagos")
+        invalidar_cache_pagos()
+
+
+def lanzar_importacion(completo: bool = False):
+    """
+    Encola y arranca una importación de pagos en un hilo.
+    Devuelve el id del trabajo, o None si ya hay una importación activa.
+    """
+    # Camino rápido: con una importación corriendo la BD está tomada y el
+    # INSERT esperaría al timeout; leer (WAL) no se bloquea
+    if trabajo_activo("importar_pagos") is not None:
+        return None
+    try:
+        with conexion() as conn:
+            cur = conn.execute("""
+                INSERT INTO trabajos (tipo, estado, parametros, pid, creado_en)
+                VALUES ('importar_pagos', 'en_cola', ?, ?, ?)
+            """, ("completo" if completo else "incremental", os.getpid(), _ahora()))
+            trabajo_id = cur.lastrowid
+    except (sqlite3.IntegrityError, sqlite3.OperationalError):
+        # IntegrityError: otra sesión ganó la carrera (índice único parcial)
+        # OperationalError: la BD sigue tomada por esa importación
+        return None
+
+    hilo = threading.Thread(
+        target=_ejecutar_importacion, args=(trabajo_id, completo),
+        name=f"trabajo-{trabajo_id}", daemon=True
+    )
+    hilo.start()
+    return trabajo_id
+
+
+def trabajo_activo(tipo: str = "importar_pagos") -> dict:
+    """
+    El trabajo activo del tipo (con progreso en vivo), o None.
+    """
+    with conexion() as conn:
+        conn.row_factory = sqlite3.Row
+        try:
+            row = conn.execute(
+                f"SELECT * FROM trabajos WHERE tipo = ? AND estado IN {ACTIVOS}", (tipo,)
+            ).fetchone()
+        finally:
+            conn.row_factory = None
+    if row is None:
+        return None
+    trabajo = dict(row)
+    with _progreso_lock:
+        filas, fraccion = _progreso.get(trabajo["id"], (trabajo["filas"], trabajo["progreso"]))
+    trabajo["filas"] = filas
+    trabajo["progreso"] = fraccion
+    return trabajo
+
+
+def ultimos_trabajos(n: int = 10) -> pd.DataFrame:
+    with conexion() as conn:
+        return pd.read_sql_query(
+            """
+            SELECT id, tipo, parametros, estado, filas, insertadas, actualizadas, sin_cambios,
+                   creado_en, terminado_en, error
+            FROM trabajos ORDER BY id DESC LIMIT ?
+            """,
+            conn, params=[n]
+        )
+
+
+def esperar(trabajo_id: int, intervalo: float = 0.2):
+    """
+    Bloquea hasta que el trabajo termine (herramientas de consola).
+    """
+    while True:
+        with conexion() as conn:
+            estado = conn.execute("SELECT estado FROM trabajos WHERE id = ?", (trabajo_id,)).fetchone()
+        if estado is None or estado[0] not in ACTIVOS:
+            return estado[0] if estado else None
+        time.sleep(intervalo)
@@ -0,0 +1,149 @@
+import argparse
+import csv
+import sqlite3
+from datetime import datetime
+
+from db import conexion
+
+# Catálogo de unidades (casas/departamentos) por condominio y bloque.
+# `codigo` es la clave con la que pagos y propietarios guardan la casa.
+# La tabla y su índice los crea migraciones.py.
+
+# Resultados máximos de la búsqueda (lo que llega al selectbox)
+LIMITE_BUSQUEDA = 50
+
+# Prefijo antes del primer "-" = condominio (N01-C001 -> N01)
+_CONDOMINIO_DE_CODIGO = "CASE WHEN instr({c}, '-') > 0 THEN substr({c}, 1, instr({c}, '-') - 1) ELSE '' END"
+
+
+def _ahora() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def registrar_desde(conn: sqlite3.Connection, tabla: str, columna: str = "casa"):
+    """
+    Da de alta (en bloque) las casas de `tabla` que aún no están en el catálogo.
+    Devuelve cuántas se agregaron.
+    """
+    return conn.execute(f"""
+        INSERT OR IGNORE INTO unidades (codigo, condominio, creado_en)
+        SELECT DISTINCT {columna}, {_CONDOMINIO_DE_CODIGO.format(c=columna)}, ?
+        FROM {tabla} WHERE {columna} IS NOT NULL AND {columna} <> ''
+    """, (_ahora(),)).rowcount
+
+
+def sincronizar_propietarios(conn: sqlite3.Connection):
+    """
+    Una fila vacía en propietarios por cada unidad que no la tenga.
+    Devuelve cuántas se crearon.
+    """
+    return conn.execute("""
+        INSERT OR IGNORE INTO propietarios (casa, actualizado_en)
+        SELECT codigo, ? FROM unidades
+    """, (_ahora(),)).rowcount
+
+
+def agregar_unidades(conn: sqlite3.Connection, filas) -> int:
+    """
+    Alta masiva: filas = iterable de (codigo, condominio, bloque).
+    Las existentes no se tocan. Devuelve cuántas se agregaron.
+    """
+    antes = conn.total_changes
+    ahora = _ahora()
+    conn.executemany(
+        "INSERT OR IGNORE INTO unidades (codigo, condominio, bloque, creado_en) VALUES (?, ?, ?, ?)",
+        ((str(c).strip().upper(), (cond or "").strip(), (b or "").strip(), ahora) for c, cond, b in filas)
+    )
+    return conn.total_changes - antes
+
+
+def completar_propietarios() -> int:
+    """
+    Da de alta en el catálogo las casas de pagos/propietarios que falten y
+    crea la fila vacía de propietarios de cada unidad. Devuelve cuántas
+    filas se agregaron.
+    """
+    with conexion() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        # rowcount y no total_changes: los triggers FTS también escriben
+        return (
+            registrar_desde(conn, "pagos")
+            + registrar_desde(conn, "propietarios")
+            + sincronizar_propietarios(conn)
+        )
+
+
+# ------------------ Lectura (UI) ------------------
+def buscar_unidades(texto: str = "", condominio: str = None, limite: int = LIMITE_BUSQUEDA) -> list:
+    """
+    Códigos que empiezan con `texto` (sin distinguir mayúsculas), en orden.
+    Es un rango en la PK (o en idx_unidades_condominio): cuesta lo mismo
+    con 10 que con 10.000 unidades.
+    """
+    conds = []
+    params = []
+    prefijo = (texto or "").strip()
+    if prefijo:
+        prefijo = prefijo.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        conds.append("codigo LIKE ? ESCAPE '\\'")
+        params.append(f"{prefijo}%")
+    if condominio:
+        conds.append("condominio = ?")
+        params.append(condominio)
+    where = ("WHERE " + " AND ".join(conds)) if conds else ""
+
+    with conexion() as conn:
+        try:
+            rows = conn.execute(
+                f"SELECT codigo FROM unidades {where} ORDER BY codigo LIMIT ?", params + [limite]
+            ).fetchall()
+        except sqlite3.OperationalError:
+            return []
+    return [r[0] for r in rows]
+
+
+def condominios() -> list:
+    with conexion() as conn:
+        try:
+            rows = conn.execute("SELECT DISTINCT condominio FROM unidades ORDER BY condominio").fetchall()
+        except sqlite3.OperationalError:
+            return []
+    return [r[0] for r in rows]
+
+
+def contar_unidades() -> int:
+    with conexion() as conn:
+        try:
+            return conn.execute("SELECT COUNT(*) FROM unidades").fetchone()[0]
+        except sqlite3.OperationalError:
+            return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Alta masiva de unidades.")
+    parser.add_argument("--csv", help="CSV con columnas codigo, condominio, bloque")
+    parser.add_argument("--condominio", default="", help="generar: código del condominio (p. ej. N01)")
+    parser.add_argument("--bloques", type=int, default=0, help="generar: número de bloques")
+    parser.add_argument("--por-bloque", type=int, default=0, help="generar: unidades por bloque")
+    args = parser.parse_args()
+
+    filas = []
+    if args.csv:
+        with open(args.csv, newline="", encoding="utf-8") as f:
+            filas = [(r["codigo"], r.get("condominio"), r.get("bloque")) for r in csv.DictReader(f)]
+    elif args.condominio and args.bloques and args.por_bloque:
+        filas = [
+            (f"{args.condominio}-B{b:02d}-{u:03d}", args.condominio, f"B{b:02d}")
+            for b in range(1, args.bloques + 1)
+            for u in range(1, args.por_bloque + 1)
+        ]
+    else:
+        parser.error("indica --csv o --condominio con --bloques y --por-bloque")
+
+    from migraciones import migrar
+    migrar()
+    with conexion() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        n = agregar_unidades(conn, filas)
+        sincronizar_propietarios(conn)
+    print(f"✅ {n} unidades nuevas ({len(filas)} en el archivo/generadas).")